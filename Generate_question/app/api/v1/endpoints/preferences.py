@@ -0,0 +1,91 @@
+from typing import List, Tuple
+import numpy as np
+from fastapi import APIRouter, HTTPException
+from app.api.v1.endpoints.questions import question_bank
+from app.core.config import PREFERENCE_DB_PATH
+from app.schemas.preference import (
+    AnswerBatchRequest,
+    AnswerBatchResponse,
+    PreferenceSetRequest,
+    PreferenceVector,
+)
+from app.services.preference_engine import apply_answers
+from app.services.preference_store import PreferenceStore
+from app.services.question_bank import DIMENSION_KEYS, preference_array
+
+router = APIRouter()
+preference_store = PreferenceStore(PREFERENCE_DB_PATH)
+
+
+def _group_answers(answers: List[Tuple[str, str, str]]):
+    """(user_id, question_id, choice) 목록 → 사용자 목록, 답변별 사용자 행 번호, 변화량, 은행에 있는지 여부"""
+    deltas, known = question_bank.choice_deltas([a[1] for a in answers], [a[2] for a in answers])
+    user_ids: List[str] = []
+    position = {}
+    user_index = []
+    for (user_id, _, _), ok in zip(answers, known):
+        if not ok:
+            continue
+        if user_id not in position:
+            position[user_id] = len(user_ids)
+            user_ids.append(user_id)
+        user_index.append(position[user_id])
+    return user_ids, np.asarray(user_index, dtype=np.int64), deltas[known], known
+
+
+# SQLite를 쓰는 엔드포인트는 (async가 아닌) 일반 함수로 두어 스레드풀에서 실행
+@router.post("/answers", response_model=AnswerBatchResponse, summary="답변 묶음을 취향 벡터에 적용")
+def apply_answer_batch(request: AnswerBatchRequest):
+    """여러 사용자의 답변을 한 번의 배열 연산으로 적용하고 저장합니다."""
+    answers = [(a.user_id, a.question_id, a.choice) for a in request.answers]
+    user_ids, user_index, deltas, known = _group_answers(answers)
+    unknown = sorted({answer[1] for answer, ok in zip(answers, known) if not ok})
+
+    if user_ids:
+        preference_store.update(user_ids,
+                                lambda vectors, counts: apply_answers(vectors, counts, user_index, deltas),
+                                answers=[answer for answer, ok in zip(answers, known) if ok])
+    return AnswerBatchResponse(applied=len(user_index), updated_users=len(user_ids),
+                               unknown_question_ids=unknown)
+
+
+@router.post("/rebuild", summary="답변 기록으로 모든 사용자 벡터 재계산")
+def rebuild_preferences():
+    """질문 은행의 현재 변화량으로 모든 사용자 벡터를 다시 계산합니다 (질문 세트가 바뀐 뒤 사용).
+
+    직접 설정한 사용자는 그 벡터부터, 나머지는 중립 벡터부터 이후의 답변 기록을 다시 적용합니다.
+    """
+    result = {"applied": 0, "skipped": 0}
+
+    def replay(user_ids, vectors, counts, answers):
+        position = {user_id: i for i, user_id in enumerate(user_ids)}
+        deltas, known = question_bank.choice_deltas([a[1] for a in answers], [a[2] for a in answers])
+        user_index = np.asarray([position[a[0]] for a, ok in zip(answers, known) if ok], dtype=np.int64)
+        result["applied"] = len(user_index)
+        result["skipped"] = int((~known).sum())
+        return apply_answers(vectors, counts, user_index, deltas[known])
+
+    users = preference_store.rebuild(replay)
+    return {"users": users, **result}
+
+
+@router.get("/stats", summary="취향 저장소 상태")
+def preference_stats():
+    return preference_store.stats()
+
+
+@router.get("/{user_id}", response_model=PreferenceVector, summary="사용자 취향 벡터 조회")
+def get_preferences(user_id: str):
+    vectors, counts, found = preference_store.get_many([user_id])
+    if not found[0]:
+        raise HTTPException(status_code=404, detail=f"취향 벡터가 없는 사용자입니다: {user_id}")
+    preferences = {key: float(value) for key, value in zip(DIMENSION_KEYS, vectors[0])}
+    return PreferenceVector(user_id=user_id, preferences=preferences, answers=int(counts[0]))
+
+
+@router.put("/{user_id}", response_model=PreferenceVector, summary="사용자 취향 벡터 직접 설정")
+def set_preferences(user_id: str, request: PreferenceSetRequest):
+    """클라이언트가 들고 있던 벡터를 서버 저장소로 옮길 때 사용합니다. 답변 수는 유지하며, 재계산의 기준 벡터가 됩니다."""
+    vector = np.clip(preference_array(request.preferences), 0.0, 1.0)
+    answers = preference_store.set_baseline(user_id, vector)
+    return PreferenceVector(user_id=user_id, preferences=preference_store.get(user_id), answers=answers)
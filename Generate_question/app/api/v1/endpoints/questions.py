@@ -1,25 +1,133 @@
-from fastapi import APIRouter, HTTPException
-from app.schemas.question import QuestionResponse
+import json
+from typing import List, Union
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from app.core.config import (
+    MAX_QUESTIONS_PER_REQUEST,
+    QUESTION_BANK_MAX_SIZE,
+    QUESTION_BANK_PATH,
+    QUESTION_BANK_SAVE_DELAY,
+    QUESTION_POOL_BATCH_SIZE,
+    QUESTION_POOL_SIZE,
+    QUESTION_POOL_LOW_WATER,
+    QUESTION_POOL_REFILL_CONCURRENCY,
+    QUESTION_POOL_SNAPSHOT_PATH,
+)
+from app.core.prompt import prompt_stats
+from app.schemas.question import NextQuestionRequest, QuestionResponse
+from app.services.question_bank import QuestionBank
 from app.services.question_generator import QuestionGenerator
+from app.services.question_pool import QuestionPool
 
 router = APIRouter()
 question_generator = QuestionGenerator()
+question_bank = QuestionBank(QUESTION_BANK_PATH, max_size=QUESTION_BANK_MAX_SIZE,
+                             save_delay=QUESTION_BANK_SAVE_DELAY)
+question_pool = QuestionPool(
+    question_generator,
+    max_size=QUESTION_POOL_SIZE,
+    low_water=QUESTION_POOL_LOW_WATER,
+    refill_concurrency=QUESTION_POOL_REFILL_CONCURRENCY,
+    snapshot_path=QUESTION_POOL_SNAPSHOT_PATH,
+    batch_size=QUESTION_POOL_BATCH_SIZE,
+    bank=question_bank,
+)
 
 @router.get("/generate", 
-    response_model=QuestionResponse,
+    response_model=Union[QuestionResponse, List[QuestionResponse]],
     summary="새로운 취향 질문 생성",
     description="""
     커플의 취향을 파악하기 위한 이지선다 질문을 생성합니다.
     각 선택지는 2-4개의 취향 차원에 영향을 주며, 변화량은 -0.1에서 +0.1 사이입니다.
+    미리 생성해 둔 질문 풀에서 바로 응답하며, 풀이 비어 있을 때만 새로 생성합니다.
+    count를 2 이상으로 주면 질문 목록을 반환합니다 (모자란 질문은 LLM 호출 한 번으로 함께 생성).
     """,
     response_description="생성된 질문과 각 선택지별 취향 벡터 변화량"
 )
-async def generate_question():
+async def generate_question(
+    count: int = Query(1, ge=1, le=MAX_QUESTIONS_PER_REQUEST, description="생성할 질문 수")
+):
     """새로운 취향 질문을 생성합니다."""
-    result = await question_generator.generate_question()
-    if not result:
+    results = question_pool.take_many(count)
+    if len(results) < count:
+        results += question_bank.add(await question_generator.generate_questions(count - len(results)))
+    if not results:
+        raise HTTPException(
+            status_code=500,
+            detail="질문 생성에 실패했습니다. 서버 로그를 확인해주세요."
+        )
+    return results[0] if count == 1 else results
+
+@router.get("/prompt/stats", summary="프롬프트 토큰/지연 시간 통계")
+async def prompt_usage_stats():
+    """프롬프트별 호출 수, 평균 prompt/completion/캐시 토큰, 섹션별 토큰 수, 평균 지연 시간을 반환합니다."""
+    return prompt_stats.snapshot()
+
+@router.get("/pool/stats", summary="질문 풀 상태")
+async def question_pool_stats():
+    """풀 크기, 풀에서 바로 응답한 비율, 채우기 통계를 반환합니다."""
+    return question_pool.stats()
+
+def sse_event(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+async def question_events():
+    # 풀에 질문이 있으면 생성 없이 바로 모든 필드를 내보냄
+    question = question_pool.take()
+    if question is not None:
+        for field in ("question", "choice_a", "vectors_a", "choice_b", "vectors_b"):
+            yield sse_event("field", {"field": field, "value": question[field]})
+        yield sse_event("done", question)
+        return
+
+    async for event, data in question_generator.stream_question():
+        if event == "done":
+            data = question_bank.add([data])[0]
+        yield sse_event(event, data)
+
+@router.get("/generate/stream",
+    summary="취향 질문 스트리밍 생성 (SSE)",
+    description="""
+    질문을 Server-Sent Events로 생성합니다. 필드가 완성되는 대로 보내므로 질문 문장을 생성 완료 전에 보여줄 수 있습니다.
+    - `event: field` / `data: {"field": "question", "value": "..."}` - question, choice_a, vectors_a, choice_b, vectors_b 순
+    - `event: done` / `data: {...}` - QuestionResponse로 검증된 최종 질문 (id 포함). 이 값을 최종 결과로 사용
+    - `event: error` / `data: {"detail": "..."}` - 생성 또는 검증 실패
+    """,
+)
+async def generate_question_stream():
+    """새로운 취향 질문을 스트리밍으로 생성합니다."""
+    return StreamingResponse(
+        question_events(),
+        media_type="text/event-stream",
+        # 프록시가 이벤트를 모아서 보내지 않도록
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@router.post("/next",
+    response_model=Union[QuestionResponse, List[QuestionResponse]],
+    summary="사용자에게 다음으로 물어볼 질문 선택",
+    description="""
+    질문 은행에서 아직 답하지 않은 질문 중, 현재 취향 벡터에서 불확실한 차원을 가장 잘 가르는 질문을 고릅니다.
+    은행이 비었거나 모두 답한 경우에만 LLM으로 새 질문을 생성해 은행에 추가합니다.
+    count가 2 이상이면 질문 목록을 반환합니다.
+    """,
+)
+async def next_question(request: NextQuestionRequest):
+    """다음 질문을 선택합니다."""
+    count = min(request.count, MAX_QUESTIONS_PER_REQUEST)
+    results = question_bank.select(request.preferences, request.answered_ids, count)
+    if len(results) < count:
+        # 풀의 질문은 이미 은행에 들어 있으므로 새로 생성
+        fresh = await question_generator.generate_questions(count - len(results))
+        results += question_bank.add(fresh)
+    if not results:
         raise HTTPException(
             status_code=500,
             detail="질문 생성에 실패했습니다. 서버 로그를 확인해주세요."
         )
-    return result 
\ No newline at end of file
+    return results[0] if count == 1 else results
+
+@router.get("/bank/stats", summary="질문 은행 상태")
+async def question_bank_stats():
+    """은행에 쌓인 질문 수와 선택 통계를 반환합니다."""
+    return question_bank.stats()
@@ -6,6 +6,10 @@ from dotenv import load_dotenv
 # 환경변수 로드
 load_dotenv()
 
+# 기본 디렉토리 설정 (Generate_question/). 데이터 파일 기본 경로는 실행 위치와 관계없이 여기에 둠
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DATA_DIR = os.path.join(BASE_DIR, "data")
+
 # API 설정
 API_V1_STR = "/api/v1"
 APP_NAME = "Couple Preference Question Generator"
@@ -14,5 +18,31 @@ APP_NAME = "Couple Preference Question Generator"
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o")
 
+# OpenAI 클라이언트 커넥션 풀/타임아웃/재시도 설정 (app/core/llm_client.py)
+OPENAI_TIMEOUT = float(os.getenv("OPENAI_TIMEOUT", "60"))
+OPENAI_CONNECT_TIMEOUT = float(os.getenv("OPENAI_CONNECT_TIMEOUT", "5"))
+OPENAI_MAX_RETRIES = int(os.getenv("OPENAI_MAX_RETRIES", "2"))
+OPENAI_MAX_CONNECTIONS = int(os.getenv("OPENAI_MAX_CONNECTIONS", "20"))
+OPENAI_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("OPENAI_MAX_KEEPALIVE_CONNECTIONS", "10"))
+OPENAI_KEEPALIVE_EXPIRY = float(os.getenv("OPENAI_KEEPALIVE_EXPIRY", "30"))
+
+# 미리 생성해 두는 질문 풀 설정
+QUESTION_POOL_SIZE = int(os.getenv("QUESTION_POOL_SIZE", "50"))
+QUESTION_POOL_LOW_WATER = int(os.getenv("QUESTION_POOL_LOW_WATER", "20"))
+QUESTION_POOL_REFILL_CONCURRENCY = int(os.getenv("QUESTION_POOL_REFILL_CONCURRENCY", "4"))
+QUESTION_POOL_SNAPSHOT_PATH = os.getenv("QUESTION_POOL_SNAPSHOT_PATH", os.path.join(DATA_DIR, "question_pool.json"))
+# LLM 호출 한 번에 생성할 질문 수 (풀 채우기), 요청 한 번에 받을 수 있는 최대 질문 수
+QUESTION_POOL_BATCH_SIZE = int(os.getenv("QUESTION_POOL_BATCH_SIZE", "5"))
+MAX_QUESTIONS_PER_REQUEST = int(os.getenv("MAX_QUESTIONS_PER_REQUEST", "10"))
+
+# 생성된 질문을 모아 두는 질문 은행 (다음 질문 선택에 사용)
+QUESTION_BANK_PATH = os.getenv("QUESTION_BANK_PATH", os.path.join(DATA_DIR, "question_bank.json"))
+# 은행에 둘 최대 질문 수 (넘으면 오래된 질문부터 버림), 질문 추가 후 모아서 저장할 때까지 기다리는 시간(초)
+QUESTION_BANK_MAX_SIZE = int(os.getenv("QUESTION_BANK_MAX_SIZE", "5000"))
+QUESTION_BANK_SAVE_DELAY = float(os.getenv("QUESTION_BANK_SAVE_DELAY", "5"))
+
+# 사용자 취향 벡터 저장소 (SQLite). recommand_place가 같은 파일을 읽어 user_id로 벡터를 가져감
+PREFERENCE_DB_PATH = os.getenv("PREFERENCE_DB_PATH", os.path.join(DATA_DIR, "preferences.db"))
+
 if not OPENAI_API_KEY:
     raise ValueError("OPENAI_API_KEY environment variable is not set") 
\ No newline at end of file
@@ -0,0 +1,149 @@
+"""LLM 프롬프트 구성과 토큰 계측
+
+프롬프트는 두 부분으로 나눕니다.
+  - 고정 지시문: system 메시지. 호출마다 한 글자도 바뀌지 않으므로 OpenAI 프롬프트 캐시의 접두사가 됩니다
+    (1024토큰 이상이면 캐시 대상).
+  - 호출마다 바뀌는 섹션: user 메시지. "[제목]\\n내용" 블록으로 이어 붙입니다.
+섹션별 토큰 수는 로컬에서 세고(tiktoken이 설치되어 있으면 사용, 없으면 근사치),
+호출마다 응답 usage(prompt/completion/cached 토큰)와 지연 시간을 프롬프트 이름별로 누적합니다.
+"""
+
+import logging
+import statistics
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import tiktoken
+except ImportError:  # 선택 의존성: 없으면 근사치로 셈
+    tiktoken = None
+
+logger = logging.getLogger(__name__)
+
+_encodings: Dict[str, Any] = {}
+
+
+def _encoding(model: str):
+    if tiktoken is None:
+        return None
+    if model not in _encodings:
+        try:
+            _encodings[model] = tiktoken.encoding_for_model(model)
+        except KeyError:
+            _encodings[model] = tiktoken.get_encoding("o200k_base")
+    return _encodings[model]
+
+
+def count_tokens(text: str, model: str = "gpt-4o") -> int:
+    """text의 토큰 수. tiktoken이 없으면 한글 등 비 ASCII 문자는 글자당 1토큰, ASCII는 4글자당 1토큰으로 어림합니다."""
+    encoding = _encoding(model)
+    if encoding is not None:
+        return len(encoding.encode(text))
+    non_ascii = sum(1 for ch in text if ord(ch) > 127)
+    return non_ascii + (len(text) - non_ascii + 3) // 4
+
+
+class Prompt:
+    """고정 지시문(system)과 섹션 목록으로 chat 메시지를 만드는 프롬프트 템플릿"""
+
+    def __init__(self, name: str, system: str, model: str = "gpt-4o"):
+        self.name = name
+        self.system = system
+        self.model = model
+        self.system_tokens = count_tokens(system, model)
+
+    def build(self, sections: Dict[str, str]) -> Tuple[List[Dict[str, str]], Dict[str, int]]:
+        """(messages, 섹션별 토큰 수)를 반환합니다. 섹션 순서는 dict 순서를 따릅니다."""
+        user = "\n\n".join(f"[{title}]\n{body}" for title, body in sections.items())
+        section_tokens = {"system": self.system_tokens}
+        section_tokens.update({title: count_tokens(body, self.model) for title, body in sections.items()})
+        messages = [
+            {"role": "system", "content": self.system},
+            {"role": "user", "content": user},
+        ]
+        return messages, section_tokens
+
+
+class PromptStats:
+    """프롬프트 이름별 호출 수, 섹션별 로컬 토큰 수, usage 토큰, 지연 시간 누적"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, Any]] = {}
+
+    def record(self, name: str, section_tokens: Dict[str, int], usage: Any, latency: float):
+        prompt_tokens = getattr(usage, "prompt_tokens", 0) or 0
+        completion_tokens = getattr(usage, "completion_tokens", 0) or 0
+        details = getattr(usage, "prompt_tokens_details", None)
+        cached_tokens = getattr(details, "cached_tokens", 0) or 0
+        with self._lock:
+            entry = self._stats.setdefault(name, {
+                "calls": 0, "prompt_tokens": 0, "completion_tokens": 0, "cached_tokens": 0,
+                "latency_seconds": 0.0, "section_tokens": {},
+            })
+            entry["calls"] += 1
+            entry["prompt_tokens"] += prompt_tokens
+            entry["completion_tokens"] += completion_tokens
+            entry["cached_tokens"] += cached_tokens
+            entry["latency_seconds"] += latency
+            for title, tokens in section_tokens.items():
+                entry["section_tokens"][title] = entry["section_tokens"].get(title, 0) + tokens
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """호출당 평균으로 정리한 통계"""
+        with self._lock:
+            result = {}
+            for name, entry in self._stats.items():
+                calls = entry["calls"]
+                result[name] = {
+                    "calls": calls,
+                    "avg_prompt_tokens": round(entry["prompt_tokens"] / calls, 1),
+                    "avg_completion_tokens": round(entry["completion_tokens"] / calls, 1),
+                    "cached_ratio": round(entry["cached_tokens"] / entry["prompt_tokens"], 4)
+                    if entry["prompt_tokens"] else 0.0,
+                    "avg_latency_ms": round(entry["latency_seconds"] / calls * 1000, 1),
+                    "avg_section_tokens": {title: round(tokens / calls, 1)
+                                           for title, tokens in entry["section_tokens"].items()},
+                }
+            return result
+
+
+prompt_stats = PromptStats()
+
+
+async def complete(client, prompt: Prompt, sections: Dict[str, str],
+                   stats: Optional[PromptStats] = None, **kwargs):
+    """프롬프트로 chat completion을 호출하고 토큰/지연 시간을 기록합니다. 응답 객체를 그대로 반환합니다."""
+    messages, section_tokens = prompt.build(sections)
+    start = time.perf_counter()
+    response = await client.chat.completions.create(model=prompt.model, messages=messages, **kwargs)
+    latency = time.perf_counter() - start
+    (stats or prompt_stats).record(prompt.name, section_tokens, getattr(response, "usage", None), latency)
+    logger.debug(f"{prompt.name}: 섹션별 토큰 {section_tokens}, {latency * 1000:.0f}ms")
+    return response
+
+
+def message_tokens(messages: List[Dict[str, str]], model: str = "gpt-4o") -> int:
+    """메시지 목록의 로컬 토큰 수 (메시지 구분 토큰 제외)"""
+    return sum(count_tokens(message["content"], model) for message in messages)
+
+
+async def measure(client, model: str, messages: List[Dict[str, str]], repeats: int, **kwargs) -> Dict[str, Any]:
+    """같은 메시지로 repeats번 호출해 지연 시간 중앙값과 평균 usage 토큰을 잽니다 (prompt_report.py용)."""
+    latencies, prompt_tokens, completion_tokens, cached_tokens = [], [], [], []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        response = await client.chat.completions.create(model=model, messages=messages, **kwargs)
+        latencies.append((time.perf_counter() - start) * 1000)
+        usage = response.usage
+        prompt_tokens.append(usage.prompt_tokens)
+        completion_tokens.append(usage.completion_tokens)
+        details = getattr(usage, "prompt_tokens_details", None)
+        cached_tokens.append(getattr(details, "cached_tokens", 0) or 0)
+    return {
+        "median_latency_ms": round(statistics.median(latencies), 1),
+        "avg_prompt_tokens": round(statistics.mean(prompt_tokens), 1),
+        "avg_completion_tokens": round(statistics.mean(completion_tokens), 1),
+        "avg_cached_tokens": round(statistics.mean(cached_tokens), 1),
+    }
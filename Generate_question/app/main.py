@@ -1,7 +1,8 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import API_V1_STR, APP_NAME
-from app.api.v1.endpoints import questions
+from app.api.v1.endpoints import questions, preferences
+from app.core.llm_client import init_llm_client, close_llm_client
 
 app = FastAPI(
     title=APP_NAME,
@@ -28,4 +29,25 @@ app.include_router(
     questions.router,
     prefix=API_V1_STR + "/questions",
     tags=["questions"]
-) 
\ No newline at end of file
+) 
+app.include_router(
+    preferences.router,
+    prefix=API_V1_STR + "/preferences",
+    tags=["preferences"]
+)
+
+@app.on_event("startup")
+async def start_question_pool():
+    # 모든 LLM 호출이 공유할 클라이언트(커넥션 풀)를 한 번만 생성
+    init_llm_client()
+    questions.question_bank.load()
+    # 스냅샷을 불러오고 백그라운드에서 풀을 채움 (요청 처리는 바로 시작)
+    await questions.question_pool.start()
+
+@app.on_event("shutdown")
+async def stop_question_pool():
+    await questions.question_pool.stop()
+    # 아직 저장하지 않은 은행 질문을 저장
+    await questions.question_bank.stop()
+    await close_llm_client()
+    preferences.preference_store.close()
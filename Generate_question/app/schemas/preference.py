@@ -0,0 +1,38 @@
+from pydantic import BaseModel, Field
+from typing import Dict, List, Literal
+
+class Answer(BaseModel):
+    """질문 답변 하나"""
+    user_id: str = Field(..., description="사용자 id")
+    question_id: str = Field(..., description="질문 은행의 질문 id")
+    choice: Literal["a", "b"] = Field(..., description="고른 선택지")
+
+class AnswerBatchRequest(BaseModel):
+    """여러 사용자의 답변 묶음 (같은 사용자의 답변은 순서대로 적용)"""
+    answers: List[Answer] = Field(..., description="답변 목록")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "answers": [
+                    {"user_id": "user-1", "question_id": "f5bfbd93904c", "choice": "a"},
+                    {"user_id": "user-2", "question_id": "f5bfbd93904c", "choice": "b"}
+                ]
+            }
+        }
+
+class AnswerBatchResponse(BaseModel):
+    """답변 적용 결과"""
+    applied: int = Field(..., description="적용한 답변 수")
+    updated_users: int = Field(..., description="취향 벡터가 바뀐 사용자 수")
+    unknown_question_ids: List[str] = Field(..., description="질문 은행에 없어 건너뛴 질문 id")
+
+class PreferenceVector(BaseModel):
+    """사용자 취향 벡터"""
+    user_id: str
+    preferences: Dict[str, float] = Field(..., description="50차원의 취향 벡터")
+    answers: int = Field(0, description="지금까지 적용한 답변 수")
+
+class PreferenceSetRequest(BaseModel):
+    """취향 벡터 직접 설정 (기존 클라이언트 벡터 이전용)"""
+    preferences: Dict[str, float] = Field(..., description="50차원의 취향 벡터 (없는 차원은 0.5)")
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 class VectorChange(BaseModel):
     """취향 벡터 변화량"""
@@ -8,6 +8,7 @@ class VectorChange(BaseModel):
 
 class QuestionResponse(BaseModel):
     """질문 생성 응답"""
+    id: Optional[str] = Field(None, description="질문 은행의 질문 id (답한 질문 목록에 사용)")
     question: str = Field(..., description="생성된 질문")
     choice_a: str = Field(..., description="선택지 A")
     vectors_a: List[VectorChange] = Field(..., description="선택지 A의 취향 벡터 변화량")
@@ -29,4 +30,10 @@ class QuestionResponse(BaseModel):
                     {"dimension": "#휴식적인", "change": 0.1}
                 ]
             }
-        } 
\ No newline at end of file
+        }
+
+class NextQuestionRequest(BaseModel):
+    """다음 질문 선택 요청"""
+    preferences: Dict[str, float] = Field(default_factory=dict, description="현재 50차원 취향 벡터 (없는 차원은 0.5)")
+    answered_ids: List[str] = Field(default_factory=list, description="이미 답한 질문 id 목록")
+    count: int = Field(1, ge=1, description="받을 질문 수")
@@ -0,0 +1,118 @@
+import json
+from typing import Any, List, Optional, Tuple
+
+Path = Tuple[Any, ...]
+
+
+class _Frame:
+    __slots__ = ("kind", "start", "key", "index", "expect_key", "value_start")
+
+    def __init__(self, kind: str, start: int):
+        self.kind = kind            # "{" 또는 "["
+        self.start = start
+        self.key: Optional[str] = None
+        self.index = 0
+        self.expect_key = kind == "{"
+        self.value_start = start + 1
+
+
+class JsonFieldStream:
+    """LLM이 스트리밍하는 JSON을 조각 단위로 받아, 완성된 객체 멤버를 바로 꺼내는 파서
+
+    feed()에 텍스트 조각을 넣으면 그 조각으로 값이 끝난 멤버들을 (경로, 키, 값) 목록으로 돌려줍니다.
+    경로는 멤버가 속한 객체의 위치입니다: 최상위 객체는 (), {"questions": [{...}]}의 첫 질문은 ("questions", 0).
+    문자열은 닫는 따옴표에서, 배열/객체는 닫는 괄호에서, 숫자/true/false/null은 뒤따르는 , 또는 }에서 완성됩니다.
+    """
+
+    def __init__(self):
+        self.buffer = ""
+        self._pos = 0
+        self._stack: List[_Frame] = []
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._reading_key = False
+
+    def _path(self) -> Path:
+        """맨 위 프레임(현재 객체)의 경로"""
+        path = []
+        for parent, child in zip(self._stack, self._stack[1:]):
+            path.append(parent.key if parent.kind == "{" else parent.index)
+        return tuple(path)
+
+    def _member(self, end: int) -> Optional[Tuple[Path, str, Any]]:
+        """현재 객체의 value_start..end 구간을 값으로 읽어 멤버를 만듭니다."""
+        frame = self._stack[-1]
+        raw = self.buffer[frame.value_start:end].strip()
+        if frame.kind != "{" or frame.key is None or not raw:
+            return None
+        try:
+            value = json.loads(raw)
+        except ValueError:
+            return None
+        return self._path(), frame.key, value
+
+    def feed(self, text: str) -> List[Tuple[Path, str, Any]]:
+        self.buffer += text
+        members = []
+        buffer = self.buffer
+        for i in range(self._pos, len(buffer)):
+            c = buffer[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif c == "\\":
+                    self._escape = True
+                elif c == '"':
+                    self._in_string = False
+                    frame = self._stack[-1] if self._stack else None
+                    if self._reading_key:
+                        frame.key = json.loads(buffer[self._string_start:i + 1])
+                        self._reading_key = False
+                    elif frame is not None and frame.kind == "{":
+                        member = self._member(i + 1)
+                        if member is not None:
+                            members.append(member)
+                continue
+
+            if c == '"':
+                self._in_string = True
+                self._string_start = i
+                frame = self._stack[-1] if self._stack else None
+                self._reading_key = frame is not None and frame.kind == "{" and frame.expect_key
+            elif c in "{[":
+                self._stack.append(_Frame(c, i))
+            elif c in "}]":
+                frame = self._stack.pop()
+                if frame.kind == "{" and not frame.expect_key:
+                    # 마지막 멤버가 숫자/true/false/null인 경우
+                    self._stack.append(frame)
+                    member = self._member(i) if self._is_primitive(frame, i) else None
+                    self._stack.pop()
+                    if member is not None:
+                        members.append(member)
+                parent = self._stack[-1] if self._stack else None
+                if parent is not None and parent.kind == "{" and not parent.expect_key:
+                    member = self._member(i + 1)
+                    if member is not None:
+                        members.append(member)
+            elif c == ":" and self._stack:
+                frame = self._stack[-1]
+                frame.expect_key = False
+                frame.value_start = i + 1
+            elif c == "," and self._stack:
+                frame = self._stack[-1]
+                if frame.kind == "{":
+                    if self._is_primitive(frame, i):
+                        member = self._member(i)
+                        if member is not None:
+                            members.append(member)
+                    frame.expect_key = True
+                else:
+                    frame.index += 1
+        self._pos = len(buffer)
+        return members
+
+    def _is_primitive(self, frame: _Frame, end: int) -> bool:
+        raw = self.buffer[frame.value_start:end].strip()
+        return bool(raw) and raw[0] not in '"{['
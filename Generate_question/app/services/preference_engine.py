@@ -0,0 +1,61 @@
+"""취향 벡터 업데이트 엔진
+
+질문 답변(선택지 A/B의 변화량)을 사용자 취향 벡터에 적용합니다.
+여러 사용자의 답변 묶음을 한 번에 배열 연산으로 처리하며,
+  - 답변이 쌓일수록 한 번에 움직이는 폭을 줄이고 (step = max(MIN_STEP, STEP_DECAY ** 이전 답변 수))
+  - 답변 하나를 적용할 때마다 0~1 범위로 자릅니다.
+"""
+
+from typing import Tuple
+
+import numpy as np
+
+from app.services.question_bank import DIMENSION_KEYS, NEUTRAL
+
+STEP_DECAY = 0.97
+MIN_STEP = 0.3
+
+
+def step_sizes(answer_counts: np.ndarray, decay: float = STEP_DECAY, min_step: float = MIN_STEP) -> np.ndarray:
+    """이전 답변 수별 변화량 배율"""
+    return np.maximum(min_step, np.power(decay, answer_counts, dtype=np.float32)).astype(np.float32)
+
+
+def apply_answers(vectors: np.ndarray, answer_counts: np.ndarray, user_index: np.ndarray,
+                  deltas: np.ndarray, decay: float = STEP_DECAY,
+                  min_step: float = MIN_STEP) -> Tuple[np.ndarray, np.ndarray]:
+    """답변 묶음을 사용자 취향 벡터에 적용합니다.
+
+    vectors: (사용자 수, 50) 현재 취향 벡터
+    answer_counts: (사용자 수,) 지금까지 적용한 답변 수
+    user_index: (답변 수,) 각 답변이 속한 사용자의 행 번호 (같은 사용자의 답변은 입력 순서대로 적용)
+    deltas: (답변 수, 50) 고른 선택지의 변화량
+    반환: (새 취향 벡터, 새 답변 수)
+    """
+    user_index = np.asarray(user_index, dtype=np.int64)
+    if len(user_index) == 0:
+        return vectors.copy(), answer_counts.copy()
+
+    # 같은 사용자 안에서 몇 번째 답변인지 (입력 순서 유지)
+    order = np.argsort(user_index, kind="stable")
+    sorted_users = user_index[order]
+    first = np.r_[0, np.flatnonzero(np.diff(sorted_users)) + 1]
+    run_starts = np.repeat(first, np.diff(np.r_[first, len(order)]))
+    rank = np.empty_like(user_index)
+    rank[order] = np.arange(len(order)) - run_starts
+
+    steps = step_sizes(answer_counts[user_index] + rank, decay, min_step)
+    scaled = deltas * steps[:, None]
+    updated = vectors.astype(np.float32, copy=True)
+    # 순서가 같은 답변끼리는 사용자가 겹치지 않으므로 한 번에 더하고 자름
+    # (반복 횟수는 한 사용자의 최대 답변 수, 자르기는 답변마다 순서대로 적용됨)
+    for r in range(int(rank.max()) + 1):
+        batch = np.flatnonzero(rank == r)
+        users = user_index[batch]
+        updated[users] = np.clip(updated[users] + scaled[batch], 0.0, 1.0)
+    counts = answer_counts + np.bincount(user_index, minlength=len(answer_counts))
+    return updated, counts
+
+
+def neutral_vectors(count: int) -> np.ndarray:
+    return np.full((count, len(DIMENSION_KEYS)), NEUTRAL, dtype=np.float32)
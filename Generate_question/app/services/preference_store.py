@@ -0,0 +1,183 @@
+import os
+import sqlite3
+import threading
+import time
+from typing import Callable, Optional, Dict, List, Tuple
+
+import numpy as np
+
+from app.services.question_bank import DIMENSION_KEYS
+from app.services.preference_engine import neutral_vectors
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS user_preferences (
+    user_id TEXT PRIMARY KEY,
+    vector BLOB NOT NULL,
+    answers INTEGER NOT NULL DEFAULT 0,
+    updated_at REAL NOT NULL,
+    baseline BLOB,
+    baseline_answers INTEGER NOT NULL DEFAULT 0,
+    baseline_answer_id INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS answers (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id TEXT NOT NULL,
+    question_id TEXT NOT NULL,
+    choice TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS answers_user ON answers(user_id);
+"""
+
+# 기준 벡터(PUT으로 옮겨 온 벡터) 컬럼. 이전 스키마로 만든 파일에는 열 때 추가
+BASELINE_COLUMNS = {
+    "baseline": "BLOB",
+    "baseline_answers": "INTEGER NOT NULL DEFAULT 0",
+    "baseline_answer_id": "INTEGER NOT NULL DEFAULT 0",
+}
+
+
+def to_blob(vector: np.ndarray) -> bytes:
+    return np.asarray(vector, dtype=np.float32).tobytes()
+
+
+def from_blob(blob: bytes) -> np.ndarray:
+    return np.frombuffer(blob, dtype=np.float32)
+
+
+class PreferenceStore:
+    """사용자 취향 벡터 저장소 (SQLite, 벡터는 float32 50개 = 200바이트 BLOB)
+
+    answers 테이블에 답변 기록을 남겨, 질문 변화량이 바뀌면 전체 사용자 벡터를 다시 계산할 수 있습니다.
+    직접 설정한 벡터는 기준 벡터(baseline)로 남기고, 재계산은 기준 벡터에 그 뒤의 답변만 다시 적용합니다.
+    recommand_place는 같은 파일을 읽기 전용으로 열어 user_id로 취향 벡터를 가져갑니다.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(user_preferences)")}
+        for name, definition in BASELINE_COLUMNS.items():
+            if name not in columns:
+                self._conn.execute(f"ALTER TABLE user_preferences ADD COLUMN {name} {definition}")
+        self._conn.commit()
+        self._lock = threading.Lock()
+
+    def close(self):
+        self._conn.close()
+
+    def _read(self, user_ids: List[str]) -> Tuple[np.ndarray, np.ndarray, List[bool]]:
+        vectors = neutral_vectors(len(user_ids))
+        counts = np.zeros(len(user_ids), dtype=np.int64)
+        found = [False] * len(user_ids)
+        position = {user_id: i for i, user_id in enumerate(user_ids)}
+        for start in range(0, len(user_ids), 500):
+            chunk = user_ids[start:start + 500]
+            rows = self._conn.execute(
+                f"SELECT user_id, vector, answers FROM user_preferences "
+                f"WHERE user_id IN ({','.join('?' * len(chunk))})", chunk).fetchall()
+            for user_id, blob, answers in rows:
+                i = position[user_id]
+                vectors[i] = from_blob(blob)
+                counts[i] = answers
+                found[i] = True
+        return vectors, counts, found
+
+    def _write(self, user_ids: List[str], vectors: np.ndarray, counts: np.ndarray,
+               answers: Optional[List[Tuple[str, str, str]]] = None):
+        now = time.time()
+        self._conn.executemany(
+            "INSERT INTO user_preferences (user_id, vector, answers, updated_at) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(user_id) DO UPDATE SET vector = excluded.vector, "
+            "answers = excluded.answers, updated_at = excluded.updated_at",
+            [(user_id, to_blob(vector), int(count), now)
+             for user_id, vector, count in zip(user_ids, vectors, counts)],
+        )
+        if answers:
+            self._conn.executemany(
+                "INSERT INTO answers (user_id, question_id, choice, created_at) VALUES (?, ?, ?, ?)",
+                [(user_id, question_id, choice, now) for user_id, question_id, choice in answers],
+            )
+
+    def get_many(self, user_ids: List[str]) -> Tuple[np.ndarray, np.ndarray, List[bool]]:
+        """(사용자 수, 50) 취향 벡터, 답변 수, 저장 여부를 반환합니다. 없는 사용자는 중립 벡터."""
+        with self._lock:
+            return self._read(user_ids)
+
+    def get(self, user_id: str) -> Optional[Dict[str, float]]:
+        vectors, _, found = self.get_many([user_id])
+        if not found[0]:
+            return None
+        return {key: float(value) for key, value in zip(DIMENSION_KEYS, vectors[0])}
+
+    def put_many(self, user_ids: List[str], vectors: np.ndarray, counts: np.ndarray,
+                 answers: Optional[List[Tuple[str, str, str]]] = None):
+        """벡터를 저장하고, answers((user_id, question_id, choice) 목록)가 있으면 같은 트랜잭션에 기록합니다."""
+        with self._lock, self._conn:
+            self._write(user_ids, vectors, counts, answers)
+
+    def update(self, user_ids: List[str], change: Callable[[np.ndarray, np.ndarray], Tuple[np.ndarray, np.ndarray]],
+               answers: Optional[List[Tuple[str, str, str]]] = None):
+        """벡터 읽기 → change(vectors, counts) → 저장을 한 쓰기 트랜잭션(BEGIN IMMEDIATE)으로 처리합니다.
+
+        같은 사용자의 답변 묶음이 동시에 들어와도(스레드풀, 여러 프로세스) 한쪽 결과가 다른 쪽을 덮어쓰지 않습니다.
+        """
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")
+            vectors, counts, _ = self._read(user_ids)
+            vectors, counts = change(vectors, counts)
+            self._write(user_ids, vectors, counts, answers)
+
+    def set_baseline(self, user_id: str, vector: np.ndarray) -> int:
+        """사용자 벡터를 직접 설정하고 기준 벡터로 기록합니다 (지금까지의 답변은 기준 벡터에 포함된 것으로 봄). 답변 수를 반환합니다."""
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")
+            _, counts, _ = self._read([user_id])
+            last_answer_id = self._conn.execute("SELECT COALESCE(MAX(id), 0) FROM answers").fetchone()[0]
+            blob = to_blob(vector)
+            self._conn.execute(
+                "INSERT INTO user_preferences (user_id, vector, answers, updated_at, "
+                "baseline, baseline_answers, baseline_answer_id) VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(user_id) DO UPDATE SET vector = excluded.vector, updated_at = excluded.updated_at, "
+                "baseline = excluded.baseline, baseline_answers = excluded.baseline_answers, "
+                "baseline_answer_id = excluded.baseline_answer_id",
+                (user_id, blob, int(counts[0]), time.time(), blob, int(counts[0]), last_answer_id),
+            )
+        return int(counts[0])
+
+    def rebuild(self, replay: Callable[[List[str], np.ndarray, np.ndarray, List[Tuple[str, str, str]]],
+                                       Tuple[np.ndarray, np.ndarray]]) -> int:
+        """모든 사용자 벡터를 기준 벡터(없으면 중립 벡터)부터 다시 계산합니다. 재계산한 사용자 수를 반환합니다.
+
+        replay(user_ids, 기준 벡터, 기준 답변 수, 기준 이후 답변 목록)이 새 (벡터, 답변 수)를 돌려줍니다.
+        한 쓰기 트랜잭션 안에서 실행되므로 재계산 중 들어온 답변은 재계산이 끝난 뒤에 적용됩니다.
+        """
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")
+            rows = self._conn.execute(
+                "SELECT user_id, baseline, baseline_answers FROM user_preferences").fetchall()
+            answers = self._conn.execute(
+                "SELECT a.user_id, a.question_id, a.choice FROM answers a "
+                "JOIN user_preferences p ON p.user_id = a.user_id "
+                "WHERE a.id > p.baseline_answer_id ORDER BY a.id").fetchall()
+            user_ids = [row[0] for row in rows]
+            vectors = neutral_vectors(len(rows))
+            counts = np.zeros(len(rows), dtype=np.int64)
+            for i, (_, baseline, baseline_answers) in enumerate(rows):
+                if baseline is not None:
+                    vectors[i] = from_blob(baseline)
+                counts[i] = baseline_answers
+            vectors, counts = replay(user_ids, vectors, counts, answers)
+            self._write(user_ids, vectors, counts)
+        return len(user_ids)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            users = self._conn.execute("SELECT COUNT(*) FROM user_preferences").fetchone()[0]
+            answers = self._conn.execute("SELECT COUNT(*) FROM answers").fetchone()[0]
+        return {"users": users, "answers": answers}
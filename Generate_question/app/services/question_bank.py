@@ -0,0 +1,242 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+from typing import Optional, Dict, Any, List, Iterable, Tuple
+
+import numpy as np
+
+from app.core.dimensions import TASTE_DIMENSIONS
+from app.services.question_generator import validate_question
+
+logger = logging.getLogger(__name__)
+
+DIMENSION_KEYS = list(TASTE_DIMENSIONS)
+DIMENSION_INDEX = {key: i for i, key in enumerate(DIMENSION_KEYS)}
+
+# 취향 값의 중립점 (취향 벡터는 0~1 범위)
+NEUTRAL = 0.5
+# 답한 질문들의 |A - B| 합이 이 값만큼 쌓이면 그 차원의 불확실성이 절반이 됨
+EVIDENCE_SCALE = 0.1
+# A를 고를 확률 = sigmoid(SHARPNESS * (A - B) · (취향 - 중립))
+SHARPNESS = 50.0
+
+
+def question_id(question: Dict[str, Any]) -> str:
+    """질문 내용과 선택지로 만든 고정 id (같은 질문은 한 번만 저장)"""
+    key = "|".join([question["question"], question["choice_a"], question["choice_b"]])
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()[:12]
+
+
+def delta_row(vectors: List[Dict[str, Any]]) -> np.ndarray:
+    """[{"dimension": "vec_3", "change": 0.01}, ...] → 50차원 배열 (알 수 없는 차원은 무시)"""
+    row = np.zeros(len(DIMENSION_KEYS), dtype=np.float32)
+    for item in vectors:
+        index = DIMENSION_INDEX.get(item["dimension"])
+        if index is not None:
+            row[index] += item["change"]
+    return row
+
+
+def preference_array(preferences: Optional[Dict[str, float]]) -> np.ndarray:
+    """취향 dict → 50차원 배열 (없는 차원은 중립값)"""
+    array = np.full(len(DIMENSION_KEYS), NEUTRAL, dtype=np.float32)
+    for key, value in (preferences or {}).items():
+        index = DIMENSION_INDEX.get(key)
+        if index is not None:
+            array[index] = value
+    return array
+
+
+class QuestionBank:
+    """생성된 질문을 모아 두고, 사용자별로 다음에 물어볼 질문을 고르는 질문 은행
+
+    각 질문의 선택지 A/B 변화량을 (질문 수, 50) 행렬 두 개로 들고 있어,
+    사용자 한 명의 다음 질문 선택은 은행 전체에 대한 행렬 연산 몇 번으로 끝납니다.
+
+    점수 = (|A - B| · 차원별 불확실성) × 4·p(1 - p)
+      - 차원별 불확실성: 취향 값이 중립에 가까울수록, 이미 답한 질문이 그 차원을 덜 다뤘을수록 큼
+      - p: 현재 취향으로 예상한 A 선택 확률. 답이 뻔한 질문(p가 0 또는 1 근처)은 정보가 적음
+
+    max_size를 넘으면 가장 오래된 질문부터 버립니다. add는 디스크에 바로 쓰지 않고,
+    이벤트 루프 안에서 호출되면 save_delay초 뒤 그 사이 추가된 질문을 모아 스레드풀에서 한 번에 저장합니다.
+    종료 시에는 stop()으로 남은 변경을 저장합니다.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_size: Optional[int] = None, save_delay: float = 5.0):
+        self.path = path
+        self.max_size = max_size
+        self.save_delay = save_delay
+        self._questions: List[Dict[str, Any]] = []
+        self._index: Dict[str, int] = {}
+        self.delta_a = np.zeros((0, len(DIMENSION_KEYS)), dtype=np.float32)
+        self.delta_b = np.zeros((0, len(DIMENSION_KEYS)), dtype=np.float32)
+        self._selected = 0
+        self._exhausted = 0
+        self._evicted = 0
+        self._dirty = False
+        self._save_task: Optional[asyncio.Task] = None
+        self._save_lock = asyncio.Lock()
+
+    def __len__(self) -> int:
+        return len(self._questions)
+
+    def add(self, questions: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """질문을 은행에 추가하고, id가 붙은 질문 목록을 반환합니다 (이미 있는 질문은 기존 것을 반환)."""
+        results = []
+        new_a, new_b = [], []
+        for question in questions:
+            qid = question.get("id") or question_id(question)
+            if qid in self._index:
+                results.append(self._questions[self._index[qid]])
+                continue
+            question = dict(question, id=qid)
+            self._index[qid] = len(self._questions)
+            self._questions.append(question)
+            new_a.append(delta_row(question["vectors_a"]))
+            new_b.append(delta_row(question["vectors_b"]))
+            results.append(question)
+
+        if new_a:
+            self.delta_a = np.vstack([self.delta_a, np.stack(new_a)])
+            self.delta_b = np.vstack([self.delta_b, np.stack(new_b)])
+            self._evict()
+            self._dirty = True
+            self._schedule_save()
+        return results
+
+    def _evict(self):
+        """max_size를 넘은 만큼 가장 오래된 질문을 버립니다."""
+        overflow = len(self._questions) - self.max_size if self.max_size else 0
+        if overflow <= 0:
+            return
+        self._questions = self._questions[overflow:]
+        self.delta_a = self.delta_a[overflow:]
+        self.delta_b = self.delta_b[overflow:]
+        self._index = {question["id"]: i for i, question in enumerate(self._questions)}
+        self._evicted += overflow
+
+    def get(self, qid: str) -> Optional[Dict[str, Any]]:
+        index = self._index.get(qid)
+        return None if index is None else self._questions[index]
+
+    def choice_deltas(self, question_ids: List[str], choices: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """답변 목록에서 고른 선택지의 변화량 (답변 수, 50)과, 은행에 있는 질문인지 여부를 반환합니다."""
+        index = np.array([self._index.get(qid, -1) for qid in question_ids], dtype=np.int64)
+        known = index >= 0
+        deltas = np.zeros((len(index), len(DIMENSION_KEYS)), dtype=np.float32)
+        if known.any():
+            pick_a = np.array([choice == "a" for choice in choices])[known]
+            rows = index[known]
+            deltas[known] = np.where(pick_a[:, None], self.delta_a[rows], self.delta_b[rows])
+        return deltas, known
+
+    def scores(self, preferences: Optional[Dict[str, float]], answered_ids: Iterable[str]) -> np.ndarray:
+        """은행의 모든 질문에 대한 점수 (이미 답한 질문은 -inf)"""
+        answered = [self._index[qid] for qid in answered_ids if qid in self._index]
+        diff = self.delta_a - self.delta_b
+        separation = np.abs(diff)
+
+        centered = preference_array(preferences) - NEUTRAL
+        evidence = separation[answered].sum(axis=0)
+        uncertainty = np.clip(1.0 - 2.0 * np.abs(centered), 0.05, 1.0) / (1.0 + evidence / EVIDENCE_SCALE)
+
+        prob_a = 1.0 / (1.0 + np.exp(-SHARPNESS * (diff @ centered)))
+        scores = (separation @ uncertainty) * (4.0 * prob_a * (1.0 - prob_a))
+        scores[answered] = -np.inf
+        return scores
+
+    def select(self, preferences: Optional[Dict[str, float]], answered_ids: Iterable[str],
+               count: int = 1) -> List[Dict[str, Any]]:
+        """아직 답하지 않은 질문 중 점수가 높은 순으로 최대 count개를 반환합니다."""
+        if not self._questions:
+            self._exhausted += 1
+            return []
+        scores = self.scores(preferences, answered_ids)
+        count = min(count, len(scores))
+        top = np.argpartition(-scores, count - 1)[:count]
+        top = top[np.argsort(-scores[top])]
+        selected = [self._questions[i] for i in top if np.isfinite(scores[i])]
+        self._selected += len(selected)
+        if len(selected) < count:
+            self._exhausted += 1
+        return selected
+
+    def load(self) -> int:
+        if not self.path or not os.path.exists(self.path):
+            return 0
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                saved = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"질문 은행을 읽지 못했습니다: {e}")
+            return 0
+        questions = []
+        for item in saved:
+            question = validate_question(item)
+            if question is not None:
+                questions.append(dict(question, id=item.get("id") or question_id(question)))
+        self.add(questions)
+        # 파일과 같은 내용이므로 다시 쓸 필요 없음 (max_size로 잘린 경우만 저장)
+        self._dirty = len(self._questions) < len(questions)
+        return len(self._questions)
+
+    def _schedule_save(self):
+        if not self.path or (self._save_task is not None and not self._save_task.done()):
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._save_task = loop.create_task(self._save_later())
+
+    async def _save_later(self):
+        await asyncio.sleep(self.save_delay)
+        await self.flush()
+
+    async def flush(self):
+        """변경된 내용이 있으면 스레드풀에서 저장합니다."""
+        async with self._save_lock:
+            if not self._dirty or not self.path:
+                return
+            self._dirty = False
+            # 이벤트 루프 스레드에서 목록을 복사해 두고 파일 쓰기만 스레드풀로 넘김
+            questions = list(self._questions)
+            saved = await asyncio.get_running_loop().run_in_executor(None, self._write, questions)
+            if not saved:
+                self._dirty = True
+
+    async def stop(self):
+        if self._save_task is not None and not self._save_task.done():
+            self._save_task.cancel()
+            try:
+                await self._save_task
+            except asyncio.CancelledError:
+                pass
+        self._save_task = None
+        await self.flush()
+
+    def _write(self, questions: List[Dict[str, Any]]) -> bool:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(questions, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"질문 은행을 저장하지 못했습니다: {e}")
+            return False
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "size": len(self._questions),
+            "max_size": self.max_size,
+            "evicted": self._evicted,
+            "dimensions": len(DIMENSION_KEYS),
+            "selected": self._selected,
+            "exhausted": self._exhausted,
+        }
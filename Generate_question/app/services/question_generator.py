@@ -1,82 +1,142 @@
 import json
 import logging
-from typing import Optional, Dict, Any
-from openai import OpenAI
-from app.core.config import OPENAI_API_KEY, OPENAI_MODEL
+import time
+from typing import Optional, Dict, Any, List, AsyncIterator, Tuple
+from openai import AsyncOpenAI
+from pydantic import ValidationError
+from app.core.config import OPENAI_MODEL
 from app.core.dimensions import get_dimensions_text
+from app.core.llm_client import get_llm_client
+from app.core.prompt import Prompt, complete, prompt_stats
+from app.schemas.question import QuestionResponse
+from app.services.json_stream import JsonFieldStream
 
 logger = logging.getLogger(__name__)
 
 
+def validate_question(data: Any) -> Optional[Dict[str, Any]]:
+    """QuestionResponse 형식에 맞으면 정규화된 dict를, 아니면 None을 반환합니다."""
+    try:
+        return QuestionResponse.model_validate(data).model_dump()
+    except ValidationError as e:
+        logger.warning(f"형식에 맞지 않는 질문을 버립니다: {e.error_count()}개 오류")
+        return None
+
+
+# 호출마다 바뀌지 않는 지시문 (프롬프트 캐시 접두사). 요청 개수 등 바뀌는 값은 user 메시지로 보냄
+QUESTION_INSTRUCTIONS = f"""너는 커플의 취향을 파악하기 위한 이지선다 질문을 만드는 전문 작가야. 항상 JSON으로만 응답해.
+
+## 너의 임무
+아래 50개의 취향 차원 목록을 보고, 커플의 성향을 명확하게 구분할 수 있는 흥미로운 질문을 요청받은 개수만큼 생성해줘.
+
+## 규칙
+1. 두 선택지(A와 B)는 서로 상반되거나 명확히 다른 가치를 대표해야 해.
+2. 각 선택지는 2~4개의 취향 차원에 영향을 줘야 해.
+3. 변화량(change)은 -0.05 ~ +0.05 사이이고, 각 선택지에 양수와 음수를 반드시 섞어야 해 (예: 0.037, -0.004, -0.028).
+4. A에서 +0.007인 차원은 B에서 -0.007로 반대값을 주거나, B는 다른 차원에 영향을 줘.
+5. 차원은 반드시 vec_1 ~ vec_50 형식으로 표현해.
+6. 매번 다른 카테고리의 차원을 조합해서 식상하지 않은 질문을 만들어.
+7. 응답 형식:
+{{"questions": [{{"question": "질문 내용", "choice_a": "선택지 A", "vectors_a": [{{"dimension": "vec_1", "change": 0.007}}, {{"dimension": "vec_2", "change": -0.004}}], "choice_b": "선택지 B", "vectors_b": [{{"dimension": "vec_1", "change": -0.007}}, {{"dimension": "vec_4", "change": 0.006}}]}}]}}
+
+## 50개 취향 차원
+{get_dimensions_text()}"""
+
+QUESTION_PROMPT = Prompt("question_generation", QUESTION_INSTRUCTIONS, OPENAI_MODEL)
+
+# 스트리밍 중 바로 내보낼 필드와, 그 필드가 들어 있는 객체 위치 (질문 하나만 객체로 오는 경우도 허용)
+STREAM_FIELDS = ("question", "choice_a", "vectors_a", "choice_b", "vectors_b")
+STREAM_PATHS = (("questions", 0), ())
+
+
+def extract_questions(content: Any) -> List[Dict[str, Any]]:
+    """LLM 응답 JSON에서 형식에 맞는 질문만 꺼냅니다."""
+    # {"questions": [...]} 형식이 기본이며, 질문 하나만 객체로 오는 경우도 받아줌
+    items = content.get("questions", [content]) if isinstance(content, dict) else content
+    if not isinstance(items, list):
+        items = []
+    return [question for question in map(validate_question, items) if question is not None]
+
 
 class QuestionGenerator:
-    def __init__(self):
-        """질문 생성기 초기화"""
+    def __init__(self, client: Optional[AsyncOpenAI] = None):
+        """질문 생성기 초기화
+
+        client를 주지 않으면 프로세스 공유 클라이언트(app.core.llm_client)를 사용합니다.
+        """
+        self._client = client
         logger.info("QuestionGenerator가 초기화되었습니다.")
 
+    @property
+    def client(self) -> AsyncOpenAI:
+        return self._client or get_llm_client()
+
     async def generate_question(self) -> Optional[Dict[str, Any]]:
         """
         OpenAI의 LLM을 사용하여 커플의 취향을 파악할 수 있는
         이지선다 질문과 벡터 조정 값을 포함한 JSON 객체를 생성합니다.
         """
-        dimensions_text = get_dimensions_text()
-        
-        prompt = f"""너는 커플의 취향을 파악하기 위한 이지선다 질문을 만드는 전문 작가야.
-아래 규칙에 따라 JSON 형식으로 응답해줘.
-
-## 너의 임무
-아래 50개의 취향 차원 목록을 보고, 커플의 성향을 명확하게 구분할 수 있는 흥미로운 질문을 '하나만' 생성해줘.
-
-## 따라야 할 규칙
-1. 두 선택지(A와 B)는 서로 상반되거나 명확히 다른 가치를 대표해야 해.
-2. 각 선택지는 최소 2개, 최대 4개의 취향 차원에 영향을 줘야 해.
-3. 영향을 주는 각 차원의 변화량(change)은 -0.05에서 +0.05 사이의 값이어야 해.
-4. **중요**: 변화량은 양수와 음수를 모두 포함해야 해. 각 선택지에 반드시 음수 값도 포함시켜야 해.
-5. 변화량 예시: 0.037, -0.004, 0.039, -0.028, 0.003, -0.046, 0.005, -0.002
-6. 차원은 반드시 vec_1, vec_2, ..., vec_50 형식으로 표현해야 해.
-7. 매번 다른 카테고리의 차원들을 조합해서, 식상하지 않고 새로운 질문을 만들어줘.
-8. 응답은 반드시 다음 JSON 형식을 따라야 해:
-   {{
-     "question": "질문 내용",
-     "choice_a": "선택지 A 내용",
-     "vectors_a": [
-       {{"dimension": "vec_1", "change": 0.007}},
-       {{"dimension": "vec_2", "change": -0.004}},
-       {{"dimension": "vec_3", "change": 0.009}}
-     ],
-     "choice_b": "선택지 B 내용",
-     "vectors_b": [
-       {{"dimension": "vec_1", "change": -0.007}},
-       {{"dimension": "vec_2", "change": 0.004}},
-       {{"dimension": "vec_4", "change": -0.006}}
-     ]
-   }}
-
-## 변화량 생성 가이드
-- 선택지 A에서 어떤 차원이 +0.007이면, 선택지 B에서는 -0.007로 반대값을 주거나
-- 완전히 다른 차원에 영향을 주되, 반드시 양수와 음수를 섞어서 사용해야 함
-- 예: choice_a에 [0.008, -0.005, 0.003], choice_b에 [-0.008, 0.005, -0.003]
-
-## 분석할 50개 취향 차원 목록
-{dimensions_text}"""
+        questions = await self.generate_questions(1)
+        return questions[0] if questions else None
 
+    async def generate_questions(self, count: int) -> List[Dict[str, Any]]:
+        """
+        한 번의 LLM 호출로 서로 다른 질문 count개를 생성합니다.
+        50개 차원 목록과 규칙은 고정 지시문(QUESTION_PROMPT)으로 보내며, 형식에 맞지 않는 질문은 버립니다.
+        """
         try:
-            logger.info("LLM에게 새로운 질문 생성을 요청합니다...")
-            # 가장 기본적인 형태로 클라이언트 초기화
-            client = OpenAI()
-            response = client.chat.completions.create(
-                model=OPENAI_MODEL,
+            logger.info(f"LLM에게 새로운 질문 {count}개 생성을 요청합니다...")
+            response = await complete(
+                self.client,
+                QUESTION_PROMPT,
+                {"요청": f"질문을 정확히 {count}개 생성해줘. 질문마다 서로 다른 주제와 차원 조합을 사용해."},
                 response_format={"type": "json_object"},
-                messages=[
-                    {"role": "system", "content": "You are a helpful assistant that always responds in JSON format."},
-                    {"role": "user", "content": prompt}
-                ]
             )
-            
-            result = json.loads(response.choices[0].message.content)
-            logger.info("질문 생성이 완료되었습니다!")
-            return result
+            content = json.loads(response.choices[0].message.content)
 
         except Exception as e:
             logger.error(f"LLM 호출 실패: {e}")
-            return None 
\ No newline at end of file
+            return []
+
+        questions = extract_questions(content)
+        logger.info(f"질문 생성이 완료되었습니다! ({len(questions)}/{count}개 유효)")
+        return questions[:count]
+
+    async def stream_question(self) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """
+        질문 하나를 스트리밍으로 생성합니다.
+        필드가 완성될 때마다 ("field", {"field": 이름, "value": 값})를 내보내고, 끝나면 전체를 QuestionResponse로
+        검증해 ("done", 질문) 또는 ("error", {"detail": 이유})를 내보냅니다. 최종 결과는 done 이벤트 기준입니다.
+        """
+        messages, section_tokens = QUESTION_PROMPT.build(
+            {"요청": "질문을 정확히 1개 생성해줘. 질문마다 서로 다른 주제와 차원 조합을 사용해."})
+        parser = JsonFieldStream()
+        start = time.perf_counter()
+        try:
+            stream = await self.client.chat.completions.create(
+                model=QUESTION_PROMPT.model,
+                messages=messages,
+                response_format={"type": "json_object"},
+                stream=True,
+            )
+            async for chunk in stream:
+                if not chunk.choices or not chunk.choices[0].delta.content:
+                    continue
+                for path, key, value in parser.feed(chunk.choices[0].delta.content):
+                    if path in STREAM_PATHS and key in STREAM_FIELDS:
+                        yield "field", {"field": key, "value": value}
+        except Exception as e:
+            logger.error(f"LLM 스트리밍 호출 실패: {e}")
+            yield "error", {"detail": str(e)}
+            return
+        # 스트리밍 응답에는 usage가 없으므로 섹션별 로컬 토큰 수와 지연 시간만 기록
+        prompt_stats.record(QUESTION_PROMPT.name + "_stream", section_tokens, None, time.perf_counter() - start)
+
+        try:
+            questions = extract_questions(json.loads(parser.buffer))
+        except ValueError:
+            questions = []
+        if questions:
+            yield "done", questions[0]
+        else:
+            yield "error", {"detail": "생성된 질문이 형식(QuestionResponse)에 맞지 않습니다."}
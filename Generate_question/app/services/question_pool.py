@@ -0,0 +1,167 @@
+import asyncio
+import json
+import logging
+import os
+import time
+from collections import deque
+from typing import Optional, Dict, Any, Deque, List
+
+from app.services.question_bank import QuestionBank
+from app.services.question_generator import QuestionGenerator, validate_question
+
+logger = logging.getLogger(__name__)
+
+
+class QuestionPool:
+    """미리 생성해 둔 질문 풀
+
+    요청은 풀에서 질문을 바로 꺼내 응답하고, 풀이 low_water 아래로 내려가면
+    백그라운드 작업이 max_size까지 다시 채웁니다. 종료 시와 채울 때마다 남은 질문을
+    디스크에 저장해 재시작 직후에도 풀이 채워진 상태로 시작합니다.
+    bank를 주면 새로 생성한 질문을 질문 은행에도 쌓고, 은행 id가 붙은 질문을 풀에 넣습니다.
+    """
+
+    def __init__(self, generator: QuestionGenerator, max_size: int = 50, low_water: int = 20,
+                 refill_concurrency: int = 4, snapshot_path: Optional[str] = None,
+                 batch_size: int = 5, bank: Optional[QuestionBank] = None):
+        self.generator = generator
+        self.bank = bank
+        self.max_size = max_size
+        self.low_water = min(low_water, max_size)
+        self.refill_concurrency = max(1, refill_concurrency)
+        self.snapshot_path = snapshot_path
+        # LLM 호출 한 번에 생성할 질문 수
+        self.batch_size = max(1, batch_size)
+        self._questions: Deque[Dict[str, Any]] = deque(maxlen=max_size)
+        self._refill_needed = asyncio.Event()
+        self._refill_task: Optional[asyncio.Task] = None
+
+        # 통계
+        self._served = 0
+        self._misses = 0
+        self._generated = 0
+        self._failed = 0
+        self._last_refill_seconds: Optional[float] = None
+
+    async def start(self):
+        """스냅샷을 불러오고 백그라운드 채우기 작업을 시작합니다."""
+        loaded = self.load_snapshot()
+        if loaded:
+            logger.info(f"질문 풀 스냅샷에서 {loaded}개를 불러왔습니다.")
+            if self.bank is not None:
+                self.bank.add(list(self._questions))
+        self._refill_task = asyncio.create_task(self._refill_loop())
+        self._refill_needed.set()
+
+    async def stop(self):
+        if self._refill_task is not None:
+            self._refill_task.cancel()
+            try:
+                await self._refill_task
+            except asyncio.CancelledError:
+                pass
+            self._refill_task = None
+        self.save_snapshot()
+
+    def take(self) -> Optional[Dict[str, Any]]:
+        """풀에서 질문 하나를 꺼냅니다. 비어 있으면 None을 반환합니다."""
+        try:
+            question = self._questions.popleft()
+            self._served += 1
+        except IndexError:
+            question = None
+            self._misses += 1
+        if len(self._questions) < self.low_water:
+            self._refill_needed.set()
+        return question
+
+    def take_many(self, count: int) -> List[Dict[str, Any]]:
+        """풀에서 최대 count개를 꺼냅니다. 풀이 모자라면 있는 만큼만 반환합니다."""
+        questions = []
+        while len(questions) < count:
+            question = self.take()
+            if question is None:
+                break
+            questions.append(question)
+        return questions
+
+    def load_snapshot(self) -> int:
+        if not self.snapshot_path or not os.path.exists(self.snapshot_path):
+            return 0
+        try:
+            with open(self.snapshot_path, "r", encoding="utf-8") as f:
+                saved = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"질문 풀 스냅샷을 읽지 못했습니다: {e}")
+            return 0
+        for item in saved:
+            question = validate_question(item)
+            if question is not None:
+                self._questions.append(question)
+        return len(self._questions)
+
+    def save_snapshot(self):
+        if not self.snapshot_path:
+            return
+        directory = os.path.dirname(self.snapshot_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = self.snapshot_path + ".tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(list(self._questions), f, ensure_ascii=False)
+            os.replace(tmp_path, self.snapshot_path)
+        except OSError as e:
+            logger.warning(f"질문 풀 스냅샷을 저장하지 못했습니다: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        requests = self._served + self._misses
+        return {
+            "size": len(self._questions),
+            "max_size": self.max_size,
+            "low_water": self.low_water,
+            "batch_size": self.batch_size,
+            "served": self._served,
+            "misses": self._misses,
+            "hit_ratio": round(self._served / requests, 4) if requests else 0.0,
+            "generated": self._generated,
+            "failed": self._failed,
+            "last_refill_seconds": self._last_refill_seconds,
+            "refilling": self._refill_needed.is_set(),
+        }
+
+    async def _refill_loop(self):
+        while True:
+            await self._refill_needed.wait()
+            start = time.perf_counter()
+            failures_in_row = 0
+            while len(self._questions) < self.max_size:
+                missing = self.max_size - len(self._questions)
+                calls = min(self.refill_concurrency, -(-missing // self.batch_size))
+                wanted = min(missing, calls * self.batch_size)
+                results = await asyncio.gather(
+                    *(self.generator.generate_questions(min(self.batch_size, wanted - i * self.batch_size))
+                      for i in range(calls)),
+                    return_exceptions=True,
+                )
+                added = 0
+                for result in results:
+                    if isinstance(result, list):
+                        if self.bank is not None:
+                            result = self.bank.add(result)
+                        self._questions.extend(result)
+                        added += len(result)
+                self._generated += added
+                self._failed += wanted - added
+
+                if added == 0:
+                    # LLM 오류가 이어지면 호출 간격을 늘림 (최대 60초)
+                    failures_in_row += 1
+                    await asyncio.sleep(min(60, 2 ** failures_in_row))
+                else:
+                    failures_in_row = 0
+
+            self._last_refill_seconds = round(time.perf_counter() - start, 3)
+            self._refill_needed.clear()
+            self.save_snapshot()
+            logger.info(f"질문 풀 채우기 완료: {len(self._questions)}개 ({self._last_refill_seconds}초)")
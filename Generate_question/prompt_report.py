@@ -0,0 +1,107 @@
+"""프롬프트 토큰/지연 시간 비교 리포트 (질문 생성)
+
+이전 프롬프트(지시문 전체를 user 메시지 하나로 보내던 방식)와 현재 QUESTION_PROMPT를 비교합니다.
+기본은 로컬 토큰 수만 세고, --live N을 주면 각각 N번 실제로 호출해 지연 시간과 usage 토큰(캐시 포함)도 잽니다.
+
+사용 예:
+    python prompt_report.py
+    python prompt_report.py --live 5 --count 5
+"""
+
+import argparse
+import asyncio
+import json
+
+from app.core.dimensions import get_dimensions_text
+from app.core.llm_client import close_llm_client, get_llm_client
+from app.core.prompt import measure, message_tokens
+from app.services.question_generator import QUESTION_PROMPT
+
+# 변경 전 프롬프트 (비교용으로만 보관)
+LEGACY_TEMPLATE = """너는 커플의 취향을 파악하기 위한 이지선다 질문을 만드는 전문 작가야.
+아래 규칙에 따라 JSON 형식으로 응답해줘.
+
+## 너의 임무
+아래 50개의 취향 차원 목록을 보고, 커플의 성향을 명확하게 구분할 수 있는 흥미로운 질문을 정확히 {count}개 생성해줘.
+여러 개를 만들 때는 질문마다 서로 다른 주제와 차원 조합을 사용해야 해.
+
+## 따라야 할 규칙
+1. 두 선택지(A와 B)는 서로 상반되거나 명확히 다른 가치를 대표해야 해.
+2. 각 선택지는 최소 2개, 최대 4개의 취향 차원에 영향을 줘야 해.
+3. 영향을 주는 각 차원의 변화량(change)은 -0.05에서 +0.05 사이의 값이어야 해.
+4. **중요**: 변화량은 양수와 음수를 모두 포함해야 해. 각 선택지에 반드시 음수 값도 포함시켜야 해.
+5. 변화량 예시: 0.037, -0.004, 0.039, -0.028, 0.003, -0.046, 0.005, -0.002
+6. 차원은 반드시 vec_1, vec_2, ..., vec_50 형식으로 표현해야 해.
+7. 매번 다른 카테고리의 차원들을 조합해서, 식상하지 않고 새로운 질문을 만들어줘.
+8. 응답은 반드시 다음 JSON 형식을 따라야 해 (questions 배열에 질문 {count}개):
+   {{
+     "questions": [
+       {{
+         "question": "질문 내용",
+         "choice_a": "선택지 A 내용",
+         "vectors_a": [
+           {{"dimension": "vec_1", "change": 0.007}},
+           {{"dimension": "vec_2", "change": -0.004}},
+           {{"dimension": "vec_3", "change": 0.009}}
+         ],
+         "choice_b": "선택지 B 내용",
+         "vectors_b": [
+           {{"dimension": "vec_1", "change": -0.007}},
+           {{"dimension": "vec_2", "change": 0.004}},
+           {{"dimension": "vec_4", "change": -0.006}}
+         ]
+       }}
+     ]
+   }}
+
+## 변화량 생성 가이드
+- 선택지 A에서 어떤 차원이 +0.007이면, 선택지 B에서는 -0.007로 반대값을 주거나
+- 완전히 다른 차원에 영향을 주되, 반드시 양수와 음수를 섞어서 사용해야 함
+- 예: choice_a에 [0.008, -0.005, 0.003], choice_b에 [-0.008, 0.005, -0.003]
+
+## 분석할 50개 취향 차원 목록
+{dimensions_text}"""
+
+
+def legacy_messages(count: int):
+    prompt = LEGACY_TEMPLATE.format(count=count, dimensions_text=get_dimensions_text())
+    return [
+        {"role": "system", "content": "You are a helpful assistant that always responds in JSON format."},
+        {"role": "user", "content": prompt},
+    ]
+
+
+def current_messages(count: int):
+    messages, section_tokens = QUESTION_PROMPT.build(
+        {"요청": f"질문을 정확히 {count}개 생성해줘. 질문마다 서로 다른 주제와 차원 조합을 사용해."})
+    return messages, section_tokens
+
+
+async def main(args):
+    before = legacy_messages(args.count)
+    after, section_tokens = current_messages(args.count)
+    report = {
+        "count": args.count,
+        "before": {"local_tokens": message_tokens(before, QUESTION_PROMPT.model)},
+        "after": {"local_tokens": message_tokens(after, QUESTION_PROMPT.model), "section_tokens": section_tokens},
+    }
+    if args.live:
+        client = get_llm_client()
+        try:
+            for key, messages in (("before", before), ("after", after)):
+                report[key].update(await measure(client, QUESTION_PROMPT.model, messages, args.live,
+                                                 response_format={"type": "json_object"}))
+        finally:
+            await close_llm_client()
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="질문 생성 프롬프트 변경 전/후 토큰 및 지연 시간 비교")
+    parser.add_argument("--count", type=int, default=1, help="한 번에 생성할 질문 수")
+    parser.add_argument("--live", type=int, default=0, help="실제 API 호출 횟수 (0이면 로컬 토큰 수만)")
+    parser.add_argument("--output", default="prompt_report.json")
+    asyncio.run(main(parser.parse_args()))
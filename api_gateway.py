@@ -4,13 +4,19 @@ API Gateway - 3개의 독립적인 서버를 통합하는 게이트웨이
 
 import httpx
 import json
-from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect
+import logging
+import os
+import time
+from collections import deque
+from fastapi import FastAPI, HTTPException, Query, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel, Field
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Union
 import asyncio
 
+logger = logging.getLogger(__name__)
+
 # API Gateway 앱 생성
 app = FastAPI(
     title="커플 앱 - 통합 API Gateway",
@@ -43,6 +49,32 @@ SERVICES = {
     "text_ai": "http://localhost:8003"
 }
 
+# 상태 확인 경로 (Text AI는 모델 로드/warmup 전에도 /가 200이므로 /ready 사용)
+HEALTH_PATHS = {
+    "text_ai": "/ready",
+}
+
+# 백엔드별 연결 풀 설정 (환경 변수로 조정)
+MAX_CONNECTIONS = int(os.getenv("GATEWAY_MAX_CONNECTIONS", "100"))
+MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("GATEWAY_MAX_KEEPALIVE_CONNECTIONS", "20"))
+KEEPALIVE_EXPIRY = float(os.getenv("GATEWAY_KEEPALIVE_EXPIRY", "30"))
+HTTP2 = os.getenv("GATEWAY_HTTP2", "false").lower() == "true"
+
+# 경로별 응답 대기 시간(초). 장소 추천은 LLM을 여러 번 호출하므로 길게, 헬스체크는 짧게
+CONNECT_TIMEOUT = float(os.getenv("GATEWAY_CONNECT_TIMEOUT", "5"))
+TIMEOUTS = {
+    "default": float(os.getenv("GATEWAY_DEFAULT_TIMEOUT", "30")),
+    "planner": float(os.getenv("GATEWAY_PLANNER_TIMEOUT", "120")),
+    "health": float(os.getenv("GATEWAY_HEALTH_TIMEOUT", "2")),
+}
+
+# 서비스 상태 확인 주기(초)와 응답 시간 평균을 낼 최근 확인 횟수
+PROBE_INTERVAL = float(os.getenv("GATEWAY_PROBE_INTERVAL", "10"))
+LATENCY_WINDOW = int(os.getenv("GATEWAY_LATENCY_WINDOW", "30"))
+
+# 서비스 이름 → 장기 유지되는 httpx.AsyncClient (startup에서 생성, shutdown에서 닫음)
+clients: Dict[str, httpx.AsyncClient] = {}
+
 # 공통 응답 모델
 class ServiceStatus(BaseModel):
     service: str
@@ -66,6 +98,7 @@ class VectorChange(BaseModel):
 
 class QuestionResponse(BaseModel):
     """질문 생성 응답"""
+    id: Optional[str] = Field(None, description="질문 은행의 질문 id (답한 질문 목록에 사용)")
     question: str = Field(..., description="생성된 질문")
     choice_a: str = Field(..., description="선택지 A")
     vectors_a: List[VectorChange] = Field(..., description="선택지 A의 취향 벡터 변화량")
@@ -89,10 +122,17 @@ class QuestionResponse(BaseModel):
             }
         }
 
+class NextQuestionRequest(BaseModel):
+    """다음 질문 선택 요청"""
+    preferences: Dict[str, float] = Field(default_factory=dict, description="현재 50차원 취향 벡터 (없는 차원은 0.5)")
+    answered_ids: List[str] = Field(default_factory=list, description="이미 답한 질문 id 목록")
+    count: int = Field(1, ge=1, description="받을 질문 수")
+
 # Recommend Place API 스키마
 class UserPreference(BaseModel):
     gender: str = Field(..., description="성별 (M/F)")
-    preferences: Dict[str, float] = Field(..., description="50차원의 취향 벡터")
+    user_id: Optional[str] = Field(None, description="취향 저장소의 사용자 id (preferences 대신 사용)")
+    preferences: Optional[Dict[str, float]] = Field(None, description="50차원의 취향 벡터 (없으면 user_id로 조회)")
 
 class PlannerRequest(BaseModel):
     user1: UserPreference = Field(..., description="첫 번째 사용자 정보")
@@ -163,40 +203,169 @@ class PredictionResponse(BaseModel):
             }
         }
 
+class BatchTextRequest(BaseModel):
+    texts: List[str] = Field(..., description="분류할 텍스트 목록 (최대 1000개)")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "texts": ["오늘 너무 힘들었어.", "나 다음 주부터 운동 시작해볼까?"]
+            }
+        }
+
+class BatchPredictionResponse(BaseModel):
+    predictions: List[PredictionResponse] = Field(..., description="요청 순서와 같은 순서의 예측 결과")
+
 # HTTP 클라이언트 설정
-async def make_request(method: str, url: str, **kwargs):
-    """외부 서비스로 HTTP 요청을 보내는 공통 함수"""
-    async with httpx.AsyncClient(timeout=30.0) as client:
+def route_timeout(route: str = "default", stream: bool = False) -> httpx.Timeout:
+    """경로별 시간 제한. 연결은 CONNECT_TIMEOUT, 나머지는 TIMEOUTS[route] (stream이면 읽기 제한 없음)"""
+    timeout = TIMEOUTS[route]
+    return httpx.Timeout(timeout, connect=min(CONNECT_TIMEOUT, timeout), read=None if stream else timeout)
+
+def _http2_enabled() -> bool:
+    if not HTTP2:
+        return False
+    try:
+        import h2  # noqa: F401  (httpx[http2] 선택 의존성)
+    except ImportError:
+        logger.warning("GATEWAY_HTTP2=true 이지만 h2 패키지가 없어 HTTP/1.1을 사용합니다 (pip install 'httpx[http2]')")
+        return False
+    return True
+
+async def make_request(service: str, method: str, path: str, route: str = "default", **kwargs):
+    """외부 서비스로 HTTP 요청을 보내는 공통 함수 (서비스별 공유 클라이언트 사용)"""
+    try:
+        return await clients[service].request(method, path, timeout=route_timeout(route), **kwargs)
+    except httpx.RequestError as e:
+        raise HTTPException(
+            status_code=503,
+            detail=f"서비스 연결 실패: {str(e)}"
+        )
+
+class ServiceHealth:
+    """서비스 하나의 최근 상태 확인 결과 (백그라운드 확인 작업이 갱신하고, 상태 엔드포인트는 읽기만 함)"""
+
+    def __init__(self, name: str, url: str):
+        self.name = name
+        self.url = url
+        self.status = "unknown"
+        self.error: Optional[str] = None
+        self.checked_at: Optional[float] = None
+        self.consecutive_failures = 0
+        self.latency: Optional[float] = None
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+
+    def record(self, status: str, latency: Optional[float] = None, error: Optional[str] = None):
+        if status != self.status:
+            log = logger.info if status == "healthy" else logger.warning
+            log(f"{self.name} 서비스 상태: {self.status} → {status}" + (f" ({error})" if error else ""))
+        self.status = status
+        self.error = error
+        self.checked_at = time.time()
+        self.consecutive_failures = 0 if status == "healthy" else self.consecutive_failures + 1
+        self.latency = latency
+        if latency is not None:
+            self.latencies.append(latency)
+
+    def to_dict(self) -> Dict[str, Any]:
+        latencies = sorted(self.latencies)
+        result = {
+            "status": self.status,
+            "url": self.url,
+            "response_time": round(self.latency, 4) if self.latency is not None else None,
+            "avg_response_time": round(sum(latencies) / len(latencies), 4) if latencies else None,
+            "p95_response_time": round(latencies[min(len(latencies) - 1, int(0.95 * len(latencies)))], 4) if latencies else None,
+            "samples": len(latencies),
+            "checked_seconds_ago": round(time.time() - self.checked_at, 1) if self.checked_at else None,
+            "consecutive_failures": self.consecutive_failures,
+        }
+        if self.error:
+            result["error"] = self.error
+        return result
+
+service_health: Dict[str, ServiceHealth] = {name: ServiceHealth(name, url) for name, url in SERVICES.items()}
+_probe_task: Optional[asyncio.Task] = None
+
+async def probe_service(service_name: str):
+    """서비스 상태 확인 경로(기본 /)를 한 번 호출해 상태와 응답 시간을 기록합니다."""
+    health = service_health[service_name]
+    start = time.perf_counter()
+    try:
+        response = await clients[service_name].get(HEALTH_PATHS.get(service_name, "/"),
+                                                    timeout=route_timeout("health"))
+    except httpx.RequestError as e:
+        health.record("unreachable", error=str(e) or type(e).__name__)
+        return
+    except Exception as e:
+        # 잘못된 URL 등 예상하지 못한 오류도 상태로 남겨 확인 작업이 멈추지 않게 함
+        logger.exception(f"{service_name} 서비스 상태 확인 중 오류")
+        health.record("unhealthy", error=f"{type(e).__name__}: {e}")
+        return
+    latency = time.perf_counter() - start
+    if response.status_code == 200:
+        health.record("healthy", latency)
+    else:
+        health.record("unhealthy", latency, error=f"HTTP {response.status_code}")
+
+async def probe_loop():
+    """모든 서비스를 동시에 확인하고 PROBE_INTERVAL마다 반복합니다. 한 번의 확인이 실패해도 계속 돕니다."""
+    while True:
         try:
-            response = await client.request(method, url, **kwargs)
-            return response
-        except httpx.RequestError as e:
-            raise HTTPException(
-                status_code=503,
-                detail=f"서비스 연결 실패: {str(e)}"
-            )
+            await asyncio.gather(*(probe_service(name) for name in SERVICES))
+        except Exception:
+            logger.exception("서비스 상태 확인 반복 중 오류")
+        await asyncio.sleep(PROBE_INTERVAL)
+
+@app.on_event("startup")
+async def start_gateway():
+    """서비스마다 keep-alive 연결 풀을 가진 클라이언트를 하나씩 만들고, 백그라운드 상태 확인을 시작합니다."""
+    global _probe_task
+    limits = httpx.Limits(
+        max_connections=MAX_CONNECTIONS,
+        max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=KEEPALIVE_EXPIRY,
+    )
+    http2 = _http2_enabled()
+    for service_name, service_url in SERVICES.items():
+        clients[service_name] = httpx.AsyncClient(
+            base_url=service_url,
+            limits=limits,
+            timeout=route_timeout(),
+            http2=http2,
+        )
+    _probe_task = asyncio.create_task(probe_loop())
+
+@app.on_event("shutdown")
+async def stop_gateway():
+    global _probe_task
+    if _probe_task is not None:
+        _probe_task.cancel()
+        try:
+            await _probe_task
+        except asyncio.CancelledError:
+            pass
+        _probe_task = None
+    await asyncio.gather(*(client.aclose() for client in clients.values()))
+    clients.clear()
 
 # =============================================================================
 # 게이트웨이 정보 및 헬스체크
 # =============================================================================
 
+STATUS_LABELS = {
+    "healthy": "✅ 정상",
+    "unhealthy": "❌ 오류",
+    "unreachable": "❌ 연결 실패",
+    "unknown": "⏳ 확인 중",
+}
+
 @app.get("/", response_model=GatewayInfo)
 async def gateway_info():
-    """API Gateway 정보 및 서비스 상태 확인"""
-    services_status = []
-    
-    for service_name, service_url in SERVICES.items():
-        try:
-            response = await make_request("GET", f"{service_url}/")
-            status = "✅ 정상" if response.status_code == 200 else "❌ 오류"
-        except:
-            status = "❌ 연결 실패"
-        
-        services_status.append(ServiceStatus(
-            service=service_name,
-            status=status,
-            url=service_url
-        ))
+    """API Gateway 정보 및 서비스 상태 확인 (백그라운드 확인 결과를 반환하며 서비스로 요청을 보내지 않음)"""
+    services_status = [
+        ServiceStatus(service=health.name, status=STATUS_LABELS[health.status], url=health.url)
+        for health in service_health.values()
+    ]
     
     return GatewayInfo(
         message="커플 앱 API Gateway가 정상 작동 중입니다!",
@@ -206,21 +375,26 @@ async def gateway_info():
 
 @app.get("/health")
 async def health_check():
-    """헬스체크 엔드포인트"""
-    return {"status": "healthy", "gateway": "running"}
+    """헬스체크 엔드포인트 (서비스 상태는 마지막 백그라운드 확인 결과)"""
+    return {
+        "status": "healthy",
+        "gateway": "running",
+        "services": {name: health.status for name, health in service_health.items()},
+    }
 
 # =============================================================================
 # 질문 생성 서비스 (Generate Question API)
 # =============================================================================
 
 @app.get("/api/v1/questions/generate", 
-         response_model=QuestionResponse,
+         response_model=Union[QuestionResponse, List[QuestionResponse]],
          tags=["🤔 Questions"],
          summary="새로운 취향 질문 생성",
-         description="커플의 취향을 파악하기 위한 이지선다 질문을 생성합니다.")
-async def generate_question():
+         description="커플의 취향을 파악하기 위한 이지선다 질문을 생성합니다. count를 2 이상으로 주면 질문 목록을 반환합니다.")
+async def generate_question(count: int = Query(1, ge=1, description="생성할 질문 수")):
     """질문 생성 서비스로 요청 전달"""
-    response = await make_request("GET", f"{SERVICES['question']}/api/v1/questions/generate")
+    response = await make_request("question", "GET", "/api/v1/questions/generate",
+                                  params={"count": count})
     
     if response.status_code == 200:
         return response.json()
@@ -230,6 +404,58 @@ async def generate_question():
             detail=f"질문 생성 실패: {response.text}"
         )
 
+@app.get("/api/v1/questions/generate/stream",
+         tags=["🤔 Questions"],
+         summary="취향 질문 스트리밍 생성 (SSE)",
+         description="질문 생성 서비스의 Server-Sent Events 스트림(field → done/error 이벤트)을 그대로 전달합니다.")
+async def generate_question_stream():
+    """질문 생성 서비스의 SSE 스트림을 버퍼링 없이 전달"""
+    client = clients["question"]
+    # 스트림이 끝날 때까지 읽기 시간 제한 없음
+    request = client.build_request("GET", "/api/v1/questions/generate/stream",
+                                   timeout=route_timeout(stream=True))
+    try:
+        response = await client.send(request, stream=True)
+    except httpx.RequestError as e:
+        raise HTTPException(status_code=503, detail=f"서비스 연결 실패: {str(e)}")
+
+    async def relay():
+        try:
+            async for chunk in response.aiter_raw():
+                yield chunk
+        finally:
+            # 연결을 풀로 돌려보냄
+            await response.aclose()
+
+    return StreamingResponse(
+        relay(),
+        status_code=response.status_code,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@app.post("/api/v1/questions/next",
+          response_model=Union[QuestionResponse, List[QuestionResponse]],
+          tags=["🤔 Questions"],
+          summary="다음으로 물어볼 질문 선택",
+          description="질문 은행에서 현재 취향 벡터의 불확실한 차원을 가장 잘 가르는, 아직 답하지 않은 질문을 고릅니다.")
+async def next_question(request: NextQuestionRequest):
+    """질문 생성 서비스로 요청 전달"""
+    response = await make_request(
+        "question",
+        "POST",
+        "/api/v1/questions/next",
+        json=request.dict()
+    )
+
+    if response.status_code == 200:
+        return response.json()
+    else:
+        raise HTTPException(
+            status_code=response.status_code,
+            detail=f"질문 선택 실패: {response.text}"
+        )
+
 # =============================================================================
 # 장소 추천 서비스 (Recommend Place API)  
 # =============================================================================
@@ -242,8 +468,10 @@ async def generate_question():
 async def generate_place_plan(request: PlannerRequest):
     """장소 추천 서비스로 요청 전달"""
     response = await make_request(
-        "POST", 
-        f"{SERVICES['place']}/api/v1/generate-plan-vector",
+        "place",
+        "POST",
+        "/api/v1/generate-plan-vector",
+        route="planner",
         json=request.dict()
     )
     
@@ -267,8 +495,9 @@ async def generate_place_plan(request: PlannerRequest):
 async def classify_text(request: TextRequest):
     """텍스트 분류 서비스로 요청 전달"""
     response = await make_request(
+        "text_ai",
         "POST",
-        f"{SERVICES['text_ai']}/classify",
+        "/classify",
         json=request.dict()
     )
     
@@ -280,6 +509,28 @@ async def classify_text(request: TextRequest):
             detail=f"텍스트 분류 실패: {response.text}"
         )
 
+@app.post("/api/v1/text/classify/batch",
+          response_model=BatchPredictionResponse,
+          tags=["💬 Text AI"],
+          summary="텍스트 공감 유형 일괄 분류",
+          description="여러 텍스트를 한 번의 요청으로 분류합니다. 결과는 요청 순서대로 반환됩니다.")
+async def classify_text_batch(request: BatchTextRequest):
+    """텍스트 일괄 분류 서비스로 요청 전달"""
+    response = await make_request(
+        "text_ai",
+        "POST",
+        "/classify/batch",
+        json=request.dict()
+    )
+    
+    if response.status_code == 200:
+        return response.json()
+    else:
+        raise HTTPException(
+            status_code=response.status_code,
+            detail=f"텍스트 일괄 분류 실패: {response.text}"
+        )
+
 # =============================================================================
 # WebSocket 지원 (Text AI 채팅)
 # =============================================================================
@@ -291,15 +542,14 @@ async def websocket_chat_proxy(websocket: WebSocket):
     
     try:
         # Text AI 서비스와 WebSocket 연결
-        async with httpx.AsyncClient() as client:
-            async with client.stream("GET", f"{SERVICES['text_ai']}/ws/chat") as response:
-                if response.status_code == 101:  # WebSocket Upgrade
-                    # WebSocket 프록시 로직 구현
-                    # 실제 구현에서는 더 복잡한 프록시 로직이 필요합니다
-                    while True:
-                        data = await websocket.receive_text()
-                        # 여기에 실제 WebSocket 프록시 로직 구현
-                        await websocket.send_text(f"Proxy received: {data}")
+        async with clients["text_ai"].stream("GET", "/ws/chat") as response:
+            if response.status_code == 101:  # WebSocket Upgrade
+                # WebSocket 프록시 로직 구현
+                # 실제 구현에서는 더 복잡한 프록시 로직이 필요합니다
+                while True:
+                    data = await websocket.receive_text()
+                    # 여기에 실제 WebSocket 프록시 로직 구현
+                    await websocket.send_text(f"Proxy received: {data}")
                 
     except WebSocketDisconnect:
         pass
@@ -314,25 +564,8 @@ async def websocket_chat_proxy(websocket: WebSocket):
          tags=["🛠️ Management"],
          summary="모든 서비스 상태 확인")
 async def check_all_services():
-    """모든 마이크로서비스의 상태를 확인합니다"""
-    results = {}
-    
-    for service_name, service_url in SERVICES.items():
-        try:
-            response = await make_request("GET", f"{service_url}/", timeout=5.0)
-            results[service_name] = {
-                "status": "healthy" if response.status_code == 200 else "unhealthy",
-                "url": service_url,
-                "response_time": response.elapsed.total_seconds() if hasattr(response, 'elapsed') else None
-            }
-        except Exception as e:
-            results[service_name] = {
-                "status": "unreachable",
-                "url": service_url,
-                "error": str(e)
-            }
-    
-    return results
+    """모든 마이크로서비스의 상태를 반환합니다 (PROBE_INTERVAL마다 갱신되는 백그라운드 확인 결과, 응답 시간 단위는 초)"""
+    return {name: health.to_dict() for name, health in service_health.items()}
 
 # =============================================================================
 # 메인 실행부
@@ -235,7 +235,7 @@ echo "🌐 API Endpoints:"
 curl -s http://localhost:8000/health > /dev/null && echo "✅ Gateway (8000): Healthy" || echo "❌ Gateway (8000): Unhealthy"
 curl -s http://localhost:8001/ > /dev/null && echo "✅ Generate Question (8001): Healthy" || echo "❌ Generate Question (8001): Unhealthy"
 curl -s http://localhost:8002/ > /dev/null && echo "✅ Recommend Place (8002): Healthy" || echo "❌ Recommend Place (8002): Unhealthy"
-curl -s http://localhost:8003/ > /dev/null && echo "✅ Text AI (8003): Healthy" || echo "❌ Text AI (8003): Unhealthy"
+curl -sf http://localhost:8003/ready > /dev/null && echo "✅ Text AI (8003): Healthy" || echo "❌ Text AI (8003): Unhealthy"
 
 echo ""
 echo "📊 Recent Logs:"
@@ -0,0 +1,37 @@
+"""관리자 API 엔드포인트"""
+
+from fastapi import APIRouter, BackgroundTasks, HTTPException
+
+from app.core.prompt import prompt_stats
+from app.models.schemas import StoreDeltaRequest, DataVersionResponse
+from app.services.store_data import store_data_manager
+
+router = APIRouter()
+
+@router.get("/data-version", response_model=DataVersionResponse)
+async def get_data_version():
+    """현재 가게 데이터 버전과 마지막 재구성 소요 시간을 반환합니다."""
+    return DataVersionResponse(**store_data_manager.status())
+
+@router.get("/prompt-stats")
+async def get_prompt_stats():
+    """프롬프트별 호출 수, 평균 prompt/completion/캐시 토큰, 섹션별 토큰 수, 평균 지연 시간을 반환합니다."""
+    return prompt_stats.snapshot()
+
+@router.post("/store-deltas", response_model=DataVersionResponse, status_code=202)
+async def apply_store_deltas(request: StoreDeltaRequest, background_tasks: BackgroundTasks):
+    """delta 파일들을 백그라운드에서 적용합니다. 적용이 끝나면 새 버전으로 교체됩니다."""
+    if not request.files:
+        raise HTTPException(status_code=400, detail="적용할 delta 파일이 없습니다.")
+    if store_data_manager.rebuilding:
+        raise HTTPException(status_code=409, detail="이미 가게 데이터를 재구성하는 중입니다.")
+
+    # 파일 이름은 요청 시점에 검증해 잘못된 요청을 바로 알려줌
+    for file_name in request.files:
+        try:
+            store_data_manager.resolve_delta_path(file_name)
+        except (ValueError, FileNotFoundError) as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    background_tasks.add_task(store_data_manager.apply_delta_files, request.files)
+    return DataVersionResponse(**store_data_manager.status())
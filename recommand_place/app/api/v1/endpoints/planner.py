@@ -7,6 +7,7 @@ from app.models.schemas import PlannerRequest, PlannerResponse, TimeSlotResult
 from app.services.store import StoreService
 from app.services.vector import VectorService
 from app.services.llm import LLMService
+from app.services.preferences import preference_reader
 
 router = APIRouter()
 
@@ -14,6 +15,15 @@ router = APIRouter()
 async def generate_plan(request: PlannerRequest):
     """벡터 기반 플래너 생성"""
     
+    # user_id만 온 사용자는 취향 저장소에서 벡터를 채움
+    for user in (request.user1, request.user2):
+        if not preference_reader.fill(user):
+            raise HTTPException(
+                status_code=404 if user.user_id else 422,
+                detail=f"취향 벡터를 찾을 수 없습니다: {user.user_id}" if user.user_id
+                else "preferences 또는 user_id가 필요합니다.",
+            )
+    
     # 서비스 초기화
     store_service = StoreService()
     vector_service = VectorService()
@@ -60,7 +70,7 @@ async def generate_plan(request: PlannerRequest):
             "time_name": slot['name']
         }
         
-        llm_recommendation = llm_service.get_recommendation(candidates, llm_context)
+        llm_recommendation = await llm_service.get_recommendation(candidates, llm_context)
         
         # 각 시간대별 결과를 추가
         final_plan_slots.append(
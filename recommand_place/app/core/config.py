@@ -13,9 +13,27 @@ BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__fil
 CONFIG = {
     "store_db_path": os.path.join(BASE_DIR, "data", "stores_with_preferences_vec.csv"),
     "w2v_model_path": os.path.join(BASE_DIR, "data", "w2v_activity_model.model"),
+    # 가게 증분 업데이트(delta) 파일 디렉토리와 가게 식별자 컬럼
+    "store_delta_dir": os.getenv("STORE_DELTA_DIR", os.path.join(BASE_DIR, "data", "deltas")),
+    "store_id_column": os.getenv("STORE_ID_COLUMN", "store_id"),
+    # 가게 벡터 저장 형식: float64 | float32 | float16 | int8
+    "store_vector_dtype": os.getenv("STORE_VECTOR_DTYPE", "float64"),
+    # 사용자 취향 벡터 저장소 (Generate_question 서비스가 기록, 여기서는 읽기만 함)
+    "preference_db_path": os.getenv(
+        "PREFERENCE_DB_PATH",
+        os.path.join(os.path.dirname(BASE_DIR), "Generate_question", "data", "preferences.db"),
+    ),
 }
 
 # OpenAI 설정
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 if not OPENAI_API_KEY:
-    raise ValueError("OPENAI_API_KEY environment variable is not set") 
\ No newline at end of file
+    raise ValueError("OPENAI_API_KEY environment variable is not set")
+
+# OpenAI 클라이언트 커넥션 풀/타임아웃/재시도 설정 (app/core/llm_client.py)
+OPENAI_TIMEOUT = float(os.getenv("OPENAI_TIMEOUT", "60"))
+OPENAI_CONNECT_TIMEOUT = float(os.getenv("OPENAI_CONNECT_TIMEOUT", "5"))
+OPENAI_MAX_RETRIES = int(os.getenv("OPENAI_MAX_RETRIES", "2"))
+OPENAI_MAX_CONNECTIONS = int(os.getenv("OPENAI_MAX_CONNECTIONS", "20"))
+OPENAI_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("OPENAI_MAX_KEEPALIVE_CONNECTIONS", "10"))
+OPENAI_KEEPALIVE_EXPIRY = float(os.getenv("OPENAI_KEEPALIVE_EXPIRY", "30"))
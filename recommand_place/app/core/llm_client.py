@@ -0,0 +1,60 @@
+"""공유 OpenAI 비동기 클라이언트
+
+프로세스당 하나의 AsyncOpenAI 클라이언트를 만들어 모든 LLM 호출이 같은 커넥션 풀(HTTP keep-alive)을 씁니다.
+요청마다 클라이언트를 만들거나 TLS 연결을 새로 맺지 않습니다.
+시작 시 init_llm_client(), 종료 시 close_llm_client()를 호출하고, 서비스에는 get_llm_client()로 주입합니다.
+"""
+
+from typing import Optional
+
+import httpx
+from openai import AsyncOpenAI
+
+from app.core.config import (
+    OPENAI_API_KEY,
+    OPENAI_TIMEOUT,
+    OPENAI_CONNECT_TIMEOUT,
+    OPENAI_MAX_RETRIES,
+    OPENAI_MAX_CONNECTIONS,
+    OPENAI_MAX_KEEPALIVE_CONNECTIONS,
+    OPENAI_KEEPALIVE_EXPIRY,
+)
+
+_client: Optional[AsyncOpenAI] = None
+
+
+def create_llm_client() -> AsyncOpenAI:
+    timeout = httpx.Timeout(OPENAI_TIMEOUT, connect=OPENAI_CONNECT_TIMEOUT)
+    http_client = httpx.AsyncClient(
+        timeout=timeout,
+        limits=httpx.Limits(
+            max_connections=OPENAI_MAX_CONNECTIONS,
+            max_keepalive_connections=OPENAI_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=OPENAI_KEEPALIVE_EXPIRY,
+        ),
+    )
+    return AsyncOpenAI(
+        api_key=OPENAI_API_KEY,
+        timeout=timeout,
+        max_retries=OPENAI_MAX_RETRIES,
+        http_client=http_client,
+    )
+
+
+def init_llm_client() -> AsyncOpenAI:
+    global _client
+    if _client is None:
+        _client = create_llm_client()
+    return _client
+
+
+def get_llm_client() -> AsyncOpenAI:
+    """공유 클라이언트를 반환합니다. 시작 이벤트 전에 호출되면 이때 만듭니다."""
+    return init_llm_client()
+
+
+async def close_llm_client():
+    global _client
+    if _client is not None:
+        await _client.close()
+        _client = None
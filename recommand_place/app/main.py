@@ -2,7 +2,10 @@
 
 import logging
 from fastapi import FastAPI
-from app.api.v1.endpoints import planner
+from fastapi.concurrency import run_in_threadpool
+from app.api.v1.endpoints import planner, admin
+from app.services.store_data import store_data_manager
+from app.core.llm_client import init_llm_client, close_llm_client
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
@@ -13,13 +16,19 @@ app = FastAPI(title="AI Planner API v2 (Vector-based)")
 
 # 라우터 등록
 app.include_router(planner.router, prefix="/api/v1", tags=["planner"])
+app.include_router(admin.router, prefix="/api/v1/admin", tags=["admin"])
 
 # 시작 이벤트 핸들러
 @app.on_event("startup")
 async def startup_event():
     logger.info("애플리케이션 시작")
+    # 모든 LLM 호출이 공유할 클라이언트(커넥션 풀)를 한 번만 생성
+    init_llm_client()
+    # 첫 요청이 전체 로드를 기다리지 않도록 가게 데이터를 미리 로드
+    await run_in_threadpool(store_data_manager.current)
 
 # 종료 이벤트 핸들러
 @app.on_event("shutdown")
 async def shutdown_event():
-    logger.info("애플리케이션 종료") 
\ No newline at end of file
+    logger.info("애플리케이션 종료")
+    await close_llm_client() 
\ No newline at end of file
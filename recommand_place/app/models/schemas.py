@@ -1,11 +1,12 @@
 """Pydantic 모델 정의"""
 
 from pydantic import BaseModel, Field
-from typing import List, Dict
+from typing import List, Dict, Any, Optional
 
 class UserPreference(BaseModel):
     gender: str
-    preferences: Dict[str, float] = Field(..., description="50차원의 취향 벡터")
+    user_id: Optional[str] = Field(None, description="취향 저장소의 사용자 id (preferences 대신 사용)")
+    preferences: Optional[Dict[str, float]] = Field(None, description="50차원의 취향 벡터 (없으면 user_id로 조회)")
 
 class PlannerRequest(BaseModel):
     user1: UserPreference
@@ -51,4 +52,25 @@ class TimeSlotResult(BaseModel):
     llm_recommendation: LLMRecommendation
 
 class PlannerResponse(BaseModel):
-    time_slots: List[TimeSlotResult] 
\ No newline at end of file
+    time_slots: List[TimeSlotResult] 
+
+class StoreDeltaRequest(BaseModel):
+    files: List[str] = Field(..., description="적용할 delta 파일 이름 목록 (delta 디렉토리 기준, 순서대로 적용)")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "files": ["2025-07-03_stores.csv"]
+            }
+        }
+
+class DataVersionResponse(BaseModel):
+    version: int
+    store_count: int
+    built_at: Optional[float] = None
+    last_rebuild_seconds: Optional[float] = None
+    applied_deltas: List[str]
+    rejected_ids: List[str] = []
+    vector_memory: Optional[Dict[str, Any]] = None
+    rebuilding: bool
+    last_error: Optional[str] = None
@@ -2,74 +2,70 @@
 
 import json
 import logging
-from typing import List, Dict
-import openai
+from typing import Any, List, Dict, Optional
+from openai import AsyncOpenAI
 from app.models.schemas import LLMRecommendation, CandidateStore
-from app.core.config import OPENAI_API_KEY
+from app.core.llm_client import get_llm_client
+from app.core.prompt import Prompt, complete
 
 logger = logging.getLogger(__name__)
 
-class LLMService:
-    def __init__(self):
-        self.client = openai.OpenAI(api_key=OPENAI_API_KEY)
-    
-    def get_recommendation(self, candidates: List[CandidateStore], context: Dict) -> LLMRecommendation:
-        """후보 가게들 중에서 최적의 장소를 추천합니다."""
-        llm_input_info = ""
-        for cand in candidates:
-            llm_input_info += f"- 가게명: {cand.store_name}, 총점: {cand.score:.2f}, 유사도: {cand.similarity:.2f}, 설명: {cand.description}\n"
-
-        prompt = f"""[모임 정보]
-- 목적: {context.get('meeting_purpose', '')}
-- 날씨: {context.get('weather', '')}
-- 시간대: {context.get('time_slot', '')}
-
-[시스템 추천 후보]
-{llm_input_info}
-
-[너의 임무]
-위 후보 중에서 가장 적합한 가게 하나만 선택하고, 그 이유를 JSON 형식으로 답변해줘.
-시간대와 목적에 맞는 선택을 해주세요.
-{{ "selected": "가게이름", "reason": "선택한 이유" }}
-"""
-        try:
-            response = self.client.chat.completions.create(
-                model="gpt-4o",
-                response_format={"type": "json_object"},
-                messages=[{"role": "user", "content": prompt}]
-            )
-            result = json.loads(response.choices[0].message.content)
-            return LLMRecommendation(**result)
-        except Exception as e:
-            logger.error(f"LLM 호출 실패: {e}")
-            return LLMRecommendation(selected="선택 실패", reason=str(e))
-
-def call_llm(candidates: List[Dict], context: Dict) -> LLMRecommendation:
-    """LLM을 호출하여 최적의 장소 추천을 받습니다."""
-    client = openai.OpenAI(api_key=OPENAI_API_KEY)
-    
-    llm_input_info = ""
+# 후보 설명은 이 글자 수까지만 보냄
+CANDIDATE_DESCRIPTION_CHARS = 60
+
+# 호출마다 바뀌지 않는 지시문 (프롬프트 캐시 접두사). 모임 정보와 후보는 user 메시지로 보냄
+PLACE_INSTRUCTIONS = """너는 모임 정보와 시스템 추천 후보를 보고 가장 적합한 가게 하나를 고르는 장소 추천가야.
+후보는 한 줄에 하나씩 "가게명|총점|유사도|설명" 형식으로 주어져.
+후보 중에서 모임 목적과 시간대에 가장 적합한 가게 하나만 선택하고, 다음 JSON 형식으로만 답해:
+{"selected": "가게이름", "reason": "선택한 이유"}"""
+
+PLACE_PROMPT = Prompt("place_recommendation", PLACE_INSTRUCTIONS, "gpt-4o")
+
+CONTEXT_LABELS = [("meeting_purpose", "목적"), ("weather", "날씨"), ("time_slot", "시간대")]
+
+
+def _field(candidate: Any, name: str):
+    return candidate[name] if isinstance(candidate, dict) else getattr(candidate, name)
+
+
+def format_candidates(candidates: List[Any]) -> str:
+    """후보 목록을 "가게명|총점|유사도|설명" 한 줄씩으로 만듭니다 (CandidateStore 또는 dict)."""
+    lines = []
     for cand in candidates:
-        llm_input_info += f"- 가게명: {cand['store_name']}, 총점: {cand['score']:.2f}, 유사도: {cand['similarity']:.2f}, 설명: {cand['description']}\n"
-
-    prompt = f"""[모임 정보]
-- 목적: {context['meeting_purpose']}
-- 날씨: {context['weather']}
-
-[시스템 추천 후보]
-{llm_input_info}
-[너의 임무]
-위 후보 중에서 가장 적합한 가게 하나만 선택하고, 그 이유를 JSON 형식으로 답변해줘.
-{{ "selected": "가게이름", "reason": "선택한 이유" }}
-"""
+        description = " ".join(str(_field(cand, "description")).split())[:CANDIDATE_DESCRIPTION_CHARS]
+        lines.append(f"{_field(cand, 'store_name')}|{_field(cand, 'score'):.2f}|"
+                     f"{_field(cand, 'similarity'):.2f}|{description}")
+    return "\n".join(lines)
+
+
+def format_context(context: Dict) -> str:
+    return "\n".join(f"{label}: {context[key]}" for key, label in CONTEXT_LABELS if context.get(key))
+
+
+async def _recommend(client: AsyncOpenAI, candidates: List[Any], context: Dict) -> LLMRecommendation:
     try:
-        response = client.chat.completions.create(
-            model="gpt-4o",
+        response = await complete(
+            client,
+            PLACE_PROMPT,
+            {"모임 정보": format_context(context), "후보": format_candidates(candidates)},
             response_format={"type": "json_object"},
-            messages=[{"role": "user", "content": prompt}]
         )
         result = json.loads(response.choices[0].message.content)
         return LLMRecommendation(**result)
     except Exception as e:
         logger.error(f"LLM 호출 실패: {e}")
-        return LLMRecommendation(selected="선택 실패", reason=str(e)) 
\ No newline at end of file
+        return LLMRecommendation(selected="선택 실패", reason=str(e))
+
+class LLMService:
+    def __init__(self, client: Optional[AsyncOpenAI] = None):
+        # 주입받은 클라이언트가 없으면 프로세스 공유 클라이언트 사용 (요청마다 새로 만들지 않음)
+        self.client = client or get_llm_client()
+    
+    async def get_recommendation(self, candidates: List[CandidateStore], context: Dict) -> LLMRecommendation:
+        """후보 가게들 중에서 최적의 장소를 추천합니다."""
+        return await _recommend(self.client, candidates, context)
+
+async def call_llm(candidates: List[Dict], context: Dict,
+                   client: Optional[AsyncOpenAI] = None) -> LLMRecommendation:
+    """LLM을 호출하여 최적의 장소 추천을 받습니다."""
+    return await _recommend(client or get_llm_client(), candidates, context)
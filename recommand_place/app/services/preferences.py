@@ -0,0 +1,56 @@
+"""사용자 취향 벡터 조회 모듈
+
+Generate_question 서비스가 관리하는 취향 저장소(SQLite, 벡터는 float32 BLOB)를
+읽기 전용으로 열어, 요청에 user_id만 온 경우 취향 벡터를 채웁니다.
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+from typing import Dict, Optional
+
+import numpy as np
+
+from app.core.config import CONFIG
+from app.models.schemas import UserPreference
+
+logger = logging.getLogger(__name__)
+
+VEC_COLS = [f'vec_{i}' for i in range(1, 51)]
+
+
+class PreferenceReader:
+    def __init__(self, path: str):
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connection(self) -> Optional[sqlite3.Connection]:
+        # 질문 서비스가 아직 파일을 만들지 않았을 수 있으므로 처음 필요할 때 엶
+        if self._conn is None and os.path.exists(self.path):
+            self._conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True, check_same_thread=False)
+        return self._conn
+
+    def get(self, user_id: str) -> Optional[Dict[str, float]]:
+        with self._lock:
+            conn = self._connection()
+            if conn is None:
+                return None
+            row = conn.execute("SELECT vector FROM user_preferences WHERE user_id = ?", (user_id,)).fetchone()
+        if row is None:
+            return None
+        vector = np.frombuffer(row[0], dtype=np.float32)
+        return {col: float(value) for col, value in zip(VEC_COLS, vector)}
+
+    def fill(self, user: UserPreference) -> bool:
+        """user.preferences가 비어 있으면 user_id로 채웁니다. 채울 수 없으면 False."""
+        if user.preferences:
+            return True
+        if not user.user_id:
+            return False
+        user.preferences = self.get(user.user_id)
+        return user.preferences is not None
+
+
+preference_reader = PreferenceReader(CONFIG["preference_db_path"])
@@ -4,35 +4,29 @@ import pandas as pd
 import numpy as np
 from typing import List, Dict, Any, Optional, Tuple
 from sklearn.metrics.pairwise import cosine_similarity
-from gensim.models import Word2Vec
 from geopy.distance import great_circle
-from app.core.config import CONFIG
-from app.core.constants import CATEGORY_MAPPING
 from app.models.schemas import CandidateStore
+from app.services.store_data import store_data_manager
 
 class StoreService:
     def __init__(self):
+        self.snapshot = None
         self.store_db = None
-        self.store_vectors = None
+        self.vector_index = None
         self.w2v_model = None
         self.first_location = None  # 첫 번째 추천 장소의 위치
         self.max_distance_km = 5.0  # 최대 거리 3km
         self.load_store_data()
 
     def load_store_data(self):
-        """가게 데이터와 벡터를 로드합니다."""
-        store_db = pd.read_csv(CONFIG["store_db_path"])
-        store_db.dropna(subset=['latitude', 'longitude'], inplace=True)
-        store_db['mapped_category'] = store_db['standard_category'].map(CATEGORY_MAPPING)
-        store_db['mapped_category'] = store_db['mapped_category'].str.strip()
-        store_db = store_db[~store_db['mapped_category'].isna()]
-        
-        vec_cols = [f'vec_{i}' for i in range(1, 51)]
-        self.store_vectors = store_db[vec_cols].values
-        self.store_db = store_db
-        
-        # W2V 모델 로드
-        self.w2v_model = Word2Vec.load(CONFIG["w2v_model_path"])
+        """현재 버전의 가게 데이터 스냅샷을 가져옵니다.
+
+        스냅샷은 프로세스 전체에서 공유되며, 이 서비스 객체는 생성 시점의 버전을 끝까지 사용합니다.
+        """
+        self.snapshot = store_data_manager.current()
+        self.store_db = self.snapshot.store_db
+        self.vector_index = self.snapshot.vector_index
+        self.w2v_model = store_data_manager.w2v_model
 
     def calculate_distance(self, lat1: float, lon1: float, lat2: float, lon2: float) -> float:
         """두 지점 간의 거리를 km 단위로 계산합니다."""
@@ -81,7 +75,7 @@ class StoreService:
         if len(candidate_stores_df) == 0:
             return []
         
-        similarities = cosine_similarity(group_vector, candidate_stores_df[[f'vec_{i}' for i in range(1, 51)]].values).flatten()
+        similarities = self.vector_index.cosine_similarity(group_vector, candidate_stores_df['vec_row'].to_numpy())
         candidate_stores_df['similarity'] = similarities
         
         # 키워드 점수 계산
@@ -0,0 +1,295 @@
+"""가게 데이터 스냅샷 관리 모듈
+
+가게 테이블과 벡터 인덱스를 버전이 붙은 스냅샷으로 관리합니다.
+증분 업데이트(delta)는 새 스냅샷으로 만들어진 뒤 포인터 교체로 반영되므로,
+처리 중인 요청은 시작할 때 잡은 스냅샷을 끝까지 사용합니다.
+"""
+
+import logging
+import os
+import threading
+import time
+from typing import List, Dict, Any, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from gensim.models import Word2Vec
+
+from app.core.config import CONFIG
+from app.core.constants import CATEGORY_MAPPING
+from app.services.vector_index import StoreVectorIndex
+
+logger = logging.getLogger(__name__)
+
+VEC_COLS = [f'vec_{i}' for i in range(1, 51)]
+
+# delta 파일의 연산 컬럼 ('upsert' 또는 'delete')
+DELTA_OP_COLUMN = 'op'
+DELTA_OPS = ('upsert', 'delete')
+
+# 플래너가 사용하는 컬럼과 타입. 이 외의 CSV 컬럼은 읽지 않습니다.
+# 벡터 컬럼(VEC_COLS)의 타입은 벡터 인덱스 형식에 따라 정합니다 (vector_read_dtype).
+STORE_COLUMN_DTYPES = {
+    'store_name': 'object',
+    'standard_category': 'category',
+    'latitude': 'float64',
+    'longitude': 'float64',
+}
+CATEGORICAL_COLUMNS = ['standard_category', 'mapped_category']
+
+# 매핑 값의 공백은 미리 제거해 행마다 문자열 처리를 하지 않도록 함
+_CATEGORY_MAPPING = {key: value.strip() for key, value in CATEGORY_MAPPING.items() if value}
+
+
+def vector_read_dtype(index_dtype: str) -> str:
+    """CSV 벡터 컬럼을 읽을 타입. float64 인덱스는 원래 정밀도로, 압축 인덱스(float32 이하)는 float32로 읽습니다."""
+    return 'float64' if index_dtype == 'float64' else 'float32'
+
+
+def read_store_csv(path: str, extra_columns: Optional[List[str]] = None,
+                   vector_dtype: Optional[str] = None) -> pd.DataFrame:
+    """스키마에 정의된 컬럼만 지정한 타입으로 읽습니다. (식별자 컬럼은 있을 때만 읽음)"""
+    id_col = CONFIG["store_id_column"]
+    vector_dtype = vector_dtype or vector_read_dtype(CONFIG["store_vector_dtype"])
+    wanted = set(STORE_COLUMN_DTYPES) | set(VEC_COLS) | {id_col} | set(extra_columns or [])
+    # 식별자는 기본 테이블과 delta에서 타입이 달라지지 않도록 문자열로 고정
+    dtypes = {**STORE_COLUMN_DTYPES, **{col: vector_dtype for col in VEC_COLS}, id_col: 'str'}
+    return pd.read_csv(path, usecols=lambda col: col in wanted, dtype=dtypes)
+
+
+def categorize_store_columns(store_db: pd.DataFrame) -> pd.DataFrame:
+    """카테고리 컬럼을 Categorical로 맞추고 쓰이지 않는 카테고리를 정리합니다."""
+    for col in CATEGORICAL_COLUMNS:
+        if col in store_db.columns:
+            store_db[col] = store_db[col].astype('category').cat.remove_unused_categories()
+    return store_db
+
+
+def prepare_store_frame(store_db: pd.DataFrame) -> pd.DataFrame:
+    """원본 가게 데이터에 좌표 결측치 제거와 카테고리 매핑을 적용합니다."""
+    store_db = store_db.dropna(subset=['latitude', 'longitude']).copy()
+    # Categorical에 대한 map은 카테고리 단위로만 계산됨
+    store_db['mapped_category'] = store_db['standard_category'].map(_CATEGORY_MAPPING)
+    store_db = store_db[~store_db['mapped_category'].isna()].copy()
+    return categorize_store_columns(store_db)
+
+
+def load_store_table(path: str, vector_dtype: Optional[str] = None) -> pd.DataFrame:
+    """CSV 파일에서 가게 테이블을 읽어 전처리합니다."""
+    return prepare_store_frame(read_store_csv(path, vector_dtype=vector_dtype))
+
+
+def log_memory_report(store_db: pd.DataFrame, vector_index: StoreVectorIndex):
+    """가게 테이블의 컬럼별 메모리 사용량과 벡터 인덱스 크기를 로그로 남깁니다."""
+    usage = store_db.memory_usage(deep=True)
+    lines = [f"  {col}: {usage[col] / 1024:.1f} KB ({store_db[col].dtype})" for col in store_db.columns]
+    vector_memory = vector_index.memory_usage()
+    logger.info(
+        "가게 테이블 메모리 사용량:\n" + "\n".join(lines) +
+        f"\n  (index): {usage['Index'] / 1024:.1f} KB"
+        f"\n  테이블 합계: {usage.sum() / 1024 / 1024:.2f} MB"
+        f"\n  벡터 인덱스({vector_memory['dtype']}): {vector_memory['total_bytes'] / 1024 / 1024:.2f} MB"
+    )
+
+
+def split_store_vectors(store_db: pd.DataFrame) -> Tuple[pd.DataFrame, np.ndarray]:
+    """가게 테이블에서 벡터 컬럼을 분리합니다. 벡터는 인덱스에만 보관해 중복 저장을 피합니다."""
+    vectors = store_db[VEC_COLS].to_numpy(dtype=np.float64)
+    return store_db.drop(columns=VEC_COLS), vectors
+
+
+def build_snapshot_data(store_db: pd.DataFrame, vectors: np.ndarray, dtype: str,
+                        value_range=None) -> Tuple[pd.DataFrame, StoreVectorIndex]:
+    """벡터를 뺀 가게 테이블과 벡터 인덱스를 만들고 `vec_row`로 연결합니다."""
+    store_db = store_db.reset_index(drop=True)
+    store_db['vec_row'] = np.arange(len(store_db), dtype=np.int32)
+    return store_db, StoreVectorIndex.build(vectors, dtype, value_range)
+
+
+def read_store_delta(path: str) -> pd.DataFrame:
+    """delta 파일을 읽고 형식을 검증합니다."""
+    id_col = CONFIG["store_id_column"]
+    delta = read_store_csv(path, extra_columns=[DELTA_OP_COLUMN])
+
+    missing = [col for col in (id_col, DELTA_OP_COLUMN) if col not in delta.columns]
+    if missing:
+        raise ValueError(f"delta 파일에 필수 컬럼이 없습니다: {missing} ({path})")
+
+    delta[DELTA_OP_COLUMN] = delta[DELTA_OP_COLUMN].astype(str).str.strip().str.lower()
+    invalid_ops = set(delta[DELTA_OP_COLUMN].unique()) - set(DELTA_OPS)
+    if invalid_ops:
+        raise ValueError(f"알 수 없는 delta 연산입니다: {sorted(invalid_ops)} ({path})")
+
+    return delta
+
+
+def apply_store_delta(store_db: pd.DataFrame, vectors: np.ndarray,
+                      delta: pd.DataFrame) -> Tuple[pd.DataFrame, np.ndarray, List[str]]:
+    """가게 테이블과 벡터에 delta를 적용한 새 테이블/벡터와, 전처리에서 걸러진 upsert 가게 id를 반환합니다.
+
+    좌표가 없거나 카테고리를 매핑할 수 없는 upsert 행은 적용하지 않으며, 같은 id의 기존 가게도 그대로 둡니다.
+    원본은 변경하지 않습니다.
+    """
+    id_col = CONFIG["store_id_column"]
+    if id_col not in store_db.columns:
+        raise ValueError(f"가게 테이블에 식별자 컬럼 '{id_col}'이 없습니다.")
+
+    # 같은 가게에 대한 연산이 여러 번 있으면 마지막 연산만 적용
+    delta = delta.drop_duplicates(subset=[id_col], keep='last')
+    deletes = delta.loc[delta[DELTA_OP_COLUMN] == 'delete', id_col]
+    upserts = delta[delta[DELTA_OP_COLUMN] == 'upsert'].drop(columns=[DELTA_OP_COLUMN])
+
+    required = ['store_name', 'standard_category', 'latitude', 'longitude'] + VEC_COLS
+    missing = [col for col in required if col not in upserts.columns]
+    if len(upserts) > 0 and missing:
+        raise ValueError(f"upsert 행에 필요한 컬럼이 없습니다: {missing}")
+
+    rejected: List[str] = []
+    if len(upserts) > 0:
+        prepared = prepare_store_frame(upserts)
+        rejected = upserts.loc[~upserts[id_col].isin(prepared[id_col]), id_col].tolist()
+        upserts = prepared
+
+    # 삭제 대상과, 전처리를 통과한 upsert의 기존 행만 제거
+    replaced = pd.concat([deletes, upserts[id_col]])
+    keep = ~store_db[id_col].isin(replaced).to_numpy()
+    remaining, remaining_vectors = store_db[keep], vectors[keep]
+    if len(upserts) == 0:
+        return remaining, remaining_vectors, rejected
+
+    upserts, upsert_vectors = split_store_vectors(upserts)
+    # 카테고리 목록이 다른 Categorical끼리 합치면 object가 되므로 다시 맞춰 줌
+    merged = categorize_store_columns(pd.concat([remaining, upserts], ignore_index=True))
+    return merged, np.vstack([remaining_vectors, upsert_vectors]), rejected
+
+
+class StoreSnapshot:
+    """특정 버전의 가게 테이블과 벡터 인덱스 (생성 후에는 변경하지 않습니다)"""
+
+    def __init__(self, version: int, store_db: pd.DataFrame, vector_index: StoreVectorIndex,
+                 build_seconds: float, deltas: List[str], rejected_ids: Optional[List[str]] = None):
+        self.version = version
+        self.store_db = store_db
+        self.vector_index = vector_index
+        self.build_seconds = build_seconds
+        self.built_at = time.time()
+        self.deltas = deltas
+        # 이 버전을 만들 때 적용하지 못한 upsert 가게 id
+        self.rejected_ids = rejected_ids or []
+
+
+class StoreDataManager:
+    """프로세스 전체에서 공유하는 가게 데이터 스냅샷 관리자"""
+
+    def __init__(self):
+        self._snapshot: Optional[StoreSnapshot] = None
+        self._w2v_model = None
+        self._load_lock = threading.Lock()
+        self._rebuild_lock = threading.Lock()
+        self.rebuilding = False
+        self.last_error: Optional[str] = None
+
+    def current(self) -> StoreSnapshot:
+        """현재 버전의 스냅샷을 반환합니다. 최초 호출 시 전체 데이터를 로드합니다."""
+        snapshot = self._snapshot
+        if snapshot is None:
+            with self._load_lock:
+                if self._snapshot is None:
+                    start = time.perf_counter()
+                    store_db, vectors = split_store_vectors(load_store_table(CONFIG["store_db_path"]))
+                    store_db, vector_index = build_snapshot_data(
+                        store_db, vectors, CONFIG["store_vector_dtype"]
+                    )
+                    self._snapshot = StoreSnapshot(1, store_db, vector_index, time.perf_counter() - start, [])
+                    logger.info(
+                        f"가게 데이터 로드 완료: {len(store_db)}개 (버전 1), "
+                        f"{self._snapshot.build_seconds:.2f}초"
+                    )
+                    log_memory_report(store_db, vector_index)
+                snapshot = self._snapshot
+        return snapshot
+
+    @property
+    def w2v_model(self) -> Word2Vec:
+        if self._w2v_model is None:
+            with self._load_lock:
+                if self._w2v_model is None:
+                    self._w2v_model = Word2Vec.load(CONFIG["w2v_model_path"])
+        return self._w2v_model
+
+    def resolve_delta_path(self, file_name: str) -> str:
+        """delta 디렉토리 안의 파일 경로를 반환합니다. 디렉토리 밖의 경로는 거부합니다."""
+        if os.path.basename(file_name) != file_name or file_name in ('', '.', '..'):
+            raise ValueError(f"delta 파일 이름이 올바르지 않습니다: {file_name}")
+        path = os.path.join(CONFIG["store_delta_dir"], file_name)
+        if not os.path.isfile(path):
+            raise FileNotFoundError(f"delta 파일을 찾을 수 없습니다: {file_name}")
+        return path
+
+    def apply_delta_files(self, file_names: List[str]) -> StoreSnapshot:
+        """delta 파일들을 적용한 새 스냅샷을 만들고 현재 스냅샷과 교체합니다.
+
+        재구성은 한 번에 하나씩 진행되며, 실패하면 기존 스냅샷이 그대로 유지됩니다.
+        """
+        with self._rebuild_lock:
+            self.rebuilding = True
+            start = time.perf_counter()
+            try:
+                base = self.current()
+                store_db = base.store_db.drop(columns=['vec_row'])
+                vectors = base.vector_index.dequantize(base.store_db['vec_row'].to_numpy())
+                rejected_ids = []
+                for file_name in file_names:
+                    delta = read_store_delta(self.resolve_delta_path(file_name))
+                    store_db, vectors, rejected = apply_store_delta(store_db, vectors, delta)
+                    if rejected:
+                        logger.warning(
+                            f"{file_name}: 좌표가 없거나 카테고리를 매핑할 수 없어 적용하지 않은 upsert "
+                            f"{len(rejected)}개: {rejected[:20]}"
+                        )
+                        rejected_ids.extend(rejected)
+
+                # 기존 양자화 구간을 유지해 변경되지 않은 가게의 코드가 흔들리지 않게 함
+                store_db, vector_index = build_snapshot_data(
+                    store_db, vectors, base.vector_index.dtype, base.vector_index.value_range()
+                )
+                snapshot = StoreSnapshot(
+                    base.version + 1,
+                    store_db,
+                    vector_index,
+                    time.perf_counter() - start,
+                    base.deltas + list(file_names),
+                    rejected_ids,
+                )
+                # 참조 교체는 원자적이므로 진행 중인 요청은 이전 스냅샷을 계속 사용
+                self._snapshot = snapshot
+                self.last_error = None
+                logger.info(
+                    f"가게 데이터 버전 {snapshot.version} 적용 완료: "
+                    f"{len(base.store_db)} -> {len(store_db)}개, {snapshot.build_seconds:.2f}초"
+                )
+                return snapshot
+            except Exception as e:
+                self.last_error = str(e)
+                logger.error(f"가게 데이터 재구성 실패: {e}")
+                raise
+            finally:
+                self.rebuilding = False
+
+    def status(self) -> Dict[str, Any]:
+        """현재 데이터 버전과 마지막 재구성 정보를 반환합니다."""
+        snapshot = self._snapshot
+        return {
+            "version": snapshot.version if snapshot else 0,
+            "store_count": len(snapshot.store_db) if snapshot else 0,
+            "built_at": snapshot.built_at if snapshot else None,
+            "last_rebuild_seconds": snapshot.build_seconds if snapshot else None,
+            "applied_deltas": snapshot.deltas if snapshot else [],
+            "rejected_ids": snapshot.rejected_ids if snapshot else [],
+            "vector_memory": snapshot.vector_index.memory_usage() if snapshot else None,
+            "rebuilding": self.rebuilding,
+            "last_error": self.last_error,
+        }
+
+
+store_data_manager = StoreDataManager()
@@ -0,0 +1,191 @@
+"""가게 취향 벡터 저장/검색 모듈
+
+가게 벡터를 float64 그대로, 또는 float16 / int8(차원별 scale, offset) 형태로 압축해 보관하고
+압축된 상태에서 블록 단위로 복원하며 코사인 유사도를 계산합니다.
+
+정확도 비교 리포트:
+    python -m app.services.vector_index --dtype int8 --k 10
+"""
+
+import argparse
+import json
+from typing import Dict, Any, Optional, Tuple
+
+import numpy as np
+
+SUPPORTED_DTYPES = ('float64', 'float32', 'float16', 'int8')
+
+# 한 번에 복원하는 행 수 (50차원 float32 기준 약 800KB로 L2 캐시에 맞춤)
+BLOCK_ROWS = 4096
+
+INT8_LEVELS = 255
+
+
+class StoreVectorIndex:
+    """가게 벡터 행렬. 행 번호는 가게 테이블의 `vec_row` 컬럼과 대응합니다."""
+
+    def __init__(self, codes: np.ndarray, dtype: str, norms: np.ndarray,
+                 scale: Optional[np.ndarray] = None, offset: Optional[np.ndarray] = None):
+        self.codes = codes
+        self.dtype = dtype
+        self.norms = norms
+        self.scale = scale
+        self.offset = offset
+
+    @classmethod
+    def build(cls, vectors: np.ndarray, dtype: str = 'float64',
+              value_range: Optional[Tuple[np.ndarray, np.ndarray]] = None) -> 'StoreVectorIndex':
+        """float 벡터 행렬로 인덱스를 만듭니다.
+
+        int8에서 value_range(차원별 최소/최대)를 주면 그 범위를 포함하도록 양자화 구간을 잡습니다.
+        이전 인덱스의 범위를 넘겨주면 기존 행의 코드가 재양자화 후에도 그대로 유지됩니다.
+        """
+        if dtype not in SUPPORTED_DTYPES:
+            raise ValueError(f"지원하지 않는 벡터 저장 형식입니다: {dtype} (가능: {SUPPORTED_DTYPES})")
+
+        vectors = np.asarray(vectors, dtype=np.float64)
+        scale = offset = None
+
+        if dtype == 'int8':
+            if len(vectors) > 0:
+                low, high = vectors.min(axis=0), vectors.max(axis=0)
+            else:
+                low = high = np.zeros(vectors.shape[1])
+            if value_range is not None:
+                low, high = np.minimum(low, value_range[0]), np.maximum(high, value_range[1])
+            scale = (high - low) / INT8_LEVELS
+            scale[scale == 0] = 1.0
+            offset = low + 128 * scale
+            codes = np.clip(np.rint((vectors - offset) / scale), -128, 127).astype(np.int8)
+            scale, offset = scale.astype(np.float32), offset.astype(np.float32)
+        else:
+            codes = vectors.astype(dtype)
+
+        index = cls(codes, dtype, np.empty(len(codes), dtype=np.float32), scale, offset)
+        # 노름은 복원된 값 기준으로 계산해야 압축 형식에서도 유사도가 일관됨
+        for start in range(0, len(codes), BLOCK_ROWS):
+            block = index._dequantize_block(codes[start:start + BLOCK_ROWS])
+            index.norms[start:start + BLOCK_ROWS] = np.linalg.norm(block, axis=1)
+        return index
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    @property
+    def compute_dtype(self):
+        return np.float64 if self.dtype == 'float64' else np.float32
+
+    def _dequantize_block(self, block: np.ndarray) -> np.ndarray:
+        block = block.astype(self.compute_dtype)
+        if self.dtype == 'int8':
+            block = block * self.scale + self.offset
+        return block
+
+    def dequantize(self, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """지정한 행(기본값: 전체)을 float 행렬로 복원합니다."""
+        codes = self.codes if rows is None else self.codes[rows]
+        return self._dequantize_block(codes)
+
+    def value_range(self) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """int8 양자화 구간(차원별 최소/최대)을 반환합니다."""
+        if self.dtype != 'int8':
+            return None
+        low = self.offset.astype(np.float64) - 128 * self.scale.astype(np.float64)
+        return low, low + INT8_LEVELS * self.scale.astype(np.float64)
+
+    def cosine_similarity(self, query: np.ndarray, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """query 벡터와 지정한 행들의 코사인 유사도를 계산합니다. (sklearn과 같이 영벡터는 0)"""
+        query = np.asarray(query, dtype=self.compute_dtype).reshape(-1)
+        rows = np.arange(len(self.codes)) if rows is None else np.asarray(rows)
+        similarities = np.zeros(len(rows), dtype=self.compute_dtype)
+
+        query_norm = np.linalg.norm(query)
+        if query_norm == 0 or len(rows) == 0:
+            return similarities
+
+        if self.dtype == 'int8':
+            # (q * scale + offset) · g = q · (g * scale) + offset · g
+            weights = query * self.scale
+            bias = float(np.dot(self.offset, query))
+        else:
+            weights, bias = query, 0.0
+
+        for start in range(0, len(rows), BLOCK_ROWS):
+            block_rows = rows[start:start + BLOCK_ROWS]
+            dots = self.codes[block_rows].astype(self.compute_dtype) @ weights + bias
+            norms = self.norms[block_rows] * query_norm
+            similarities[start:start + BLOCK_ROWS] = np.divide(
+                dots, norms, out=np.zeros_like(dots), where=norms > 0
+            )
+        return similarities
+
+    def memory_usage(self) -> Dict[str, Any]:
+        """인덱스가 차지하는 메모리를 반환합니다."""
+        total = self.codes.nbytes + self.norms.nbytes
+        if self.scale is not None:
+            total += self.scale.nbytes + self.offset.nbytes
+        return {
+            "dtype": self.dtype,
+            "total_bytes": int(total),
+            "bytes_per_store": round(total / len(self.codes), 2) if len(self.codes) else 0.0,
+        }
+
+
+def compare_with_baseline(vectors: np.ndarray, dtype: str, k: int = 10,
+                          n_queries: int = 200, seed: int = 0) -> Dict[str, Any]:
+    """float64 기준 대비 압축 인덱스의 top-k 일치율과 점수 오차를 계산합니다.
+
+    질의 벡터는 실제 가게 벡터에서 무작위로 뽑아 전체 카탈로그를 대상으로 검색합니다.
+    """
+    baseline = StoreVectorIndex.build(vectors, 'float64')
+    compact = StoreVectorIndex.build(vectors, dtype)
+
+    rng = np.random.default_rng(seed)
+    query_rows = rng.choice(len(vectors), size=min(n_queries, len(vectors)), replace=False)
+    k = min(k, len(vectors))
+
+    overlaps, mean_errors, max_errors = [], [], []
+    for row in query_rows:
+        query = vectors[row]
+        expected = baseline.cosine_similarity(query)
+        actual = compact.cosine_similarity(query).astype(np.float64)
+
+        expected_top = np.argpartition(-expected, k - 1)[:k]
+        actual_top = np.argpartition(-actual, k - 1)[:k]
+        overlaps.append(len(np.intersect1d(expected_top, actual_top)) / k)
+
+        errors = np.abs(expected - actual)
+        mean_errors.append(errors.mean())
+        max_errors.append(errors.max())
+
+    baseline_memory = baseline.memory_usage()
+    compact_memory = compact.memory_usage()
+    return {
+        "dtype": dtype,
+        "stores": len(vectors),
+        "queries": len(query_rows),
+        "k": k,
+        "topk_overlap_mean": round(float(np.mean(overlaps)), 4),
+        "topk_overlap_min": round(float(np.min(overlaps)), 4),
+        "score_error_mean": float(np.mean(mean_errors)),
+        "score_error_max": float(np.max(max_errors)),
+        "baseline_bytes_per_store": baseline_memory["bytes_per_store"],
+        "compact_bytes_per_store": compact_memory["bytes_per_store"],
+        "compression_ratio": round(baseline_memory["total_bytes"] / compact_memory["total_bytes"], 2),
+    }
+
+
+if __name__ == "__main__":
+    from app.core.config import CONFIG
+    from app.services.store_data import load_store_table, VEC_COLS
+
+    parser = argparse.ArgumentParser(description="가게 벡터 압축 형식 정확도 리포트")
+    parser.add_argument("--dtype", choices=SUPPORTED_DTYPES, default="int8")
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    # 기준 인덱스가 float64 정밀도를 그대로 쓰도록 벡터를 float64로 읽음
+    store_vectors = load_store_table(CONFIG["store_db_path"], vector_dtype='float64')[VEC_COLS].to_numpy()
+    report = compare_with_baseline(store_vectors, args.dtype, k=args.k, n_queries=args.queries)
+    print(json.dumps(report, ensure_ascii=False, indent=2))
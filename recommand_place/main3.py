@@ -15,7 +15,44 @@ import pprint
 from geopy.distance import great_circle
 from category_mapper import CATEGORY_MAPPING # category_mapper.py에서 매핑 딕셔너리 불러오기
 import logging
+import time
 import openai
+from app.core.prompt import Prompt, prompt_stats
+
+# 하루 계획 플래너의 고정 지시문
+PLANNER_INSTRUCTIONS = """너는 모임의 목적과 그룹의 특징에 맞춰 최적의 하루 계획을 짜주는 AI 플래너야.
+후보는 코스별로 "가게명|거리(km)|평점|대표태그|긍정 키워드" 형식으로 한 줄에 하나씩 주어져.
+
+[너의 임무]
+1. 후보 목록에서 각 코스별로 모임 목적과 상황에 가장 적합한 가게를 딱 하나씩만 선택해.
+2. 후보가 없는 코스는 결과에 포함하지 마.
+3. 아래 출력 형식을 반드시 그대로 지켜서, 두 개의 분리된 섹션으로 답변해.
+
+[출력 형식]
+### ✨ AI 추천 코스
+- [코스 1 이름]: [선택한 가게 이름 1]
+- [코스 2 이름]: [선택한 가게 이름 2]
+
+### 📝 추천 이유
+[위에서 가게를 선택한 구체적인 이유를 종합적으로 서술]"""
+
+PLANNER_PROMPT = Prompt("daily_planner", PLANNER_INSTRUCTIONS, "gpt-4.1-nano")
+
+# 태그/키워드는 앞에서부터 이 개수까지만 보냄
+MAX_TAGS = 5
+
+
+def format_tags(values) -> str:
+    if not isinstance(values, list):
+        return str(values)
+    return ",".join(value for value in values[:MAX_TAGS] if value)
+
+
+def format_planner_candidate(store) -> str:
+    """플래너 후보 한 줄 (가게명|거리(km)|평점|대표태그|긍정 키워드)"""
+    return (f"{store['store_name']}|{store['distance']:.1f}|{store['score']}|"
+            f"{format_tags(store['tag'])}|{format_tags(store['positive'])}")
+
 # --- 2. 프로젝트 설정 및 자산 로드 ---
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -141,52 +178,29 @@ def get_final_recommendation(request, assets, openai_client):
             nearby_stores['standard_category'] == activity_category
         ].sort_values(by='score', ascending=False).head(3)
         
-        llm_input_info += f"\n### 코스 {i+1} ({activity_category}) 추천 후보:\n"
+        llm_input_info += f"코스 {i+1} ({activity_category})\n"
         if not final_candidates.empty:
             for _, store in final_candidates.iterrows():
-                # LLM에게 가게의 상세 정보를 동적으로 전달
-                llm_input_info += (
-                    f"- 가게명: {store['store_name']}\n"
-                    f"  - 거리: {store['distance']:.2f}km\n"
-                    f"  - 평점: {store['score']}\n"
-                    f"  - 대표태그: {store['tag']}\n"
-                    f"  - 긍정 키워드: {store['positive']}\n"
-                )
+                # 가게 하나를 한 줄로 전달
+                llm_input_info += format_planner_candidate(store) + "\n"
         else:
-            llm_input_info += "- 주변에 추천할 만한 가게를 찾지 못했습니다.\n"
+            llm_input_info += "후보 없음\n"
 
     # --- Step 5: OpenAI API 호출 ---
     persona_desc = f"{request['personas'][0]['age']} {len(request['personas'])}명 그룹"
-    prompt = f"""너는 모임의 목적과 그룹의 특징에 맞춰 최적의 하루 계획을 짜주는 AI 플래너야.
-
-**[모임 정보]**
-- 그룹: {persona_desc}
-- 모임 목적: '{request['meeting_purpose']}'
-
-**[시스템 추천 후보 상세 정보]**
-{llm_input_info}
-
-**[너의 임무]**
-1. 위 '시스템 추천 후보' 목록에서, 각 코스별로 모임 목적과 상황에 가장 적합한 가게를 **딱 하나씩만 선택**해.
-2. 만약 특정 코스에 추천할 후보가 없다면, 그 코스는 결과에 포함하지 마.
-3. 아래 **'출력 형식'을 반드시 그대로 지켜서**, 두 개의 분리된 섹션으로 답변을 생성해줘.
-
-**[출력 형식]**
-### ✨ AI 추천 코스
-- [코스 1 이름]: [선택한 가게 이름 1]
-- [코스 2 이름]: [선택한 가게 이름 2]
-
-### 📝 추천 이유
-[위에서 가게를 선택한 구체적인 이유를 여기에 종합적으로 서술]
-"""
-    
-    logger.info("\n✅ 최종 후보군 선정 완료. OpenAI API에 프롬프트 전달 시작...")
+    messages, section_tokens = PLANNER_PROMPT.build({
+        "모임 정보": f"그룹: {persona_desc}\n모임 목적: {request['meeting_purpose']}",
+        "후보": llm_input_info.strip(),
+    })
+    logger.info(f"\n✅ 최종 후보군 선정 완료. OpenAI API에 프롬프트 전달 시작... (섹션별 토큰: {section_tokens})")
     
     try:
+        start = time.perf_counter()
         response = openai_client.chat.completions.create(
-            model="gpt-4.1-nano",
-            messages=[{"role": "user", "content": prompt}]
+            model=PLANNER_PROMPT.model,
+            messages=messages
         )
+        prompt_stats.record(PLANNER_PROMPT.name, section_tokens, response.usage, time.perf_counter() - start)
         final_plan = response.choices[0].message.content
         logger.info("✅ OpenAI API로부터 최종 계획 수신 완료!")
         return final_plan
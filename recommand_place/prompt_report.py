@@ -0,0 +1,159 @@
+"""프롬프트 토큰/지연 시간 비교 리포트 (장소 추천, main3.py 플래너)
+
+이전 프롬프트(지시문과 후보를 user 메시지 하나에 여러 줄 형식으로 보내던 방식)와
+현재 PLACE_PROMPT / PLANNER_PROMPT를 같은 예시 후보로 비교합니다.
+PLANNER_PROMPT는 main3.py에 있으므로 main3.py의 의존성(torch, transformers, category_mapper 등)을
+불러올 수 없는 환경에서는 플래너 비교를 건너뜁니다.
+기본은 로컬 토큰 수만 세고, --live N을 주면 각각 N번 실제로 호출해 지연 시간과 usage 토큰(캐시 포함)도 잽니다.
+
+사용 예:
+    python prompt_report.py
+    python prompt_report.py --live 5
+"""
+
+import argparse
+import asyncio
+import json
+
+from app.core.llm_client import close_llm_client, get_llm_client
+from app.core.prompt import measure, message_tokens
+from app.services.llm import PLACE_PROMPT, format_candidates, format_context
+
+
+def load_planner():
+    """main3.py의 플래너 프롬프트와 후보 포맷 함수 (불러올 수 없으면 None)"""
+    try:
+        import main3
+    except ImportError as e:
+        print(f"main3.py를 불러올 수 없어 플래너 비교를 건너뜁니다: {e}")
+        return None
+    return main3.PLANNER_PROMPT, main3.format_planner_candidate
+
+SAMPLE_CONTEXT = {"meeting_purpose": "기념일 로맨틱", "weather": "맑음", "time_slot": "13:00 ~ 14:59"}
+SAMPLE_CANDIDATES = [
+    {"store_name": f"가게{i}", "score": 0.9 - i * 0.05, "similarity": 0.85 - i * 0.04,
+     "description": f"양식 가게입니다. (거리: {0.4 + i * 0.3:.1f}km)"}
+    for i in range(5)
+]
+SAMPLE_COURSES = [
+    ("카페", [{"store_name": f"카페{i}", "distance": 0.5 + i, "score": 4.5, "tag": ["분위기좋은", "디저트", "조용한"],
+              "positive": ["커피가 맛있어요", "친절해요", "인테리어가 예뻐요"]} for i in range(3)]),
+    ("양식", [{"store_name": f"레스토랑{i}", "distance": 1.2 + i, "score": 4.3, "tag": ["데이트", "파스타"],
+              "positive": ["음식이 맛있어요", "양이 많아요"]} for i in range(3)]),
+    ("술집", []),
+]
+
+# 변경 전 프롬프트 (비교용으로만 보관)
+LEGACY_PLACE_TEMPLATE = """[모임 정보]
+- 목적: {meeting_purpose}
+- 날씨: {weather}
+- 시간대: {time_slot}
+
+[시스템 추천 후보]
+{candidates}
+
+[너의 임무]
+위 후보 중에서 가장 적합한 가게 하나만 선택하고, 그 이유를 JSON 형식으로 답변해줘.
+시간대와 목적에 맞는 선택을 해주세요.
+{{ "selected": "가게이름", "reason": "선택한 이유" }}
+"""
+
+LEGACY_PLANNER_TEMPLATE = """너는 모임의 목적과 그룹의 특징에 맞춰 최적의 하루 계획을 짜주는 AI 플래너야.
+
+**[모임 정보]**
+- 그룹: {persona_desc}
+- 모임 목적: '{meeting_purpose}'
+
+**[시스템 추천 후보 상세 정보]**
+{candidates}
+
+**[너의 임무]**
+1. 위 '시스템 추천 후보' 목록에서, 각 코스별로 모임 목적과 상황에 가장 적합한 가게를 **딱 하나씩만 선택**해.
+2. 만약 특정 코스에 추천할 후보가 없다면, 그 코스는 결과에 포함하지 마.
+3. 아래 **'출력 형식'을 반드시 그대로 지켜서**, 두 개의 분리된 섹션으로 답변을 생성해줘.
+
+**[출력 형식]**
+### ✨ AI 추천 코스
+- [코스 1 이름]: [선택한 가게 이름 1]
+- [코스 2 이름]: [선택한 가게 이름 2]
+
+### 📝 추천 이유
+[위에서 가게를 선택한 구체적인 이유를 여기에 종합적으로 서술]
+"""
+
+
+def place_messages():
+    candidates = "".join(
+        f"- 가게명: {c['store_name']}, 총점: {c['score']:.2f}, 유사도: {c['similarity']:.2f}, 설명: {c['description']}\n"
+        for c in SAMPLE_CANDIDATES
+    )
+    before = [{"role": "user", "content": LEGACY_PLACE_TEMPLATE.format(candidates=candidates, **SAMPLE_CONTEXT)}]
+    after, section_tokens = PLACE_PROMPT.build(
+        {"모임 정보": format_context(SAMPLE_CONTEXT), "후보": format_candidates(SAMPLE_CANDIDATES)})
+    return before, after, section_tokens
+
+
+def planner_messages(planner_prompt, format_planner_candidate):
+    legacy_candidates = ""
+    candidates = ""
+    for i, (category, stores) in enumerate(SAMPLE_COURSES):
+        legacy_candidates += f"\n### 코스 {i+1} ({category}) 추천 후보:\n"
+        candidates += f"코스 {i+1} ({category})\n"
+        for store in stores:
+            legacy_candidates += (
+                f"- 가게명: {store['store_name']}\n"
+                f"  - 거리: {store['distance']:.2f}km\n"
+                f"  - 평점: {store['score']}\n"
+                f"  - 대표태그: {store['tag']}\n"
+                f"  - 긍정 키워드: {store['positive']}\n"
+            )
+            candidates += format_planner_candidate(store) + "\n"
+        if not stores:
+            legacy_candidates += "- 주변에 추천할 만한 가게를 찾지 못했습니다.\n"
+            candidates += "후보 없음\n"
+
+    persona_desc = "20대 2명 그룹"
+    before = [{"role": "user", "content": LEGACY_PLANNER_TEMPLATE.format(
+        persona_desc=persona_desc, meeting_purpose="기념일 데이트", candidates=legacy_candidates)}]
+    after, section_tokens = planner_prompt.build({
+        "모임 정보": f"그룹: {persona_desc}\n모임 목적: 기념일 데이트",
+        "후보": candidates.strip(),
+    })
+    return before, after, section_tokens
+
+
+async def main(args):
+    prompts = [
+        (PLACE_PROMPT, place_messages(), {"response_format": {"type": "json_object"}}),
+    ]
+    planner = load_planner()
+    if planner:
+        planner_prompt, format_planner_candidate = planner
+        prompts.append((planner_prompt, planner_messages(planner_prompt, format_planner_candidate), {}))
+    report = {}
+    for prompt, (before, after, section_tokens), _ in prompts:
+        report[prompt.name] = {
+            "before": {"local_tokens": message_tokens(before, prompt.model)},
+            "after": {"local_tokens": message_tokens(after, prompt.model), "section_tokens": section_tokens},
+        }
+
+    if args.live:
+        client = get_llm_client()
+        try:
+            for prompt, (before, after, _), kwargs in prompts:
+                for key, messages in (("before", before), ("after", after)):
+                    report[prompt.name][key].update(
+                        await measure(client, prompt.model, messages, args.live, **kwargs))
+        finally:
+            await close_llm_client()
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="장소 추천/플래너 프롬프트 변경 전/후 토큰 및 지연 시간 비교")
+    parser.add_argument("--live", type=int, default=0, help="프롬프트별 실제 API 호출 횟수 (0이면 로컬 토큰 수만)")
+    parser.add_argument("--output", default="prompt_report.json")
+    asyncio.run(main(parser.parse_args()))
@@ -1,11 +1,19 @@
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel
-import torch
-from transformers import AutoTokenizer, AutoModelForSequenceClassification
+import asyncio
 import os
+import time
+from functools import partial
 from typing import List
 import json
+from batcher import MicroBatcher, InferenceOverloaded
+from connections import ConnectionManager
+from cascade import CascadeClassifier, DEFAULT_THRESHOLD
+from worker_pool import create_inference_pool, default_threads_per_worker, worker_predict, worker_predict_bulk
+from inference import load_classifier, predict_logits, logits_to_labels, predict_bucketed, MAX_LENGTH
+from prediction_cache import PredictionCache
 
 app = FastAPI(
     title="Text Empathy Classification API",
@@ -24,33 +32,33 @@ app.add_middleware(
 
 # 모델 경로 설정
 script_directory = os.path.dirname(os.path.abspath(__file__))
-MODEL_PATH = os.path.join(script_directory, "my_best_model")
-
-# 라벨 정보
-id_to_label = {
-    0: '격려',
-    1: '위로',
-    2: '동조',
-    3: '조언'
-}
+MODEL_PATH = os.getenv("TEXT_AI_MODEL_PATH", os.path.join(script_directory, "my_best_model"))
+
+# 로컬 모델 폴더가 없을 때만, 그리고 명시적으로 허용했을 때만 Hugging Face Hub에서 받음
+HUB_MODEL_ID = os.getenv("TEXT_AI_HUB_MODEL_ID", "seunghyunq/text-classification-model")
+ALLOW_HUB_FALLBACK = os.getenv("TEXT_AI_ALLOW_HUB_FALLBACK", "false").lower() == "true"
+
+# 모델 형식: fp32(기본) 또는 int8 (export_model.py로 만든 동적 양자화 모델)
+MODEL_FORMAT = os.getenv("TEXT_AI_MODEL_FORMAT", "fp32")
+QUANTIZED_MODEL_PATH = os.getenv("TEXT_AI_QUANTIZED_MODEL_PATH", os.path.join(script_directory, "my_best_model_int8"))
 
-# 채팅방 관리를 위한 클래스
-class ConnectionManager:
-    def __init__(self):
-        self.active_connections: List[WebSocket] = []
-        
-    async def connect(self, websocket: WebSocket):
-        await websocket.accept()
-        self.active_connections.append(websocket)
-    
-    def disconnect(self, websocket: WebSocket):
-        self.active_connections.remove(websocket)
-    
-    async def broadcast(self, message: dict):
-        for connection in self.active_connections:
-            await connection.send_json(message)
-
-manager = ConnectionManager()
+# 시작 시 warmup forward 반복 횟수
+WARMUP_ROUNDS = int(os.getenv("TEXT_AI_WARMUP_ROUNDS", "3"))
+WARMUP_TEXTS = [
+    "오늘 직장 상사한테 너무 심하게 혼나서 기운이 하나도 없어.",
+    "나 다음 주부터 새로운 운동 시작해볼까 하는데, 뭘 하면 좋을까?",
+    "네 덕분에 프로젝트 잘 마쳤어. 정말 고마워!",
+    "ㅋㅋ",
+]
+
+# 채팅방 관리 (방별 연결 집합, 클라이언트별 송신 큐)
+DEFAULT_ROOM = "lobby"
+manager = ConnectionManager(
+    max_outbound=int(os.getenv("TEXT_AI_WS_MAX_OUTBOUND", "64")),
+    send_timeout=float(os.getenv("TEXT_AI_WS_SEND_TIMEOUT", "5")),
+    coalesce_ms=float(os.getenv("TEXT_AI_WS_COALESCE_MS", "0")),
+    max_coalesce=int(os.getenv("TEXT_AI_WS_MAX_COALESCE", "32")),
+)
 
 # 모델 클래스들
 class TextRequest(BaseModel):
@@ -60,35 +68,197 @@ class PredictionResponse(BaseModel):
     text: str
     prediction: str
 
-# 모델과 토크나이저 로드
-try:
-    tokenizer = AutoTokenizer.from_pretrained("seunghyunq/text-classification-model")
-    model = AutoModelForSequenceClassification.from_pretrained("seunghyunq/text-classification-model")
-    model.eval()
-    print("✅ 모델 로드 성공!")
-except Exception as e:
-    print(f"🚨 모델 로드 중 오류 발생: {e}")
-    raise Exception("모델 로드 실패")
+class BatchTextRequest(BaseModel):
+    texts: List[str]
+
+class BatchPredictionResponse(BaseModel):
+    predictions: List[PredictionResponse]
+
+# 한 번의 배치 요청에서 받을 최대 문장 수와 forward당 문장 수
+MAX_BATCH_TEXTS = int(os.getenv("TEXT_AI_MAX_BATCH_TEXTS", "1000"))
+BULK_BATCH_SIZE = int(os.getenv("TEXT_AI_BULK_BATCH_SIZE", "32"))
+
+# 모델과 토크나이저는 시작 후 백그라운드에서 로드하고, warmup이 끝나야 ready가 됨
+assets = {}
+readiness = {
+    "ready": False,
+    "source": None,
+    "load_seconds": None,
+    "warmup_seconds": None,
+    "error": None,
+}
+
+def load_model_assets():
+    """로컬 모델 폴더에서 모델을 로드합니다. 허용된 경우에만 Hub로 대체합니다."""
+    start = time.perf_counter()
+    if MODEL_FORMAT == "int8":
+        source = QUANTIZED_MODEL_PATH
+        tokenizer, model = load_classifier(source, "int8", local_files_only=True)
+    elif os.path.isdir(MODEL_PATH):
+        source = MODEL_PATH
+        tokenizer, model = load_classifier(source, local_files_only=True)
+    elif ALLOW_HUB_FALLBACK:
+        source = HUB_MODEL_ID
+        tokenizer, model = load_classifier(source)
+    else:
+        raise FileNotFoundError(
+            f"로컬 모델 폴더가 없습니다: {MODEL_PATH} "
+            f"(Hub에서 받으려면 TEXT_AI_ALLOW_HUB_FALLBACK=true)"
+        )
+    assets['tokenizer'] = tokenizer
+    assets['model'] = model
+    readiness['source'] = source
+    readiness['load_seconds'] = round(time.perf_counter() - start, 3)
+    print(f"✅ 모델 로드 성공! ({MODEL_FORMAT}, {source}, {readiness['load_seconds']}초)")
+
+def warmup_model():
+    """첫 요청이 느려지지 않도록 한 문장/여러 문장 forward를 미리 실행합니다."""
+    start = time.perf_counter()
+    for _ in range(WARMUP_ROUNDS):
+        get_predictions(WARMUP_TEXTS[:1])
+        get_predictions(WARMUP_TEXTS)
+    readiness['warmup_seconds'] = round(time.perf_counter() - start, 3)
+
+def get_predictions(texts: List[str]) -> List[str]:
+    # 여러 문장을 패딩해 한 번의 forward로 분류
+    return logits_to_labels(predict_logits(assets['tokenizer'], assets['model'], texts, max_length=MAX_LENGTH))
 
 def get_prediction(text: str) -> str:
-    inputs = tokenizer(text, return_tensors="pt", truncation=True, padding=True)
-    with torch.no_grad():
-        outputs = model(**inputs)
-    predicted_class_id = outputs.logits.argmax().item()
-    return id_to_label.get(predicted_class_id, "알 수 없는 라벨")
+    return get_predictions([text])[0]
+
+def get_bulk_predictions(texts: List[str]) -> List[str]:
+    # 길이별로 묶어 배치 추론
+    return predict_bucketed(assets['tokenizer'], assets['model'], texts, BULK_BATCH_SIZE, MAX_LENGTH)
+
+# 대량 분류 함수 (워커 프로세스를 쓰면 워커 쪽 함수로 교체)
+bulk_predict = get_bulk_predictions
+
+# 0이면 스레드 풀에서 추론, 1 이상이면 그 수만큼 워커 프로세스가 부모의 모델을 공유 메모리로 받아 추론
+INFERENCE_PROCESSES = int(os.getenv("TEXT_AI_INFERENCE_PROCESSES", "0"))
+THREADS_PER_WORKER = int(os.getenv("TEXT_AI_THREADS_PER_WORKER", "0")) or default_threads_per_worker(INFERENCE_PROCESSES)
+
+def start_process_workers():
+    """부모가 로드한 모델을 공유 메모리로 워커에 넘기는 추론 풀을 만듭니다 (warmup까지 마친 뒤 반환)."""
+    return create_inference_pool(INFERENCE_PROCESSES, THREADS_PER_WORKER, assets['tokenizer'], assets['model'],
+                                 warmup_texts=WARMUP_TEXTS)
+
+# 동시에 들어온 요청을 모아 배치로 추론하는 스케줄러
+batcher = MicroBatcher(
+    get_predictions,
+    max_batch_size=int(os.getenv("TEXT_AI_MAX_BATCH_SIZE", "16")),
+    max_wait_ms=float(os.getenv("TEXT_AI_MAX_WAIT_MS", "5")),
+    max_queue_size=int(os.getenv("TEXT_AI_MAX_QUEUE_SIZE", "256")),
+    workers=int(os.getenv("TEXT_AI_INFERENCE_WORKERS", "1")),
+)
+
+# 반복 메시지 분류 결과 캐시 (TEXT_AI_CACHE_SIZE=0이면 LRU 비활성화)
+prediction_cache = PredictionCache(max_entries=int(os.getenv("TEXT_AI_CACHE_SIZE", "50000")))
+PRECOMPUTED_PATH = os.getenv("TEXT_AI_PRECOMPUTED_PATH")
+
+# 가벼운 모델이 확신하는 문장은 트랜스포머를 거치지 않음 (cascade.py로 학습한 모델 파일)
+CASCADE_PATH = os.getenv("TEXT_AI_CASCADE_PATH")
+CASCADE_THRESHOLD = float(os.getenv("TEXT_AI_CASCADE_THRESHOLD", str(DEFAULT_THRESHOLD)))
+cascade = None
+
+async def classify(text: str) -> str:
+    """캐시를 먼저 확인하고, 없으면 배치 추론 후 결과를 캐시에 저장합니다."""
+    prediction = prediction_cache.get(text)
+    if prediction is None:
+        if cascade is not None:
+            # TF-IDF 변환 + 로지스틱 회귀도 CPU 작업이므로 이벤트 루프 밖에서 계산
+            confident = await asyncio.get_running_loop().run_in_executor(
+                None, cascade.predict_confident, [text]
+            )
+            prediction = confident[0]
+        if prediction is None:
+            prediction = await batcher.submit(text)
+        prediction_cache.put(text, prediction)
+    return prediction
+
+def ensure_ready():
+    if not readiness['ready']:
+        raise HTTPException(status_code=503, detail="모델을 준비하는 중입니다.")
+
+async def prepare_model():
+    """모델 로드, warmup, 고정 캐시 등록을 마친 뒤 ready 상태로 전환합니다."""
+    global cascade, bulk_predict
+    loop = asyncio.get_running_loop()
+    try:
+        if CASCADE_PATH:
+            cascade = await loop.run_in_executor(None, CascadeClassifier.load, CASCADE_PATH, CASCADE_THRESHOLD)
+            print(f"✅ cascade 모델 로드 (threshold={CASCADE_THRESHOLD})")
+        await loop.run_in_executor(None, load_model_assets)
+        await loop.run_in_executor(None, warmup_model)
+        if INFERENCE_PROCESSES > 0:
+            pool = await loop.run_in_executor(None, start_process_workers)
+            batcher.attach_executor(pool, INFERENCE_PROCESSES, predict_fn=worker_predict)
+            bulk_predict = partial(worker_predict_bulk, batch_size=BULK_BATCH_SIZE)
+            print(f"✅ 추론 워커 {INFERENCE_PROCESSES}개 시작 (워커당 스레드 {THREADS_PER_WORKER}개)")
+        if PRECOMPUTED_PATH:
+            count = await loop.run_in_executor(
+                None, prediction_cache.load_precomputed, PRECOMPUTED_PATH, get_predictions
+            )
+            print(f"✅ 자주 쓰이는 메시지 {count}개 캐시 등록")
+        readiness['ready'] = True
+        print(f"✅ 모델 준비 완료 (warmup {readiness['warmup_seconds']}초)")
+    except Exception as e:
+        readiness['error'] = str(e)
+        print(f"🚨 모델 로드 중 오류 발생: {e}")
+
+@app.on_event("startup")
+async def start_batcher():
+    batcher.start()
+    # 로드가 끝날 때까지 /ready는 503을 반환하고, 헬스체크(/)는 바로 응답
+    app.state.prepare_task = asyncio.create_task(prepare_model())
+
+@app.on_event("shutdown")
+async def stop_batcher():
+    await batcher.stop()
 
 @app.websocket("/ws/chat")
 async def websocket_endpoint(websocket: WebSocket):
-    await manager.connect(websocket)
+    # ?room=<방 이름> 으로 입장, 메시지는 같은 방에만 전달됨
+    room = websocket.query_params.get("room", DEFAULT_ROOM)
+    await manager.connect(websocket, room)
     try:
         while True:
-            data = await websocket.receive_text()
+            try:
+                data = await websocket.receive_text()
+            except RuntimeError:
+                # 느린 클라이언트로 연결 해제된 뒤 수신을 시도한 경우 (송신은 큐를 거치므로 여기서만 발생)
+                break
             try:
                 message_data = json.loads(data)
                 text = message_data.get('text', '')
                 
-                # 메시지 분류 수행
-                prediction = get_prediction(text)
+                if not readiness['ready']:
+                    await manager.send_personal(websocket, {
+                        "error": "not_ready",
+                        "detail": "모델을 준비하는 중입니다.",
+                        "text": text
+                    })
+                    continue
+                
+                # 메시지 분류 수행 (다른 요청과 함께 배치로 처리)
+                try:
+                    prediction = await classify(text)
+                except InferenceOverloaded:
+                    # 대기열이 가득 차면 지연을 늘리지 않고 보낸 사람에게만 알림
+                    await manager.send_personal(websocket, {
+                        "error": "overloaded",
+                        "detail": "서버가 혼잡합니다. 잠시 후 다시 시도해주세요.",
+                        "text": text
+                    })
+                    continue
+                except Exception as e:
+                    # 배치 워커/추론 오류는 연결을 끊지 않고 보낸 사람에게 알림
+                    print(f"🚨 메시지 분류 중 오류 발생: {e!r}")
+                    await manager.send_personal(websocket, {
+                        "error": "inference_failed",
+                        "detail": "메시지를 분류하지 못했습니다.",
+                        "text": text
+                    })
+                    continue
                 
                 # 응답 메시지 구성
                 response_message = {
@@ -96,16 +266,92 @@ async def websocket_endpoint(websocket: WebSocket):
                     "prediction": prediction
                 }
                 
-                # 모든 연결된 클라이언트에게 브로드캐스트
-                await manager.broadcast(response_message)
+                # 같은 방의 클라이언트에게 브로드캐스트
+                await manager.broadcast(response_message, room)
                 
             except json.JSONDecodeError:
-                await websocket.send_json({
+                await manager.send_personal(websocket, {
                     "error": "Invalid JSON format"
                 })
     except WebSocketDisconnect:
+        pass
+    finally:
         manager.disconnect(websocket)
 
+@app.post("/classify", response_model=PredictionResponse)
+async def classify_text(request: TextRequest):
+    """텍스트 한 개의 공감 유형을 분류합니다."""
+    ensure_ready()
+    try:
+        prediction = await classify(request.text)
+    except InferenceOverloaded as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    return PredictionResponse(text=request.text, prediction=prediction)
+
+@app.post("/classify/batch", response_model=BatchPredictionResponse)
+async def classify_batch(request: BatchTextRequest):
+    """여러 텍스트를 길이별로 묶어 배치 분류하고, 요청 순서대로 결과를 반환합니다."""
+    ensure_ready()
+    if len(request.texts) > MAX_BATCH_TEXTS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"한 번에 최대 {MAX_BATCH_TEXTS}개까지 분류할 수 있습니다."
+        )
+
+    predictions = [prediction_cache.get(text) for text in request.texts]
+    missing = [i for i, prediction in enumerate(predictions) if prediction is None]
+    if missing:
+        if cascade is not None:
+            confident = await asyncio.get_running_loop().run_in_executor(
+                None, cascade.predict_confident, [request.texts[i] for i in missing]
+            )
+            for i, prediction in zip(missing, confident):
+                predictions[i] = prediction
+            missing = [i for i, prediction in zip(missing, confident) if prediction is None]
+    if missing:
+        missing_texts = [request.texts[i] for i in missing]
+        results = await batcher.run_in_pool(bulk_predict, missing_texts)
+        for i, prediction in zip(missing, results):
+            predictions[i] = prediction
+    for text, prediction in zip(request.texts, predictions):
+        prediction_cache.put(text, prediction)
+
+    return BatchPredictionResponse(predictions=[
+        PredictionResponse(text=text, prediction=prediction)
+        for text, prediction in zip(request.texts, predictions)
+    ])
+
+@app.get("/stats/inference")
+async def inference_stats():
+    """추론 대기열 깊이와 대기 시간 통계"""
+    return batcher.stats()
+
+@app.get("/stats/cache")
+async def cache_stats():
+    """분류 결과 캐시 적중률과 메모리 사용량"""
+    return prediction_cache.stats()
+
+@app.get("/stats/cascade")
+async def cascade_stats():
+    """가벼운 모델이 바로 답한 비율"""
+    if cascade is None:
+        return {"enabled": False}
+    return {"enabled": True, **cascade.stats()}
+
+@app.get("/stats/connections")
+async def connection_stats():
+    """방/연결 수, 송신 큐 적체와 느린 클라이언트 연결 해제 횟수"""
+    return manager.stats()
+
+@app.get("/ready")
+async def ready():
+    """모델 로드와 warmup이 끝났는지 확인합니다. 준비 전에는 503을 반환합니다."""
+    return JSONResponse(status_code=200 if readiness['ready'] else 503, content=readiness)
+
 @app.get("/")
 async def root():
-    return {"message": "Text Empathy Classification API is running"} 
\ No newline at end of file
+    return {"message": "Text Empathy Classification API is running"}
+
+if __name__ == "__main__":
+    import uvicorn
+    uvicorn.run(app, host="0.0.0.0", port=int(os.getenv("PORT", "8003"))) 
\ No newline at end of file
@@ -0,0 +1,176 @@
+"""마이크로 배치 추론 스케줄러
+
+여러 클라이언트에서 동시에 들어온 분류 요청을 모아 한 번의 forward로 처리합니다.
+워커는 첫 요청이 들어오면 최대 max_wait_ms 동안, 또는 max_batch_size개가 찰 때까지
+요청을 모은 뒤 전용 스레드 풀에서 배치 예측 함수를 실행하고 각 요청의 future에 결과를 돌려줍니다.
+
+대기열은 max_queue_size로 제한되며, 가득 차면 지연을 무한정 늘리는 대신
+InferenceOverloaded 예외로 즉시 거절합니다.
+
+attach_executor로 스레드 풀 대신 프로세스 풀(worker_pool.py)에서 배치를 실행할 수 있습니다.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Callable, List, Optional, Tuple, Dict, Any
+
+logger = logging.getLogger(__name__)
+
+
+class InferenceOverloaded(Exception):
+    """추론 대기열이 가득 차 요청을 받을 수 없을 때 발생합니다."""
+
+
+class MicroBatcher:
+    def __init__(self, predict_fn: Callable[[List[str]], List[str]],
+                 max_batch_size: int = 16, max_wait_ms: float = 5.0,
+                 max_queue_size: int = 256, workers: int = 1):
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.max_queue_size = max_queue_size
+        self.workers = workers
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker_tasks: List[asyncio.Task] = []
+        self._executor: Optional[Executor] = None
+        self.executor_kind = "thread"
+
+        # 통계
+        self._submitted = 0
+        self._rejected = 0
+        self._batches = 0
+        self._batched_texts = 0
+        self._in_flight = 0
+        self._recent_waits = deque(maxlen=1000)
+
+    def start(self):
+        """이벤트 루프 안에서 추론 스레드 풀과 배치 워커를 시작합니다."""
+        self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="text-ai-inference")
+        self._worker_tasks = [asyncio.create_task(self._run()) for _ in range(self.workers)]
+
+    async def stop(self):
+        """워커를 멈추고 대기 중인 요청을 취소합니다."""
+        for task in self._worker_tasks:
+            task.cancel()
+        for task in self._worker_tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._worker_tasks = []
+        while self._queue is not None and not self._queue.empty():
+            _, future, _ = self._queue.get_nowait()
+            future.cancel()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def attach_executor(self, executor: Executor, workers: int, kind: str = "process",
+                        predict_fn: Optional[Callable[[List[str]], List[str]]] = None):
+        """배치를 실행할 풀을 교체하고, 풀의 워커 수만큼 배치가 동시에 처리되도록 배치 워커 수를 맞춥니다.
+
+        predict_fn을 주면 배치 예측 함수도 바꿉니다 (프로세스 풀에서는 워커 쪽 모델을 쓰는 함수).
+        이벤트 루프 안에서, 배치가 처리 중이지 않을 때(시작 직후) 호출해야 합니다.
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+        self._executor = executor
+        self.executor_kind = kind
+        if predict_fn is not None:
+            self.predict_fn = predict_fn
+        while len(self._worker_tasks) < workers:
+            self._worker_tasks.append(asyncio.create_task(self._run()))
+        self.workers = workers
+
+    async def submit(self, text: str) -> str:
+        """텍스트를 큐에 넣고 배치 처리 결과를 기다립니다. 큐가 가득 차면 즉시 거절합니다."""
+        if not self._worker_tasks:
+            raise RuntimeError("배치 워커가 시작되지 않았습니다.")
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self._queue.put_nowait((text, future, time.perf_counter()))
+        except asyncio.QueueFull:
+            self._rejected += 1
+            raise InferenceOverloaded(f"추론 대기열이 가득 찼습니다 (max_queue_size={self.max_queue_size})")
+        self._submitted += 1
+        return await future
+
+    async def run_in_pool(self, fn: Callable, *args):
+        """배치 큐를 거치지 않는 작업(대량 분류 등)을 같은 추론 스레드 풀에서 실행합니다."""
+        if self._executor is None:
+            raise RuntimeError("배치 워커가 시작되지 않았습니다.")
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    def stats(self) -> Dict[str, Any]:
+        """대기열 깊이, 대기 시간, 배치 크기 통계를 반환합니다."""
+        waits = sorted(self._recent_waits)
+        return {
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "max_queue_size": self.max_queue_size,
+            "in_flight": self._in_flight,
+            "workers": self.workers,
+            "executor": self.executor_kind,
+            "submitted": self._submitted,
+            "rejected": self._rejected,
+            "batches": self._batches,
+            "avg_batch_size": round(self._batched_texts / self._batches, 2) if self._batches else 0.0,
+            "wait_ms_avg": round(sum(waits) / len(waits) * 1000, 2) if waits else 0.0,
+            "wait_ms_p95": round(waits[min(len(waits) - 1, int(len(waits) * 0.95))] * 1000, 2) if waits else 0.0,
+            "wait_ms_max": round(waits[-1] * 1000, 2) if waits else 0.0,
+        }
+
+    async def _collect(self) -> List[Tuple[str, asyncio.Future, float]]:
+        """첫 요청 이후 max_wait 동안 또는 max_batch_size개까지 요청을 모읍니다."""
+        loop = asyncio.get_running_loop()
+        batch = [await self._queue.get()]
+        deadline = loop.time() + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            # 이미 쌓여 있는 요청은 기다리지 않고 가져옴
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+
+        # 기다리는 동안 연결이 끊겨 취소된 요청은 제외
+        return [item for item in batch if not item[1].done()]
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            if not batch:
+                continue
+
+            started = time.perf_counter()
+            self._recent_waits.extend(started - enqueued for _, _, enqueued in batch)
+            self._batches += 1
+            self._batched_texts += len(batch)
+
+            texts = [text for text, _, _ in batch]
+            self._in_flight += len(texts)
+            try:
+                # forward는 CPU를 오래 점유하므로 전용 스레드 풀에서 실행
+                results = await loop.run_in_executor(self._executor, self.predict_fn, texts)
+            except Exception as e:
+                logger.error(f"배치 추론 실패 (batch={len(texts)}): {e}")
+                for _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            finally:
+                self._in_flight -= len(texts)
+
+            for (_, future, _), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
@@ -0,0 +1,126 @@
+"""공감 유형 분류 모델 CPU 추론 벤치마크
+
+모델 폴더(my_best_model 형식, 또는 export_model.py로 만든 int8 폴더)를 불러와
+배치 크기 x 문장 길이(토큰 수) x torch 스레드 수 조합별로 forward 지연 시간(p50/p99), 초당 처리 문장 수,
+최대 메모리(RSS)를 측정해 JSON으로 저장합니다. --labeled-glob을 주면 검증 데이터로 정확도/F1도 함께 기록합니다.
+
+사용 예:
+    python benchmark.py --model-dir my_best_model --batch-sizes 1,8,32 --seq-lengths 16,64,128 --threads 1,4
+    python benchmark.py --model-dir my_best_model_int8 --model-format int8 --labeled-glob "./Validation/02/*.json"
+"""
+
+import argparse
+import json
+import os
+import platform
+import resource
+import time
+from typing import Any, Dict, List
+
+import numpy as np
+import torch
+
+from cascade import load_labeled_texts
+from export_model import evaluate
+from inference import MAX_LENGTH, label_to_id, load_classifier
+
+script_directory = os.path.dirname(os.path.abspath(__file__))
+
+SAMPLE_TEXT = "오늘 직장 상사한테 너무 심하게 혼나서 기운이 하나도 없어. 나 다음 주부터 새로운 운동 시작해볼까 하는데, 뭘 하면 좋을까?"
+
+
+def peak_rss_mb() -> float:
+    """프로세스 시작 이후 최대 RSS (MB)"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux는 KB, macOS는 바이트 단위
+    return peak / 1024 ** 2 if platform.system() == "Darwin" else peak / 1024
+
+
+def make_inputs(tokenizer, batch_size: int, seq_length: int) -> Dict[str, torch.Tensor]:
+    """정확히 seq_length 토큰인 문장 batch_size개를 만듭니다."""
+    text = SAMPLE_TEXT
+    while len(tokenizer(text)["input_ids"]) < seq_length:
+        text += " " + SAMPLE_TEXT
+    return tokenizer([text] * batch_size, return_tensors="pt", truncation=True,
+                     padding="max_length", max_length=seq_length)
+
+
+def time_forward(model, inputs, repeats: int, warmup: int) -> List[float]:
+    with torch.no_grad():
+        for _ in range(warmup):
+            model(**inputs)
+        latencies = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            model(**inputs)
+            latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def sweep(tokenizer, model, batch_sizes: List[int], seq_lengths: List[int], threads: List[int],
+          repeats: int, warmup: int) -> List[Dict[str, Any]]:
+    results = []
+    for num_threads in threads:
+        torch.set_num_threads(num_threads)
+        for seq_length in seq_lengths:
+            for batch_size in batch_sizes:
+                inputs = make_inputs(tokenizer, batch_size, seq_length)
+                latencies = time_forward(model, inputs, repeats, warmup)
+                result = {
+                    "threads": num_threads,
+                    "seq_length": seq_length,
+                    "batch_size": batch_size,
+                    "p50_ms": float(np.percentile(latencies, 50)),
+                    "p99_ms": float(np.percentile(latencies, 99)),
+                    "texts_per_sec": batch_size * 1000 / float(np.mean(latencies)),
+                    "peak_rss_mb": peak_rss_mb(),
+                }
+                print(f"threads={num_threads:<3} seq={seq_length:<4} batch={batch_size:<4} "
+                      f"p50={result['p50_ms']:.1f}ms p99={result['p99_ms']:.1f}ms "
+                      f"{result['texts_per_sec']:.1f} texts/s")
+                results.append(result)
+    return results
+
+
+def parse_int_list(value: str) -> List[int]:
+    return [int(item) for item in value.split(",") if item.strip()]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="공감 유형 분류 모델 CPU 추론 벤치마크")
+    parser.add_argument("--model-dir", default=os.path.join(script_directory, "my_best_model"))
+    parser.add_argument("--model-format", default="fp32", choices=["fp32", "int8"])
+    parser.add_argument("--batch-sizes", type=parse_int_list, default=[1, 8, 32])
+    parser.add_argument("--seq-lengths", type=parse_int_list, default=[16, 64, MAX_LENGTH])
+    parser.add_argument("--threads", type=parse_int_list, default=[torch.get_num_threads()])
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--labeled-glob", default=None,
+                        help="정확도를 함께 측정할 검증용 JSON 파일 패턴 (예: ./Validation/02/*.json)")
+    parser.add_argument("--limit", type=int, default=1000, help="정확도 측정에 사용할 최대 샘플 수 (0이면 전체)")
+    parser.add_argument("--output", default="benchmark_report.json")
+    args = parser.parse_args()
+
+    rss_before = peak_rss_mb()
+    start = time.perf_counter()
+    tokenizer, model = load_classifier(args.model_dir, args.model_format, local_files_only=True)
+    report = {
+        "model_dir": args.model_dir,
+        "model_format": args.model_format,
+        "torch_version": torch.__version__,
+        "cpu_count": os.cpu_count(),
+        "load_seconds": time.perf_counter() - start,
+        "model_rss_mb": peak_rss_mb() - rss_before,
+        "results": sweep(tokenizer, model, args.batch_sizes, args.seq_lengths, args.threads,
+                         args.repeats, args.warmup),
+    }
+
+    if args.labeled_glob:
+        texts, labels = load_labeled_texts(args.labeled_glob, args.limit)
+        report["accuracy"] = evaluate(tokenizer, model, texts, [label_to_id[label] for label in labels],
+                                      max(args.batch_sizes), MAX_LENGTH)
+    report["peak_rss_mb"] = peak_rss_mb()
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"✅ 벤치마크 결과 저장: {args.output}")
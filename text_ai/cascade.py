@@ -0,0 +1,178 @@
+"""2단계(cascade) 공감 유형 분류기
+
+짧은 채팅 메시지는 대부분 쉬운 문장이므로, 먼저 가벼운 모델(문자 n-gram TF-IDF + 로지스틱 회귀)로
+분류하고 확신도가 threshold 이상이면 그 결과를 그대로 씁니다. 나머지만 트랜스포머 모델로 보냅니다.
+
+가벼운 모델은 text_cla.py와 같은 JSON 말뭉치(corpus.create_dataframe_from_json)로 학습합니다.
+
+사용 예:
+    python cascade.py --train-glob "./02/*.json" --validation-glob "./Validation/02/*.json"
+
+학습된 모델(cascade_model.joblib)과 함께 임계값별 정확도/지연 시간 리포트(cascade_report.json)를 저장합니다.
+서빙 시에는 TEXT_AI_CASCADE_PATH로 모델 파일을 지정하면 app.py가 사용합니다.
+"""
+
+import argparse
+import glob
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+import joblib
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import accuracy_score, f1_score
+from sklearn.pipeline import Pipeline
+
+from corpus import create_dataframe_from_json
+from inference import MAX_LENGTH, label_to_id, load_classifier, logits_to_labels, predict_logits
+
+script_directory = os.path.dirname(os.path.abspath(__file__))
+
+DEFAULT_THRESHOLD = 0.8
+REPORT_THRESHOLDS = [0.5, 0.6, 0.7, 0.75, 0.8, 0.85, 0.9, 0.95]
+
+
+def load_labeled_texts(pattern: str, limit: int = 0):
+    """서빙 라벨(격려/위로/동조/조언)만 남긴 텍스트/라벨 목록을 만듭니다."""
+    df = create_dataframe_from_json(glob.glob(pattern))
+    df = df[df['label'].isin(label_to_id)]
+    if limit:
+        df = df.sample(n=min(limit, len(df)), random_state=42)
+    if len(df) == 0:
+        raise ValueError(f"학습/검증 데이터가 없습니다: {pattern}")
+    return list(df['text']), list(df['label'])
+
+
+def train_fast_model(texts: List[str], labels: List[str]) -> Pipeline:
+    """문자 n-gram TF-IDF + 로지스틱 회귀 분류기를 학습합니다."""
+    pipeline = Pipeline([
+        ("tfidf", TfidfVectorizer(analyzer="char_wb", ngram_range=(1, 3), min_df=2,
+                                  sublinear_tf=True, max_features=200000)),
+        ("clf", LogisticRegression(max_iter=1000, C=4.0)),
+    ])
+    pipeline.fit(texts, labels)
+    return pipeline
+
+
+class CascadeClassifier:
+    """확신도가 threshold 이상인 문장만 가벼운 모델로 답하고, 나머지는 None으로 남깁니다."""
+
+    def __init__(self, pipeline: Pipeline, threshold: float = DEFAULT_THRESHOLD):
+        self.pipeline = pipeline
+        self.threshold = threshold
+        self._lock = threading.Lock()
+        self._answered = 0
+        self._deferred = 0
+
+    @classmethod
+    def load(cls, path: str, threshold: float = DEFAULT_THRESHOLD) -> "CascadeClassifier":
+        return cls(joblib.load(path), threshold)
+
+    def predict_confident(self, texts: List[str]) -> List[Optional[str]]:
+        if not texts:
+            return []
+        probabilities = self.pipeline.predict_proba(texts)
+        best = probabilities.argmax(axis=1)
+        classes = self.pipeline.classes_
+        results = [
+            classes[i] if probabilities[row, i] >= self.threshold else None
+            for row, i in enumerate(best)
+        ]
+        answered = sum(result is not None for result in results)
+        with self._lock:
+            self._answered += answered
+            self._deferred += len(results) - answered
+        return results
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self._answered + self._deferred
+            return {
+                "threshold": self.threshold,
+                "answered": self._answered,
+                "deferred": self._deferred,
+                "answered_ratio": round(self._answered / total, 4) if total else 0.0,
+            }
+
+
+def _per_text_ms(fn, texts: List[str], batch_size: int) -> float:
+    start = time.perf_counter()
+    for i in range(0, len(texts), batch_size):
+        fn(texts[i:i + batch_size])
+    return (time.perf_counter() - start) * 1000 / len(texts)
+
+
+def threshold_report(pipeline: Pipeline, model_dir: str, texts: List[str], labels: List[str],
+                     batch_size: int = 32) -> Dict[str, Any]:
+    """임계값별로 가벼운 모델이 답하는 비율, cascade 정확도/F1, 문장당 예상 CPU 시간을 비교합니다."""
+    tokenizer, model = load_classifier(model_dir)
+
+    def transformer_predict(batch):
+        return logits_to_labels(predict_logits(tokenizer, model, batch, max_length=MAX_LENGTH))
+
+    print("⏳ 트랜스포머 모델 예측 중...")
+    transformer_ms = _per_text_ms(transformer_predict, texts[:min(len(texts), 256)], batch_size)
+    transformer_labels = []
+    for i in range(0, len(texts), batch_size):
+        transformer_labels.extend(transformer_predict(texts[i:i + batch_size]))
+
+    fast_ms = _per_text_ms(lambda batch: pipeline.predict_proba(batch), texts, batch_size)
+    probabilities = pipeline.predict_proba(texts)
+    fast_labels = pipeline.classes_[probabilities.argmax(axis=1)]
+    confidence = probabilities.max(axis=1)
+
+    report = {
+        "samples": len(texts),
+        "transformer": {
+            "accuracy": accuracy_score(labels, transformer_labels),
+            "f1": f1_score(labels, transformer_labels, average='weighted'),
+            "ms_per_text": transformer_ms,
+        },
+        "fast_model_ms_per_text": fast_ms,
+        "thresholds": [],
+    }
+    for threshold in REPORT_THRESHOLDS:
+        answered = confidence >= threshold
+        cascade_labels = np.where(answered, fast_labels, np.array(transformer_labels, dtype=object))
+        coverage = float(answered.mean())
+        report["thresholds"].append({
+            "threshold": threshold,
+            "fast_coverage": coverage,
+            "fast_accuracy_on_covered": accuracy_score(np.array(labels)[answered], fast_labels[answered]) if answered.any() else None,
+            "accuracy": accuracy_score(labels, cascade_labels),
+            "f1": f1_score(labels, cascade_labels, average='weighted'),
+            # 모든 문장이 가벼운 모델을 거치고, 확신이 낮은 문장만 트랜스포머를 추가로 거침
+            "ms_per_text": fast_ms + (1 - coverage) * transformer_ms,
+        })
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="cascade용 가벼운 분류기 학습 및 임계값 리포트")
+    parser.add_argument("--train-glob", default="./02/*.json")
+    parser.add_argument("--validation-glob", default="./Validation/02/*.json")
+    parser.add_argument("--output", default=os.path.join(script_directory, "cascade_model.joblib"))
+    parser.add_argument("--model-dir", default=os.path.join(script_directory, "my_best_model"),
+                        help="리포트에서 비교할 트랜스포머 모델 폴더")
+    parser.add_argument("--limit", type=int, default=2000, help="리포트에 사용할 최대 검증 샘플 수 (0이면 전체)")
+    parser.add_argument("--no-report", action="store_true", help="학습만 하고 임계값 리포트는 생략")
+    args = parser.parse_args()
+
+    train_texts, train_labels = load_labeled_texts(args.train_glob)
+    print(f"⏳ 가벼운 모델 학습 중... (훈련 데이터 {len(train_texts)}개)")
+    pipeline = train_fast_model(train_texts, train_labels)
+    joblib.dump(pipeline, args.output)
+    print(f"✅ 모델 저장: {args.output}")
+
+    if not args.no_report:
+        texts, labels = load_labeled_texts(args.validation_glob, args.limit)
+        report = threshold_report(pipeline, args.model_dir, texts, labels)
+        report_path = os.path.join(os.path.dirname(os.path.abspath(args.output)), "cascade_report.json")
+        with open(report_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+        print(f"✅ 임계값 리포트 저장: {report_path}")
@@ -0,0 +1,138 @@
+"""채팅방 단위 웹소켓 연결 관리
+
+연결을 방(room)별 집합으로 관리해 브로드캐스트 비용이 전체 접속자 수가 아니라 방 인원에 비례합니다.
+클라이언트마다 크기가 제한된 송신 큐와 전용 송신 태스크를 두어, 브로드캐스트는 큐에 넣기만 하고
+바로 반환합니다. 느린 클라이언트 하나가 다른 클라이언트의 전송을 막지 않으며,
+송신 큐가 가득 차거나 send가 send_timeout을 넘기면 해당 클라이언트를 연결 해제합니다.
+
+coalesce_ms를 지정하면 짧은 시간에 몰린 메시지를 {"type": "batch", "messages": [...]}
+프레임 하나로 묶어 보냅니다.
+"""
+
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional, Set
+
+from fastapi import WebSocket
+
+logger = logging.getLogger(__name__)
+
+# 느린 클라이언트 연결 해제 시 사용하는 종료 코드 (Try Again Later)
+SLOW_CONSUMER_CLOSE_CODE = 1013
+# 전송 중 오류로 연결 해제 시 사용하는 종료 코드 (Internal Error)
+SEND_ERROR_CLOSE_CODE = 1011
+
+
+class ClientConnection:
+    def __init__(self, websocket: WebSocket, room: str, max_outbound: int):
+        self.websocket = websocket
+        self.room = room
+        self.outbound: asyncio.Queue = asyncio.Queue(maxsize=max_outbound)
+        self.sender: Optional[asyncio.Task] = None
+
+
+class ConnectionManager:
+    def __init__(self, max_outbound: int = 64, send_timeout: float = 5.0,
+                 coalesce_ms: float = 0.0, max_coalesce: int = 32):
+        self.max_outbound = max_outbound
+        self.send_timeout = send_timeout
+        self.coalesce = coalesce_ms / 1000
+        self.max_coalesce = max_coalesce
+        self.rooms: Dict[str, Set[ClientConnection]] = {}
+        self.clients: Dict[WebSocket, ClientConnection] = {}
+
+        # 통계
+        self._delivered = 0
+        self._frames = 0
+        self._evicted = 0
+
+    async def connect(self, websocket: WebSocket, room: str):
+        await websocket.accept()
+        client = ClientConnection(websocket, room, self.max_outbound)
+        self.clients[websocket] = client
+        self.rooms.setdefault(room, set()).add(client)
+        client.sender = asyncio.create_task(self._send_loop(client))
+
+    def disconnect(self, websocket: WebSocket):
+        """연결을 방과 목록에서 제거합니다. 이미 제거된 연결이면 아무것도 하지 않습니다."""
+        client = self.clients.pop(websocket, None)
+        if client is None:
+            return
+        members = self.rooms.get(client.room)
+        if members is not None:
+            members.discard(client)
+            if not members:
+                del self.rooms[client.room]
+        if client.sender is not None and client.sender is not asyncio.current_task():
+            client.sender.cancel()
+
+    async def send_personal(self, websocket: WebSocket, message: dict):
+        """보낸 사람에게만 메시지를 보냅니다. 브로드캐스트와 같은 큐를 거쳐 순서가 유지됩니다."""
+        client = self.clients.get(websocket)
+        if client is not None:
+            self._enqueue(client, message)
+
+    async def broadcast(self, message: dict, room: str):
+        """같은 방의 모든 클라이언트 송신 큐에 메시지를 넣습니다. 전송 완료를 기다리지 않습니다."""
+        for client in list(self.rooms.get(room, ())):
+            self._enqueue(client, message)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "connections": len(self.clients),
+            "rooms": len(self.rooms),
+            "largest_room": max((len(members) for members in self.rooms.values()), default=0),
+            "queued_messages": sum(client.outbound.qsize() for client in self.clients.values()),
+            "delivered_messages": self._delivered,
+            "frames": self._frames,
+            "evicted": self._evicted,
+        }
+
+    def _enqueue(self, client: ClientConnection, message: dict):
+        try:
+            client.outbound.put_nowait(message)
+        except asyncio.QueueFull:
+            self._evict(client, "송신 큐 가득 참")
+
+    def _evict(self, client: ClientConnection, reason: str):
+        """따라오지 못하는 클라이언트를 연결 해제합니다."""
+        if client.websocket not in self.clients:
+            return
+        self._evicted += 1
+        logger.warning(f"느린 클라이언트 연결 해제 (room={client.room}): {reason}")
+        self.disconnect(client.websocket)
+        asyncio.create_task(self._close(client.websocket))
+
+    async def _close(self, websocket: WebSocket, code: int = SLOW_CONSUMER_CLOSE_CODE):
+        try:
+            await websocket.close(code=code)
+        except Exception:
+            # 이미 끊긴 연결
+            pass
+
+    async def _next_messages(self, client: ClientConnection) -> List[dict]:
+        """다음 프레임에 담을 메시지를 꺼냅니다. coalesce가 켜져 있으면 짧은 시간 동안 모인 메시지를 함께 꺼냅니다."""
+        messages: List[dict] = [await client.outbound.get()]
+        if self.coalesce > 0:
+            await asyncio.sleep(self.coalesce)
+            while len(messages) < self.max_coalesce and not client.outbound.empty():
+                messages.append(client.outbound.get_nowait())
+        return messages
+
+    async def _send_loop(self, client: ClientConnection):
+        while True:
+            messages = await self._next_messages(client)
+            frame = messages[0] if len(messages) == 1 else {"type": "batch", "messages": messages}
+            try:
+                await asyncio.wait_for(client.websocket.send_json(frame), self.send_timeout)
+            except asyncio.TimeoutError:
+                self._evict(client, f"전송 시간 초과 ({self.send_timeout}초)")
+                return
+            except Exception as e:
+                # 소켓도 닫아 수신 루프가 끝나게 함 (등록이 풀린 뒤 받은 메시지의 응답이 조용히 버려지지 않도록)
+                logger.warning(f"전송 실패로 연결 해제 (room={client.room}): {e}")
+                self.disconnect(client.websocket)
+                await self._close(client.websocket, SEND_ERROR_CLOSE_CODE)
+                return
+            self._frames += 1
+            self._delivered += len(messages)
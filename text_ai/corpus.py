@@ -0,0 +1,50 @@
+"""공감 대화 JSON 말뭉치 로딩 모듈"""
+
+import json
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+
+def parse_conversation_file(file_path):
+    """JSON 파일 하나에서 [화자 문장, 청자 공감 라벨] 쌍을 뽑습니다."""
+    with open(file_path, 'r', encoding='utf-8') as f:
+        conversation = json.load(f)
+
+    pairs = []
+    utterances = conversation['utterances']
+    # 이전 코드와 동일한 로직으로 화자/청자 대화를 짝지어 줍니다.
+    for i in range(len(utterances) - 1):
+        if utterances[i]['role'] == 'speaker' and utterances[i+1]['role'] == 'listener':
+            speaker_text = utterances[i]['text']
+            # listener_empathy가 있으면 해당 라벨을, 없으면 '중립' 라벨을 부여
+            if utterances[i+1]['listener_empathy']:
+                label = utterances[i+1]['listener_empathy'][0]
+            else:
+                label = '중립' # 새로운 라벨 부여
+
+            pairs.append([speaker_text, label])
+    return pairs
+
+
+def create_dataframe_from_json(file_paths, processes: int = 1):
+    """
+    주어진 경로의 모든 JSON 파일을 읽어,
+    [대화문, 라벨] 형태의 Pandas DataFrame으로 만들어 반환합니다.
+    processes가 2 이상이면 파일 파싱을 프로세스 풀에 나눠 맡깁니다. (결과 순서는 파일 순서와 같음)
+    스크립트를 다시 import하지 않도록 fork를 사용하며, fork가 없는 환경(Windows)에서는 순차로 읽습니다.
+    """
+    file_paths = list(file_paths)
+    training_data = []
+    use_pool = processes > 1 and len(file_paths) > 1 and "fork" in multiprocessing.get_all_start_methods()
+    if use_pool:
+        chunksize = max(1, len(file_paths) // (processes * 8))
+        with ProcessPoolExecutor(max_workers=processes, mp_context=multiprocessing.get_context("fork")) as pool:
+            for pairs in pool.map(parse_conversation_file, file_paths, chunksize=chunksize):
+                training_data.extend(pairs)
+    else:
+        for file_path in file_paths:
+            training_data.extend(parse_conversation_file(file_path))
+
+    return pd.DataFrame(training_data, columns=['text', 'label'])
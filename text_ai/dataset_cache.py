@@ -0,0 +1,116 @@
+"""토큰화된 학습 데이터 디스크 캐시
+
+JSON 말뭉치를 파싱하고 토큰화한 결과를 패딩 없이 이어 붙여 .npy 파일로 저장하고,
+다음 실행부터는 파싱/토큰화 없이 메모리 매핑으로 바로 읽습니다.
+캐시 키는 입력 파일 목록(크기, 수정 시각), 토크나이저, max_length, 라벨 사전으로 만들어
+데이터나 설정이 바뀌면 새로 만듭니다.
+
+저장 구조 (cache_dir/<키>/):
+    input_ids.npy  모든 문장의 토큰 id를 이어 붙인 1차원 int32 배열
+    offsets.npy    문장 i의 토큰은 input_ids[offsets[i]:offsets[i + 1]]
+    labels.npy     라벨 id (int64)
+    meta.json      라벨 사전, 문장 수 등
+"""
+
+import hashlib
+import json
+import os
+from typing import Dict, List, Optional
+
+import numpy as np
+import torch
+
+from corpus import create_dataframe_from_json
+
+TOKENIZE_CHUNK_SIZE = 10000
+
+
+def cache_fingerprint(file_paths: List[str], tokenizer_name: str, max_length: int,
+                      label_to_id: Optional[Dict[str, int]]) -> str:
+    digest = hashlib.sha1()
+    for path in sorted(file_paths):
+        stat = os.stat(path)
+        digest.update(f"{os.path.abspath(path)}|{stat.st_size}|{stat.st_mtime_ns}\n".encode("utf-8"))
+    digest.update(f"{tokenizer_name}|{max_length}|".encode("utf-8"))
+    digest.update(json.dumps(label_to_id, ensure_ascii=False, sort_keys=True).encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+class TokenizedDataset(torch.utils.data.Dataset):
+    """메모리 매핑된 캐시에서 패딩 없는 문장 하나씩을 꺼내는 데이터셋 (DataCollatorWithPadding과 함께 사용)"""
+
+    def __init__(self, cache_path: str):
+        self.cache_path = cache_path
+        self.input_ids = np.load(os.path.join(cache_path, "input_ids.npy"), mmap_mode="r")
+        self.offsets = np.load(os.path.join(cache_path, "offsets.npy"))
+        self.labels = np.load(os.path.join(cache_path, "labels.npy"))
+        with open(os.path.join(cache_path, "meta.json"), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        self.label_to_id: Dict[str, int] = meta["label_to_id"]
+        self.lengths = np.diff(self.offsets)
+
+    def __getitem__(self, idx):
+        ids = self.input_ids[self.offsets[idx]:self.offsets[idx + 1]].tolist()
+        return {
+            "input_ids": ids,
+            "attention_mask": [1] * len(ids),
+            "labels": int(self.labels[idx]),
+        }
+
+    def __len__(self):
+        return len(self.labels)
+
+
+def build_tokenized_cache(cache_path: str, texts: List[str], label_ids: List[int],
+                          tokenizer, max_length: int, label_to_id: Dict[str, int]):
+    """문장들을 나눠서 토큰화해 패딩 없이 이어 붙여 저장합니다."""
+    tmp_path = cache_path + ".tmp"
+    os.makedirs(tmp_path, exist_ok=True)
+
+    chunks = []
+    lengths = []
+    for start in range(0, len(texts), TOKENIZE_CHUNK_SIZE):
+        encodings = tokenizer(texts[start:start + TOKENIZE_CHUNK_SIZE], truncation=True, max_length=max_length)
+        for ids in encodings["input_ids"]:
+            chunks.append(np.asarray(ids, dtype=np.int32))
+            lengths.append(len(ids))
+
+    offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    np.save(os.path.join(tmp_path, "input_ids.npy"),
+            np.concatenate(chunks) if chunks else np.zeros(0, dtype=np.int32))
+    np.save(os.path.join(tmp_path, "offsets.npy"), offsets)
+    np.save(os.path.join(tmp_path, "labels.npy"), np.asarray(label_ids, dtype=np.int64))
+    with open(os.path.join(tmp_path, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump({"label_to_id": label_to_id, "samples": len(lengths), "max_length": max_length},
+                  f, ensure_ascii=False, indent=2)
+    # 중간에 실패한 캐시를 읽지 않도록 완성된 뒤 이름을 바꿈
+    os.replace(tmp_path, cache_path)
+
+
+def load_or_build(file_paths: List[str], tokenizer, cache_dir: str, max_length: int = 128,
+                  label_to_id: Optional[Dict[str, int]] = None, processes: int = 1) -> TokenizedDataset:
+    """캐시가 있으면 바로 읽고, 없으면 JSON 파싱(프로세스 풀) → 토큰화 → 저장 후 읽습니다.
+
+    label_to_id가 없으면 데이터에 나온 순서대로 라벨 사전을 만듭니다(훈련 데이터).
+    검증 데이터에는 훈련 데이터의 라벨 사전을 넘기며, 사전에 없는 라벨의 문장은 제외합니다.
+    """
+    key = cache_fingerprint(file_paths, tokenizer.name_or_path, max_length, label_to_id)
+    cache_path = os.path.join(cache_dir, key)
+    if os.path.isdir(cache_path):
+        print(f"✅ 토큰화 캐시 사용: {cache_path}")
+        return TokenizedDataset(cache_path)
+
+    print(f"⏳ JSON {len(file_paths)}개 파싱 및 토큰화 중... (캐시: {cache_path})")
+    df = create_dataframe_from_json(file_paths, processes=processes)
+    if label_to_id is None:
+        label_to_id = {label: i for i, label in enumerate(df['label'].unique().tolist())}
+    known = df['label'].isin(label_to_id)
+    if not known.all():
+        print(f"⚠️ 라벨 사전에 없는 문장 {int((~known).sum())}개를 제외합니다.")
+        df = df[known]
+
+    os.makedirs(cache_dir, exist_ok=True)
+    build_tokenized_cache(cache_path, list(df['text']), list(df['label'].map(label_to_id)),
+                          tokenizer, max_length, label_to_id)
+    return TokenizedDataset(cache_path)
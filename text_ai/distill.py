@@ -0,0 +1,267 @@
+"""지식 증류: 큰 모델(teacher)의 soft logits로 작은 모델(student) 훈련
+
+text_cla.py로 훈련한 klue/roberta-large 크기의 모델(my_best_model)을 teacher로,
+층 수와 hidden 크기가 작은 모델을 student로 두고 같은 말뭉치에서
+  loss = alpha * T^2 * KL(student/T || teacher/T) + (1 - alpha) * CE(student, 정답 라벨)
+로 훈련합니다. teacher logits는 한 번만 계산해 토큰화 캐시 옆에 저장하고 재사용합니다.
+
+평가는 text_cla.py와 같은 compute_metrics(metrics.py)를 사용하며,
+student는 app.py가 그대로 읽을 수 있는 폴더(config, 토크나이저, 가중치)로 저장됩니다.
+
+사용 예:
+    python distill.py --teacher-dir my_best_model --student-name klue/roberta-small --output-dir my_student_model
+    TEXT_AI_MODEL_PATH=my_student_model python app.py
+"""
+
+import argparse
+import glob
+import hashlib
+import json
+import os
+
+import numpy as np
+import torch
+import torch.nn.functional as F
+from transformers import (
+    AutoConfig,
+    AutoModelForSequenceClassification,
+    AutoTokenizer,
+    DataCollatorWithPadding,
+    EarlyStoppingCallback,
+    Trainer,
+    TrainingArguments,
+)
+
+from dataset_cache import TokenizedDataset, load_or_build
+from inference import MAX_LENGTH, id_to_label, label_to_id
+from length_trainer import LengthGroupedTrainer
+from metrics import compute_metrics
+
+script_directory = os.path.dirname(os.path.abspath(__file__))
+
+
+class DistillationDataset(torch.utils.data.Dataset):
+    """토큰화 캐시의 각 문장에 teacher logits를 붙여 돌려줍니다."""
+
+    def __init__(self, dataset: TokenizedDataset, teacher_logits: np.ndarray):
+        self.dataset = dataset
+        self.teacher_logits = teacher_logits
+        self.lengths = dataset.lengths
+
+    def __getitem__(self, idx):
+        item = self.dataset[idx]
+        item["teacher_logits"] = self.teacher_logits[idx].tolist()
+        return item
+
+    def __len__(self):
+        return len(self.dataset)
+
+
+class DistillationTrainer(LengthGroupedTrainer):
+    def __init__(self, *args, temperature: float = 2.0, alpha: float = 0.5, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.temperature = temperature
+        self.alpha = alpha
+
+    def compute_loss(self, model, inputs, return_outputs=False, **kwargs):
+        # 검증 데이터에는 teacher logits가 없으므로 정답 라벨 손실만 계산
+        teacher_logits = inputs.pop("teacher_logits", None)
+        outputs = model(**inputs)
+        loss = outputs.loss
+        if teacher_logits is not None:
+            t = self.temperature
+            distill_loss = F.kl_div(
+                F.log_softmax(outputs.logits / t, dim=-1),
+                F.softmax(teacher_logits.to(outputs.logits.dtype) / t, dim=-1),
+                reduction="batchmean",
+            ) * (t * t)
+            loss = self.alpha * distill_loss + (1 - self.alpha) * loss
+        return (loss, outputs) if return_outputs else loss
+
+
+def teacher_logits_path(dataset: TokenizedDataset, teacher_dir: str) -> str:
+    config_path = os.path.join(teacher_dir, "config.json")
+    key = f"{os.path.abspath(teacher_dir)}|{os.stat(config_path).st_mtime_ns}"
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:12]
+    return os.path.join(dataset.cache_path, f"teacher_logits_{digest}.npy")
+
+
+def compute_teacher_logits(teacher, tokenizer, dataset: TokenizedDataset, batch_size: int) -> np.ndarray:
+    """teacher를 한 번 돌려 모든 훈련 문장의 logits를 계산합니다 (길이순 배치)."""
+    device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+    teacher.to(device)
+    teacher.eval()
+    collator = DataCollatorWithPadding(tokenizer=tokenizer)
+    order = np.argsort(dataset.lengths, kind="stable")
+    logits = np.zeros((len(dataset), teacher.config.num_labels), dtype=np.float32)
+    with torch.no_grad():
+        for start in range(0, len(order), batch_size):
+            bucket = order[start:start + batch_size]
+            features = []
+            for i in bucket:
+                item = dataset[int(i)]
+                item.pop("labels")
+                features.append(item)
+            inputs = {key: value.to(device) for key, value in collator(features).items()}
+            logits[bucket] = teacher(**inputs).logits.float().cpu().numpy()
+            if start // batch_size % 100 == 0:
+                print(f"   teacher logits {start + len(bucket)}/{len(dataset)}")
+    return logits
+
+
+def load_teacher_logits(teacher_dir: str, tokenizer, dataset: TokenizedDataset, batch_size: int) -> np.ndarray:
+    path = teacher_logits_path(dataset, teacher_dir)
+    if os.path.exists(path):
+        print(f"✅ teacher logits 캐시 사용: {path}")
+        return np.load(path, mmap_mode="r")
+    print("⏳ teacher logits 계산 중...")
+    teacher = AutoModelForSequenceClassification.from_pretrained(teacher_dir)
+    logits = compute_teacher_logits(teacher, tokenizer, dataset, batch_size)
+    np.save(path, logits)
+    del teacher
+    return logits
+
+
+def teacher_label_columns(teacher_dir: str, teacher_labels=None) -> np.ndarray:
+    """서빙 라벨 순서(inference.id_to_label)대로 teacher logits의 열 번호를 돌려줍니다.
+
+    text_cla.py는 데이터에 나온 순서로 라벨 id를 정하고 '중립' 같은 라벨이 더 있을 수 있으므로,
+    teacher config의 label2id(또는 --teacher-labels)로 열을 맞춥니다. teacher에만 있는 라벨의 열은 버립니다.
+    """
+    config = AutoConfig.from_pretrained(teacher_dir)
+    if teacher_labels:
+        if len(teacher_labels) != config.num_labels:
+            raise ValueError(f"--teacher-labels는 {len(teacher_labels)}개지만 teacher 라벨 수는 {config.num_labels}개입니다.")
+        teacher_label2id = {label: i for i, label in enumerate(teacher_labels)}
+    else:
+        teacher_label2id = dict(config.label2id)
+    missing = [label for label in label_to_id if label not in teacher_label2id]
+    if missing:
+        raise ValueError(
+            f"teacher 라벨 {list(teacher_label2id)}에 {missing}이(가) 없습니다. "
+            f"text_cla.py가 출력한 '라벨 -> ID 맵핑' 순서를 --teacher-labels로 지정하세요."
+        )
+    extra = sorted(set(teacher_label2id) - set(label_to_id))
+    if extra:
+        print(f"⚠️ teacher에만 있는 라벨 {extra}은 증류에서 제외합니다 (나머지 라벨끼리 softmax)")
+    return np.array([teacher_label2id[id_to_label[i]] for i in range(len(id_to_label))], dtype=np.int64)
+
+
+def build_student(student_name: str, num_layers: int, hidden_size: int, from_scratch: bool):
+    """사전학습된 작은 모델을 쓰거나, 지정한 크기로 새로 만든 모델을 student로 씁니다."""
+    config = AutoConfig.from_pretrained(student_name, num_labels=len(id_to_label),
+                                        id2label=dict(id_to_label), label2id=dict(label_to_id))
+    if num_layers:
+        config.num_hidden_layers = num_layers
+    if hidden_size:
+        config.hidden_size = hidden_size
+        config.intermediate_size = hidden_size * 4
+        from_scratch = True  # 사전학습 가중치와 크기가 달라 새로 초기화
+    if from_scratch:
+        return AutoModelForSequenceClassification.from_config(config)
+    return AutoModelForSequenceClassification.from_pretrained(student_name, config=config)
+
+
+def count_parameters(model) -> int:
+    return sum(p.numel() for p in model.parameters())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="teacher soft logits로 작은 공감 분류 모델 증류")
+    parser.add_argument("--teacher-dir", default=os.path.join(script_directory, "my_best_model"))
+    parser.add_argument("--student-name", default="klue/roberta-small",
+                        help="student 구조/가중치를 가져올 모델 (teacher와 같은 토크나이저여야 함)")
+    parser.add_argument("--num-layers", type=int, default=0, help="student 층 수 (0이면 student-name 설정 그대로)")
+    parser.add_argument("--hidden-size", type=int, default=0, help="student hidden 크기 (지정하면 새로 초기화)")
+    parser.add_argument("--from-scratch", action="store_true", help="사전학습 가중치 없이 초기화")
+    parser.add_argument("--teacher-labels", type=lambda value: value.split(","), default=None,
+                        help="teacher 라벨 순서 (쉼표 구분, 예: 위로,격려,조언,동조). teacher config에 라벨 이름이 없을 때 필요")
+    parser.add_argument("--output-dir", default=os.path.join(script_directory, "my_student_model"))
+    parser.add_argument("--train-glob", default="./02/*.json")
+    parser.add_argument("--validation-glob", default="./Validation/02/*.json")
+    parser.add_argument("--cache-dir", default="./tokenized_cache")
+    parser.add_argument("--temperature", type=float, default=2.0)
+    parser.add_argument("--alpha", type=float, default=0.5, help="증류 손실 비중 (나머지는 정답 라벨 손실)")
+    parser.add_argument("--epochs", type=float, default=5)
+    parser.add_argument("--learning-rate", type=float, default=5e-5)
+    parser.add_argument("--batch-size", type=int, default=64)
+    args = parser.parse_args()
+
+    tokenizer = AutoTokenizer.from_pretrained(args.teacher_dir)
+    student_tokenizer = AutoTokenizer.from_pretrained(args.student_name)
+    if student_tokenizer.get_vocab() != tokenizer.get_vocab():
+        raise ValueError(f"student({args.student_name})와 teacher의 토크나이저 어휘가 다릅니다.")
+
+    processes = os.cpu_count() or 1
+    # 서빙 라벨 순서(inference.id_to_label)를 teacher와 student가 함께 사용
+    train_data = load_or_build(glob.glob(args.train_glob), tokenizer, args.cache_dir, MAX_LENGTH,
+                               label_to_id=label_to_id, processes=processes)
+    val_dataset = load_or_build(glob.glob(args.validation_glob), tokenizer, args.cache_dir, MAX_LENGTH,
+                                label_to_id=label_to_id, processes=processes)
+    # 라벨 열을 먼저 확인해, 라벨이 맞지 않으면 teacher logits 계산 전에 멈춤
+    columns = teacher_label_columns(args.teacher_dir, args.teacher_labels)
+    teacher_logits = load_teacher_logits(args.teacher_dir, tokenizer, train_data, args.batch_size * 2)
+    teacher_logits = np.ascontiguousarray(teacher_logits[:, columns])
+    train_dataset = DistillationDataset(train_data, teacher_logits)
+
+    student = build_student(args.student_name, args.num_layers, args.hidden_size, args.from_scratch)
+    print(f"✅ student 파라미터 수: {count_parameters(student) / 1e6:.1f}M")
+
+    training_args = TrainingArguments(
+        output_dir='./distill_results',
+        num_train_epochs=args.epochs,
+        per_device_train_batch_size=args.batch_size,
+        per_device_eval_batch_size=args.batch_size,
+        logging_dir='./logs',
+        logging_steps=50,
+        evaluation_strategy="epoch",
+        save_strategy="epoch",
+        learning_rate=args.learning_rate,
+        load_best_model_at_end=True,
+        metric_for_best_model="f1",
+        save_total_limit=1,
+        weight_decay=0.01,
+        group_by_length=True,
+        # teacher_logits를 모델 입력으로 넘기지 않고 compute_loss에서 꺼내 씀
+        remove_unused_columns=False,
+    )
+    trainer = DistillationTrainer(
+        model=student,
+        args=training_args,
+        train_dataset=train_dataset,
+        eval_dataset=val_dataset,
+        compute_metrics=compute_metrics,
+        tokenizer=tokenizer,
+        data_collator=DataCollatorWithPadding(tokenizer=tokenizer),
+        callbacks=[EarlyStoppingCallback(early_stopping_patience=2)],
+        temperature=args.temperature,
+        alpha=args.alpha,
+    )
+    trainer.train()
+
+    student_metrics = trainer.evaluate()
+    teacher = AutoModelForSequenceClassification.from_pretrained(args.teacher_dir)
+    # teacher 예측도 서빙 라벨 순서로 열을 맞춘 뒤 평가
+    teacher_output = Trainer(
+        model=teacher, args=training_args, data_collator=DataCollatorWithPadding(tokenizer=tokenizer),
+    ).predict(val_dataset)
+    teacher_metrics = {f"eval_{key}": value for key, value in
+                       compute_metrics((teacher_output.predictions[:, columns], teacher_output.label_ids)).items()}
+
+    # app.py가 TEXT_AI_MODEL_PATH로 바로 읽을 수 있는 형식으로 저장
+    trainer.save_model(args.output_dir)
+    tokenizer.save_pretrained(args.output_dir)
+
+    report = {
+        "teacher": {"parameters": count_parameters(teacher), "f1": teacher_metrics["eval_f1"],
+                    "accuracy": teacher_metrics["eval_accuracy"]},
+        "student": {"parameters": count_parameters(trainer.model), "f1": student_metrics["eval_f1"],
+                    "accuracy": student_metrics["eval_accuracy"]},
+        "temperature": args.temperature,
+        "alpha": args.alpha,
+    }
+    report["f1_delta"] = report["student"]["f1"] - report["teacher"]["f1"]
+    with open(os.path.join(args.output_dir, "distill_report.json"), "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+    print(f"✅ student 모델 저장: {args.output_dir} (지연 시간 비교: python benchmark.py --model-dir {args.output_dir})")
@@ -0,0 +1,132 @@
+"""CPU 서빙용 모델 내보내기 및 정확도/속도 비교
+
+my_best_model(fp32)을 Linear 레이어 동적 int8 양자화 모델로 변환해 저장하고,
+text_cla.py와 같은 검증 데이터(Validation/02/*.json)로 fp32 대비 정확도/F1 차이와 지연 시간을 비교합니다.
+
+사용 예:
+    python export_model.py --model-dir my_best_model --output-dir my_best_model_int8 \
+        --validation-glob "./Validation/02/*.json"
+
+서빙 시에는 TEXT_AI_MODEL_FORMAT=int8 로 app.py를 실행하면 output-dir의 모델을 불러옵니다.
+"""
+
+import argparse
+import glob
+import json
+import os
+import time
+
+import numpy as np
+import torch
+from sklearn.metrics import accuracy_score, f1_score
+
+from corpus import create_dataframe_from_json
+from inference import (
+    QUANTIZED_WEIGHTS_NAME,
+    label_to_id,
+    load_classifier,
+    predict_logits,
+    quantize_model,
+)
+
+script_directory = os.path.dirname(os.path.abspath(__file__))
+
+
+def export_quantized(model_dir: str, output_dir: str):
+    """fp32 모델을 동적 int8 양자화해 config, 토크나이저와 함께 저장합니다."""
+    tokenizer, model = load_classifier(model_dir, "fp32")
+    quantized = quantize_model(model)
+
+    os.makedirs(output_dir, exist_ok=True)
+    model.config.save_pretrained(output_dir)
+    tokenizer.save_pretrained(output_dir)
+    torch.save(quantized.state_dict(), os.path.join(output_dir, QUANTIZED_WEIGHTS_NAME))
+
+    fp32_size = sum(p.numel() * p.element_size() for p in model.parameters())
+    int8_size = os.path.getsize(os.path.join(output_dir, QUANTIZED_WEIGHTS_NAME))
+    print(f"✅ 양자화 모델 저장 완료: {output_dir}")
+    print(f"   가중치 크기: {fp32_size / 1024 ** 2:.1f}MB -> {int8_size / 1024 ** 2:.1f}MB")
+
+
+def evaluate(tokenizer, model, texts, labels, batch_size: int, max_length: int):
+    """배치 단위로 예측해 정확도/F1과 처리 시간을 측정합니다."""
+    predictions = []
+    start = time.perf_counter()
+    for i in range(0, len(texts), batch_size):
+        logits = predict_logits(tokenizer, model, texts[i:i + batch_size], max_length=max_length)
+        predictions.extend(logits.argmax(dim=-1).tolist())
+    elapsed = time.perf_counter() - start
+
+    return {
+        "accuracy": accuracy_score(y_true=labels, y_pred=predictions),
+        "f1": f1_score(y_true=labels, y_pred=predictions, average='weighted'),
+        "texts_per_sec": len(texts) / elapsed,
+    }
+
+
+def single_latency_ms(tokenizer, model, texts, max_length: int, repeats: int = 50):
+    """한 문장씩 처리할 때의 지연 시간(p50/p99, ms)을 측정합니다."""
+    predict_logits(tokenizer, model, texts[:1], max_length=max_length)  # warmup
+    latencies = []
+    for i in range(repeats):
+        start = time.perf_counter()
+        predict_logits(tokenizer, model, [texts[i % len(texts)]], max_length=max_length)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return {"p50": float(np.percentile(latencies, 50)), "p99": float(np.percentile(latencies, 99))}
+
+
+def parity_report(model_dir: str, quantized_dir: str, validation_glob: str,
+                  limit: int, batch_size: int, max_length: int):
+    """fp32 모델과 int8 모델의 정확도/F1 차이와 속도 향상을 비교합니다."""
+    validate_df = create_dataframe_from_json(glob.glob(validation_glob))
+    # 서빙 라벨(격려/위로/동조/조언)에 없는 라벨은 비교에서 제외
+    validate_df = validate_df[validate_df['label'].isin(label_to_id)]
+    if limit:
+        validate_df = validate_df.sample(n=min(limit, len(validate_df)), random_state=42)
+    if len(validate_df) == 0:
+        raise ValueError(f"검증 데이터가 없습니다: {validation_glob}")
+
+    texts = list(validate_df['text'])
+    labels = list(validate_df['label'].map(label_to_id))
+
+    report = {"samples": len(texts), "batch_size": batch_size}
+    for name, path, model_format in (("fp32", model_dir, "fp32"), ("int8", quantized_dir, "int8")):
+        print(f"⏳ {name} 모델 평가 중...")
+        tokenizer, model = load_classifier(path, model_format)
+        report[name] = evaluate(tokenizer, model, texts, labels, batch_size, max_length)
+        report[name]["latency_ms"] = single_latency_ms(tokenizer, model, texts, max_length)
+
+    report["delta"] = {
+        "accuracy": report["int8"]["accuracy"] - report["fp32"]["accuracy"],
+        "f1": report["int8"]["f1"] - report["fp32"]["f1"],
+        "throughput_speedup": report["int8"]["texts_per_sec"] / report["fp32"]["texts_per_sec"],
+        "p50_latency_speedup": report["fp32"]["latency_ms"]["p50"] / report["int8"]["latency_ms"]["p50"],
+    }
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="CPU 서빙용 동적 int8 양자화 모델 내보내기")
+    parser.add_argument("--model-dir", default=os.path.join(script_directory, "my_best_model"))
+    parser.add_argument("--output-dir", default=os.path.join(script_directory, "my_best_model_int8"))
+    parser.add_argument("--validation-glob", default=None,
+                        help="검증용 JSON 파일 패턴 (예: ./Validation/02/*.json). 지정하면 비교 리포트를 생성합니다.")
+    parser.add_argument("--limit", type=int, default=2000, help="비교에 사용할 최대 검증 샘플 수 (0이면 전체)")
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--max-length", type=int, default=128)
+    parser.add_argument("--threads", type=int, default=None, help="torch 연산 스레드 수")
+    args = parser.parse_args()
+
+    if args.threads:
+        torch.set_num_threads(args.threads)
+
+    export_quantized(args.model_dir, args.output_dir)
+
+    if args.validation_glob:
+        report = parity_report(args.model_dir, args.output_dir, args.validation_glob,
+                               args.limit, args.batch_size, args.max_length)
+        report_path = os.path.join(args.output_dir, "parity_report.json")
+        with open(report_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+        print(f"✅ 비교 리포트 저장: {report_path}")
@@ -0,0 +1,108 @@
+"""공감 유형 분류 모델 로딩/추론 공통 모듈
+
+app.py(서빙)와 export_model.py(내보내기/검증)에서 같은 방식으로 모델을 불러오고 예측합니다.
+"""
+
+import os
+from typing import List, Tuple
+
+import torch
+from transformers import AutoConfig, AutoTokenizer, AutoModelForSequenceClassification
+
+# 라벨 정보 (훈련 시 사용했던 라벨과 순서가 같아야 함)
+id_to_label = {
+    0: '격려',
+    1: '위로',
+    2: '동조',
+    3: '조언'
+}
+label_to_id = {label: class_id for class_id, label in id_to_label.items()}
+UNKNOWN_LABEL = "알 수 없는 라벨"
+
+# 훈련(text_cla.py)과 같은 최대 토큰 길이
+MAX_LENGTH = 128
+
+# 동적 int8 양자화 모델의 가중치 파일 이름 (config/토크나이저는 같은 폴더에 함께 저장)
+QUANTIZED_WEIGHTS_NAME = "quantized_int8.pt"
+
+
+def quantize_model(model):
+    """Linear 레이어를 동적 int8 양자화한 CPU 추론용 모델을 반환합니다."""
+    return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+def is_quantized_model_dir(model_path: str) -> bool:
+    return os.path.isfile(os.path.join(model_path, QUANTIZED_WEIGHTS_NAME))
+
+
+def load_classifier(model_path: str, model_format: str = "fp32",
+                    local_files_only: bool = False) -> Tuple[AutoTokenizer, torch.nn.Module]:
+    """토크나이저와 분류 모델을 로드합니다.
+
+    model_format이 'int8'이면 export_model.py로 만든 동적 양자화 가중치를 불러옵니다.
+    local_files_only이면 네트워크/HF 캐시를 확인하지 않고 로컬 폴더에서만 읽습니다.
+    (safetensors 가중치는 메모리 매핑으로 읽힘)
+    """
+    tokenizer = AutoTokenizer.from_pretrained(model_path, local_files_only=local_files_only)
+
+    if model_format == "int8":
+        # 양자화 모듈 구조를 먼저 만든 뒤 저장된 int8 가중치를 채움
+        config = AutoConfig.from_pretrained(model_path, local_files_only=local_files_only)
+        model = quantize_model(AutoModelForSequenceClassification.from_config(config))
+        weights_path = os.path.join(model_path, QUANTIZED_WEIGHTS_NAME)
+        try:
+            state_dict = torch.load(weights_path, map_location="cpu", mmap=True)
+        except (TypeError, RuntimeError):
+            # mmap을 지원하지 않는 torch 버전/파일 형식
+            state_dict = torch.load(weights_path, map_location="cpu")
+        model.load_state_dict(state_dict)
+    elif model_format == "fp32":
+        model = AutoModelForSequenceClassification.from_pretrained(model_path, local_files_only=local_files_only)
+    else:
+        raise ValueError(f"지원하지 않는 모델 형식입니다: {model_format} (fp32 또는 int8)")
+
+    model.eval()
+    return tokenizer, model
+
+
+def predict_logits(tokenizer, model, texts: List[str], max_length: int = None) -> torch.Tensor:
+    """여러 문장을 패딩해 한 번의 forward로 logits를 계산합니다."""
+    inputs = tokenizer(texts, return_tensors="pt", truncation=True, padding=True, max_length=max_length)
+    with torch.no_grad():
+        return model(**inputs).logits
+
+
+def logits_to_labels(logits: torch.Tensor) -> List[str]:
+    return [id_to_label.get(class_id, UNKNOWN_LABEL) for class_id in logits.argmax(dim=-1).tolist()]
+
+
+def bucketed_logits(tokenizer, model, texts: List[str], batch_size: int = 32,
+                    max_length: int = MAX_LENGTH) -> torch.Tensor:
+    """길이가 비슷한 문장끼리 묶어 배치 추론하고 원래 순서대로 logits를 반환합니다.
+
+    전체를 한 번 토큰화해 길이순으로 정렬한 뒤 batch_size씩 잘라 패딩하므로,
+    배치마다 가장 긴 문장 길이까지만 패딩되어 낭비되는 토큰이 적습니다.
+    """
+    encodings = tokenizer(texts, truncation=True, max_length=max_length)
+    input_ids = encodings["input_ids"]
+    order = sorted(range(len(texts)), key=lambda i: len(input_ids[i]))
+
+    logits = None
+    for start in range(0, len(order), batch_size):
+        bucket = order[start:start + batch_size]
+        features = [{key: encodings[key][i] for key in encodings.keys()} for i in bucket]
+        inputs = tokenizer.pad(features, return_tensors="pt")
+        with torch.no_grad():
+            bucket_logits = model(**inputs).logits
+        if logits is None:
+            logits = bucket_logits.new_empty((len(texts), bucket_logits.shape[-1]))
+        logits[bucket] = bucket_logits
+    return logits
+
+
+def predict_bucketed(tokenizer, model, texts: List[str], batch_size: int = 32,
+                     max_length: int = MAX_LENGTH) -> List[str]:
+    """bucketed_logits로 추론해 원래 순서대로 라벨을 반환합니다."""
+    if not texts:
+        return []
+    return logits_to_labels(bucketed_logits(tokenizer, model, texts, batch_size, max_length))
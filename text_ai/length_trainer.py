@@ -0,0 +1,24 @@
+"""훈련/증류 공통 Trainer: 캐시에 저장된 문장 길이로 길이별 배치 묶기"""
+
+from transformers import Trainer
+from transformers.trainer_pt_utils import LengthGroupedSampler
+
+
+class LengthGroupedTrainer(Trainer):
+    """group_by_length일 때 train_dataset.lengths(토큰화 캐시의 문장별 토큰 수)로 배치를 묶습니다.
+
+    기본 Trainer는 lengths를 모르므로 데이터셋 전체를 한 번 읽어 길이를 다시 계산합니다.
+    """
+
+    def _get_train_sampler(self, *args, **kwargs):
+        # transformers 버전에 따라 train_dataset을 인자로 받기도 함
+        dataset = args[0] if args else kwargs.get("train_dataset")
+        if dataset is None:
+            dataset = self.train_dataset
+        lengths = getattr(dataset, "lengths", None)
+        if not self.args.group_by_length or lengths is None:
+            return super()._get_train_sampler(*args, **kwargs)
+        return LengthGroupedSampler(
+            self.args.train_batch_size * self.args.gradient_accumulation_steps,
+            lengths=lengths.tolist(),
+        )
@@ -0,0 +1,14 @@
+"""훈련/증류 공통 성능 지표"""
+
+import numpy as np
+from sklearn.metrics import accuracy_score, f1_score
+
+
+def compute_metrics(p):
+    pred, labels = p
+    pred = np.argmax(pred, axis=1)
+    
+    accuracy = accuracy_score(y_true=labels, y_pred=pred)
+    f1 = f1_score(y_true=labels, y_pred=pred, average='weighted')
+    
+    return {"accuracy": accuracy, "f1": f1}
@@ -0,0 +1,106 @@
+"""반복되는 채팅 메시지 분류 결과 캐시
+
+"ㅋㅋ", "고마워", "힘내"처럼 자주 반복되는 짧은 메시지는 모델을 다시 돌리지 않고 결과를 재사용합니다.
+공백/문장부호 차이를 정규화한 텍스트의 해시를 키로 쓰는 크기 제한 LRU 캐시와,
+시작 시 불러오는 고정 테이블(자주 쓰이는 메시지)을 함께 사용합니다.
+"""
+
+import hashlib
+import json
+import re
+import sys
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Any
+
+_WHITESPACE = re.compile(r"\s+")
+# 같은 문장부호가 반복되면 하나로 줄임 ("고마워!!!" -> "고마워!")
+_REPEATED_PUNCTUATION = re.compile(r"([^\w\s])\1+")
+
+
+def normalize_text(text: str) -> str:
+    """캐시 키를 위해 유니코드 정규화, 공백/반복 문장부호 축약, 소문자 변환을 합니다."""
+    text = unicodedata.normalize("NFKC", text).strip().lower()
+    text = _WHITESPACE.sub(" ", text)
+    return _REPEATED_PUNCTUATION.sub(r"\1", text)
+
+
+def cache_key(text: str) -> bytes:
+    """정규화한 텍스트의 16바이트 해시. 원문을 보관하지 않아 메모리가 일정합니다."""
+    return hashlib.blake2b(normalize_text(text).encode("utf-8"), digest_size=16).digest()
+
+
+class PredictionCache:
+    def __init__(self, max_entries: int = 50000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[bytes, str]" = OrderedDict()
+        self._pinned: Dict[bytes, str] = {}
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, text: str) -> Optional[str]:
+        key = cache_key(text)
+        with self._lock:
+            prediction = self._pinned.get(key)
+            if prediction is None:
+                prediction = self._entries.get(key)
+                if prediction is not None:
+                    self._entries.move_to_end(key)
+            if prediction is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+            return prediction
+
+    def put(self, text: str, prediction: str):
+        if self.max_entries <= 0:
+            return
+        key = cache_key(text)
+        with self._lock:
+            if key in self._pinned:
+                return
+            self._entries[key] = prediction
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def load_precomputed(self, path: str, predict_fn: Callable[[List[str]], List[str]],
+                         batch_size: int = 64) -> int:
+        """자주 쓰이는 메시지 테이블을 불러와 LRU에서 밀려나지 않는 고정 항목으로 등록합니다.
+
+        파일은 {"텍스트": "라벨"} 형태의 JSON 객체이거나, 텍스트 목록(JSON 배열)입니다.
+        목록이면 시작 시 predict_fn으로 한 번 분류해 채웁니다.
+        """
+        with open(path, "r", encoding="utf-8") as f:
+            table = json.load(f)
+
+        if isinstance(table, list):
+            texts = [str(text) for text in table]
+            predictions = []
+            for i in range(0, len(texts), batch_size):
+                predictions.extend(predict_fn(texts[i:i + batch_size]))
+            table = dict(zip(texts, predictions))
+
+        with self._lock:
+            for text, prediction in table.items():
+                self._pinned[cache_key(text)] = prediction
+        return len(table)
+
+    def stats(self) -> Dict[str, Any]:
+        """적중률과 대략적인 메모리 사용량을 반환합니다."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            key_bytes = sys.getsizeof(b"\0" * 16)
+            memory = (sys.getsizeof(self._entries) + sys.getsizeof(self._pinned)
+                      + key_bytes * (len(self._entries) + len(self._pinned)))
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "pinned_entries": len(self._pinned),
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_ratio": round(self._hits / lookups, 4) if lookups else 0.0,
+                "approx_memory_bytes": memory,
+            }
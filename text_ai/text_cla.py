@@ -4,15 +4,13 @@ os.environ["CUDA_VISIBLE_DEVICES"] = "0,1" # <-- 이 줄을 추가!
 import pandas as pd
 import torch
 import numpy as np
-from sklearn.metrics import accuracy_score, f1_score
 from transformers import (
     AutoTokenizer,
     AutoModelForSequenceClassification,
-    Trainer,
     TrainingArguments,
-    EarlyStoppingCallback
+    EarlyStoppingCallback,
+    DataCollatorWithPadding
 )
-import pandas as pd
 import json
 import glob # 여러 파일 경로를 한 번에 가져오기 위한 라이브러리
 
@@ -21,114 +19,65 @@ import glob # 여러 파일 경로를 한 번에 가져오기 위한 라이브
 train_json_files = glob.glob(r'./02/*.json')
 validate_json_files = glob.glob(r'./Validation/02/*.json')
 
-# --- 2. 여러 JSON 파일을 읽어 하나의 DataFrame으로 만드는 함수 ---
-def create_dataframe_from_json(file_paths):
-    """
-    주어진 경로의 모든 JSON 파일을 읽어,
-    [대화문, 라벨] 형태의 Pandas DataFrame으로 만들어 반환합니다.
-    """
-    training_data = []
-    for file_path in file_paths:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            conversation = json.load(f)
-        
-        utterances = conversation['utterances']
-        # 이전 코드와 동일한 로직으로 화자/청자 대화를 짝지어 줍니다.
-        for i in range(len(utterances) - 1):
-            if utterances[i]['role'] == 'speaker' and utterances[i+1]['role'] == 'listener':
-                speaker_text = utterances[i]['text']
-                # listener_empathy가 있으면 해당 라벨을, 없으면 '중립' 라벨을 부여
-                if utterances[i+1]['listener_empathy']:
-                    label = utterances[i+1]['listener_empathy'][0]
-                else:
-                    label = '중립' # 새로운 라벨 부여
-
-                training_data.append([speaker_text, label])
-                    
-    return pd.DataFrame(training_data, columns=['text', 'label'])
-
-# --- 3. 함수를 이용해 train / validate 데이터프레임 생성 ---
-train_df = create_dataframe_from_json(train_json_files)
-validate_df = create_dataframe_from_json(validate_json_files)
-
-print(f"훈련 데이터 개수: {len(train_df)}")
-print(f"검증 데이터 개수: {len(validate_df)}")
-print("\n--- 훈련 데이터 샘플 ---")
-print(train_df.head())
-print("\n--- 검증 데이터 샘플 ---")
-print(validate_df.head())
-# [3단계] ... train_df, validate_df 생성 후
-print("\n--- 훈련 데이터 라벨 분포 확인 ---")
-print(validate_df['label'].value_counts())
-
-# --- 4. 라벨을 숫자로 변환 (Label Encoding) ---
-# 훈련 데이터에 있는 모든 라벨을 기준으로 사전을 만듭니다.
-labels = train_df['label'].unique().tolist()
-label_to_id = {label: i for i, label in enumerate(labels)}
-id_to_label = {i: label for i, label in enumerate(labels)}
-
-# train_df와 validate_df 모두에 동일한 규칙을 적용합니다.
-train_df['label_id'] = train_df['label'].map(label_to_id)
-validate_df['label_id'] = validate_df['label'].map(label_to_id)
-# =================================================================
-# 1단계: 데이터 로드
-# =================================================================
-
-num_labels = len(labels)
-print(f"총 라벨 개수: {num_labels}")
-print(f"라벨 종류: {labels}")
-print(f"라벨 -> ID 맵핑: {label_to_id}")
-
+# 토큰화 결과를 저장해 두고 다음 실행부터 재사용할 폴더
+TOKENIZED_CACHE_DIR = './tokenized_cache'
+MAX_LENGTH = 128
+# JSON 파싱에 사용할 프로세스 수
+PARSE_PROCESSES = os.cpu_count() or 1
 
 # =================================================================
-# 3단계: 모델 및 토크나이저 준비
+# 1단계: 토크나이저 준비
 # =================================================================
-print("\n✅ 3단계: 모델 및 토크나이저를 준비합니다.")
 #MODEL_NAME = "monologg/koelectra-base-v3-discriminator"
 MODEL_NAME = "klue/roberta-large"
 tokenizer = AutoTokenizer.from_pretrained(MODEL_NAME)
-model = AutoModelForSequenceClassification.from_pretrained(MODEL_NAME, num_labels=num_labels)
 
+# --- 2. JSON 파싱(프로세스 풀) + 토큰화 결과를 디스크 캐시로 저장/재사용 (dataset_cache.py) ---
+# 패딩 없이 저장하고, 배치마다 가장 긴 문장 길이까지만 패딩합니다 (DataCollatorWithPadding).
+from dataset_cache import load_or_build
 
-# =================================================================
-# 4단계: 데이터셋 클래스 및 토큰화
-# =================================================================
-print("\n✅ 4단계: 파이토치 데이터셋을 생성합니다.")
-# 텍스트를 토큰화
-train_encodings = tokenizer(list(train_df['text']), truncation=True, padding=True, max_length=128)
-val_encodings = tokenizer(list(validate_df['text']), truncation=True, padding=True, max_length=128)
+train_dataset = load_or_build(train_json_files, tokenizer, TOKENIZED_CACHE_DIR, MAX_LENGTH,
+                              processes=PARSE_PROCESSES)
+# 훈련 데이터에 있는 모든 라벨을 기준으로 만든 사전을 검증 데이터에도 동일하게 적용합니다.
+label_to_id = train_dataset.label_to_id
+val_dataset = load_or_build(validate_json_files, tokenizer, TOKENIZED_CACHE_DIR, MAX_LENGTH,
+                            label_to_id=label_to_id, processes=PARSE_PROCESSES)
+
+labels = list(label_to_id.keys())
+id_to_label = {i: label for label, i in label_to_id.items()}
 
-# 파이토치 데이터셋 클래스 정의
-class EmpathyDataset(torch.utils.data.Dataset):
-    def __init__(self, encodings, labels):
-        self.encodings = encodings
-        self.labels = labels
+print(f"훈련 데이터 개수: {len(train_dataset)}")
+print(f"검증 데이터 개수: {len(val_dataset)}")
+print(f"훈련 문장 평균 토큰 수: {train_dataset.lengths.mean():.1f} (최대 {train_dataset.lengths.max()})")
+print("\n--- 검증 데이터 라벨 분포 확인 ---")
+for label_id, count in enumerate(np.bincount(val_dataset.labels, minlength=len(labels))):
+    print(f"{id_to_label[label_id]}: {count}")
+
+num_labels = len(labels)
+print(f"총 라벨 개수: {num_labels}")
+print(f"라벨 종류: {labels}")
+print(f"라벨 -> ID 맵핑: {label_to_id}")
 
-    def __getitem__(self, idx):
-        item = {key: torch.tensor(val[idx]) for key, val in self.encodings.items()}
-        item['labels'] = torch.tensor(self.labels[idx])
-        return item
 
-    def __len__(self):
-        return len(self.labels)
+# =================================================================
+# 4단계: 모델 준비 및 동적 패딩 설정
+# =================================================================
+print("\n✅ 4단계: 모델을 준비합니다.")
+# 라벨 이름을 config에 저장해 두면 distill.py가 teacher 라벨 순서를 확인할 수 있음
+model = AutoModelForSequenceClassification.from_pretrained(MODEL_NAME, num_labels=num_labels,
+                                                           id2label=id_to_label, label2id=label_to_id)
 
-# 데이터셋 객체 생성
-train_dataset = EmpathyDataset(train_encodings, list(train_df['label_id']))
-val_dataset = EmpathyDataset(val_encodings, list(validate_df['label_id']))
+# 배치마다 동적으로 패딩
+data_collator = DataCollatorWithPadding(tokenizer=tokenizer)
 
 
 # =================================================================
 # 5단계: 성능 지표 계산 함수 정의
 # =================================================================
 print("\n✅ 5단계: 성능 지표 계산 함수를 정의합니다.")
-def compute_metrics(p):
-    pred, labels = p
-    pred = np.argmax(pred, axis=1)
-    
-    accuracy = accuracy_score(y_true=labels, y_pred=pred)
-    f1 = f1_score(y_true=labels, y_pred=pred, average='weighted')
-    
-    return {"accuracy": accuracy, "f1": f1}
+# distill.py와 같은 지표를 쓰도록 metrics.py로 분리
+from metrics import compute_metrics
+from length_trainer import LengthGroupedTrainer
 
 
 # =================================================================
@@ -149,15 +98,18 @@ training_args = TrainingArguments(
     metric_for_best_model="f1",  # 최고 모델 선정 기준
     save_total_limit=1,
     weight_decay=0.01,
+    group_by_length=True,  # 길이가 비슷한 문장끼리 배치로 묶어 패딩 낭비를 줄임 (길이는 캐시에서 읽음)
+    dataloader_num_workers=2,
 )
 
-trainer = Trainer(
+trainer = LengthGroupedTrainer(
     model=model,
     args=training_args,
     train_dataset=train_dataset,
     eval_dataset=val_dataset,
     compute_metrics=compute_metrics,
     tokenizer=tokenizer,
+    data_collator=data_collator,
     callbacks=[EarlyStoppingCallback(early_stopping_patience=2)] # <-- 조기 종료 콜백 추
 )
 
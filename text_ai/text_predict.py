@@ -1,6 +1,14 @@
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+
 import torch
 from transformers import AutoTokenizer, AutoModelForSequenceClassification
-import os 
+
+from inference import MAX_LENGTH, bucketed_logits, id_to_label
 
 # =================================================================
 # 1. 로컬에 저장된 모델 및 토크나이저 불러오기 (최종 해결 버전)
@@ -10,7 +18,7 @@ print("✅ 로컬 모델을 불러옵니다...")
 try:
     # 현재 이 스크립트 파일(__file__)이 있는 폴더의 절대 경로를 가져옵니다.
     script_directory = os.path.dirname(os.path.abspath(__file__))
-    
+
     # 그 폴더 안에 있는 'my_best_model'의 전체 경로를 만듭니다.
     MODEL_PATH = os.path.join(script_directory, "my_best_model")
 
@@ -23,6 +31,10 @@ try:
 
     tokenizer = AutoTokenizer.from_pretrained(MODEL_PATH)
     model = AutoModelForSequenceClassification.from_pretrained(MODEL_PATH)
+    # 장치 이동은 한 번만
+    device = torch.device("cpu")
+    model.to(device)
+    model.eval()
     print("✅ 모델 로드 성공!")
 
 except Exception as e:
@@ -31,38 +43,172 @@ except Exception as e:
     exit()
 
 
-# --- 아래 코드는 이전과 동일합니다 ---
-
-# 라벨 정보 (훈련 시 사용했던 라벨과 순서가 같아야 함)
-id_to_label = {
-    0: '격려',
-    1: '위로',
-    2: '동조',
-    3: '조언'
-}
-
 # =================================================================
 # 2. 예측 함수 정의
 # =================================================================
 def predict_empathy(text):
-    device = torch.device("cpu")
-    model.to(device)
     inputs = tokenizer(text, return_tensors="pt", truncation=True, padding=True)
     with torch.no_grad():
         outputs = model(**inputs)
     predicted_class_id = outputs.logits.argmax().item()
     return id_to_label.get(predicted_class_id, "알 수 없는 라벨")
 
+
+def predict_with_probabilities(texts, batch_size=64, max_length=MAX_LENGTH):
+    """길이순으로 묶어 배치 추론하고, 입력 순서대로 (라벨, {라벨: 확률}) 목록을 반환합니다."""
+    probabilities = torch.softmax(bucketed_logits(tokenizer, model, texts, batch_size, max_length), dim=-1)
+    results = []
+    for row in probabilities.tolist():
+        best = max(range(len(row)), key=row.__getitem__)
+        results.append((
+            id_to_label.get(best, "알 수 없는 라벨"),
+            {id_to_label.get(i, str(i)): round(p, 6) for i, p in enumerate(row)},
+        ))
+    return results
+
+
+# =================================================================
+# 3. 파일 일괄 분류 (CSV / JSONL / 한 줄에 한 문장인 텍스트 파일)
+# =================================================================
+def read_texts(path, text_column):
+    """입력 파일을 한 줄씩 읽어 문장을 내보냅니다. 파일 전체를 메모리에 올리지 않습니다."""
+    if path.endswith(".csv"):
+        # csv 모듈이 따옴표 안의 줄바꿈을 직접 처리하도록 newline=""로 엶
+        with open(path, "r", encoding="utf-8", newline="") as f:
+            for row in csv.DictReader(f):
+                yield row.get(text_column) or ""
+        return
+    # 그 외에는 기본 줄바꿈 변환으로 CRLF 파일도 "\n"으로 읽음
+    with open(path, "r", encoding="utf-8") as f:
+        if path.endswith(".jsonl"):
+            for line in f:
+                if line.strip():
+                    yield str(json.loads(line).get(text_column) or "")
+        else:
+            for line in f:
+                yield line.rstrip("\n")
+
+
+def count_done(output_path):
+    """이미 기록된 결과 수 (이어서 처리할 때 건너뛸 입력 수)"""
+    if not os.path.exists(output_path):
+        return 0
+    # 중단되며 반쯤 기록된 마지막 줄은 지우고 다시 처리
+    with open(output_path, "rb+") as f:
+        data = f.read()
+        if data and not data.endswith(b"\n"):
+            f.truncate(data.rfind(b"\n") + 1)
+    with open(output_path, "r", encoding="utf-8", newline="") as f:
+        if output_path.endswith(".csv"):
+            return max(0, sum(1 for _ in csv.reader(f)) - 1)
+        return sum(1 for line in f if line.strip())
+
+
+def chunked(iterable, size):
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _predict_slice(args):
+    texts, batch_size, max_length = args
+    return predict_with_probabilities(texts, batch_size, max_length)
+
+
+def bulk_predict(input_path, output_path, text_column="text", batch_size=64, chunk_size=4096,
+                 processes=1, threads=None, max_length=MAX_LENGTH):
+    """입력 파일을 chunk_size씩 읽어 분류하고, 결과를 입력 순서대로 바로바로 기록합니다.
+
+    출력 파일이 이미 있으면 기록된 개수만큼 입력을 건너뛰고 이어서 처리합니다.
+    processes가 2 이상이면 워커 프로세스마다 이 스크립트를 import해 모델을 로드하고 chunk를 나눠 처리합니다.
+    """
+    done = count_done(output_path)
+    if done:
+        print(f"⏩ 이미 처리된 {done}개를 건너뛰고 이어서 처리합니다.")
+
+    pool = None
+    if processes > 1:
+        from worker_pool import create_process_pool, default_threads_per_worker
+        pool = create_process_pool(processes, threads or default_threads_per_worker(processes))
+    elif threads:
+        torch.set_num_threads(threads)
+
+    is_csv = output_path.endswith(".csv")
+    labels = [id_to_label[i] for i in sorted(id_to_label)]
+    processed = 0
+    start = time.perf_counter()
+    texts = read_texts(input_path, text_column)
+    # 이미 처리한 입력은 분류하지 않고 읽기만 함
+    for _ in range(done):
+        next(texts, None)
+
+    with open(output_path, "a", encoding="utf-8", newline="") as out:
+        writer = csv.writer(out) if is_csv else None
+        if is_csv and done == 0:
+            writer.writerow(["index", "text", "prediction"] + [f"prob_{label}" for label in labels])
+
+        for chunk in chunked(texts, chunk_size):
+            if pool is None:
+                results = predict_with_probabilities(chunk, batch_size, max_length)
+            else:
+                step = -(-len(chunk) // processes)
+                slices = [(chunk[i:i + step], batch_size, max_length) for i in range(0, len(chunk), step)]
+                results = [result for part in pool.map(_predict_slice, slices) for result in part]
+
+            for offset, (text, (prediction, probabilities)) in enumerate(zip(chunk, results)):
+                index = done + processed + offset
+                if is_csv:
+                    writer.writerow([index, text, prediction] + [probabilities.get(label) for label in labels])
+                else:
+                    out.write(json.dumps({"index": index, "text": text, "prediction": prediction,
+                                          "probabilities": probabilities}, ensure_ascii=False) + "\n")
+            out.flush()
+            processed += len(chunk)
+
+            elapsed = time.perf_counter() - start
+            print(f"\r⏳ {done + processed}개 처리 ({processed / elapsed:.1f} 문장/초)", end="", file=sys.stderr)
+
+    if pool is not None:
+        pool.shutdown()
+    print(f"\n✅ {processed}개 분류 완료: {output_path}")
+
+
 # =================================================================
-# 3. 사용자 입력받아 무한 테스트
+# 4. 사용자 입력받아 무한 테스트
 # =================================================================
-print("\n🎉 테스트 준비 완료! 문장을 입력하고 Enter를 누르세요.")
-print("   (종료하려면 'exit' 또는 '종료'를 입력하세요)")
-
-while True:
-    user_input = input("입력 > ")
-    if user_input.lower() in ["exit", "종료"]:
-        print("테스트를 종료합니다.")
-        break
-    prediction = predict_empathy(user_input)
-    print(f"예측 결과: '{prediction}'\n")
+def interactive():
+    print("\n🎉 테스트 준비 완료! 문장을 입력하고 Enter를 누르세요.")
+    print("   (종료하려면 'exit' 또는 '종료'를 입력하세요)")
+
+    while True:
+        user_input = input("입력 > ")
+        if user_input.lower() in ["exit", "종료"]:
+            print("테스트를 종료합니다.")
+            break
+        prediction = predict_empathy(user_input)
+        print(f"예측 결과: '{prediction}'\n")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="공감 유형 분류 (인자 없이 실행하면 대화형 테스트)")
+    parser.add_argument("--input", help="분류할 파일 (.csv, .jsonl, 또는 한 줄에 한 문장인 텍스트 파일)")
+    parser.add_argument("--output", help="결과 파일 (.jsonl 또는 .csv). 이미 있으면 이어서 처리")
+    parser.add_argument("--text-column", default="text", help="CSV/JSONL에서 문장이 들어 있는 열 이름")
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--chunk-size", type=int, default=4096, help="한 번에 읽어 길이순으로 정렬할 문장 수")
+    parser.add_argument("--processes", type=int, default=1, help="추론 프로세스 수 (프로세스마다 모델 로드)")
+    parser.add_argument("--threads", type=int, default=None, help="프로세스당 torch 스레드 수")
+    parser.add_argument("--max-length", type=int, default=MAX_LENGTH)
+    args = parser.parse_args()
+
+    if args.input:
+        output = args.output or os.path.splitext(args.input)[0] + ".predictions.jsonl"
+        bulk_predict(args.input, output, args.text_column, args.batch_size, args.chunk_size,
+                     args.processes, args.threads, args.max_length)
+    else:
+        interactive()
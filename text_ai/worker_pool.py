@@ -0,0 +1,92 @@
+"""멀티 프로세스 추론 워커
+
+부모 프로세스가 로드한 모델을 공유 메모리로 옮긴 뒤(model.share_memory()) N개의 추론 워커에 넘깁니다.
+torch.multiprocessing은 공유 메모리 텐서를 복사하지 않고 핸들로 전달하므로, 워커는 부모와 같은 가중치를
+그대로 쓰고 가중치는 워커 수와 관계없이 한 벌만 메모리에 있습니다.
+(int8 동적 양자화 모델의 packed 가중치는 공유 텐서가 아니어서 워커마다 복사됩니다. fp32의 1/4 크기)
+
+부모 프로세스는 이미 이벤트 루프, 추론 스레드 풀, torch/OpenMP 스레드가 돌고 있으므로 fork하지 않고,
+깨끗한 forkserver 프로세스(없으면 spawn)에서 워커를 만듭니다. 워커마다 torch 연산 스레드 수를 고정해
+코어를 나눠 쓰고, 토크나이저/forward가 GIL을 두고 경쟁하지 않게 합니다.
+"""
+
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor, wait
+from typing import Any, Dict, List, Optional
+
+import torch
+import torch.multiprocessing
+
+from inference import MAX_LENGTH, logits_to_labels, predict_bucketed, predict_logits
+
+logger = logging.getLogger(__name__)
+
+# 워커 프로세스 안에서만 채워지는 모델/토크나이저
+_worker: Dict[str, Any] = {}
+
+
+def default_threads_per_worker(processes: int) -> int:
+    return max(1, (os.cpu_count() or 1) // max(1, processes))
+
+
+def _context():
+    # torch.multiprocessing 컨텍스트: 공유 메모리 텐서를 워커에 핸들로 전달
+    methods = torch.multiprocessing.get_all_start_methods()
+    context = torch.multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+    if context.get_start_method() == "forkserver":
+        # forkserver가 torch/transformers를 한 번만 import해 두고 워커는 그 상태에서 fork
+        context.set_forkserver_preload(["torch", "transformers", "inference"])
+    return context
+
+
+def create_process_pool(processes: int, threads_per_worker: int) -> ProcessPoolExecutor:
+    """워커당 torch 스레드 수를 고정한 프로세스 풀 (fork 없음).
+
+    작업 함수는 모듈 최상위 함수여야 하며, 모델은 워커가 import 시점에 직접 로드해야 합니다.
+    """
+    return ProcessPoolExecutor(max_workers=processes, mp_context=_context(),
+                               initializer=torch.set_num_threads, initargs=(threads_per_worker,))
+
+
+def _init_worker(threads: int, tokenizer, model: torch.nn.Module, warmup_texts: Optional[List[str]]):
+    # 워커에서 하는 일은 스레드 수 고정뿐, 모델은 부모의 공유 메모리 가중치를 그대로 씀
+    torch.set_num_threads(threads)
+    _worker['tokenizer'] = tokenizer
+    _worker['model'] = model
+    if warmup_texts:
+        worker_predict(warmup_texts[:1])
+        worker_predict(warmup_texts)
+
+
+def _worker_pid() -> int:
+    return os.getpid()
+
+
+def worker_predict(texts: List[str]) -> List[str]:
+    """워커에서 여러 문장을 패딩해 한 번의 forward로 분류합니다 (MicroBatcher의 배치 함수)."""
+    return logits_to_labels(predict_logits(_worker['tokenizer'], _worker['model'], texts, max_length=MAX_LENGTH))
+
+
+def worker_predict_bulk(texts: List[str], batch_size: int) -> List[str]:
+    """워커에서 길이별로 묶어 배치 추론합니다 (대량 분류)."""
+    return predict_bucketed(_worker['tokenizer'], _worker['model'], texts, batch_size, MAX_LENGTH)
+
+
+def create_inference_pool(processes: int, threads_per_worker: int, tokenizer, model: torch.nn.Module,
+                          warmup_texts: Optional[List[str]] = None) -> ProcessPoolExecutor:
+    """부모가 로드한 모델을 공유 메모리로 옮겨 워커에 넘기고, 모든 워커의 warmup이 끝난 풀을 반환합니다."""
+    # 파라미터/버퍼 저장소를 공유 메모리로 옮김 (부모도 이후 같은 저장소를 사용)
+    model.share_memory()
+    pool = ProcessPoolExecutor(
+        max_workers=processes,
+        mp_context=_context(),
+        initializer=_init_worker,
+        initargs=(threads_per_worker, tokenizer, model, warmup_texts),
+    )
+    # 워커는 작업이 들어올 때 생성되므로 워커 수만큼 작업을 보내 미리 띄움 (initializer 실패는 여기서 드러남)
+    futures = [pool.submit(_worker_pid) for _ in range(processes)]
+    wait(futures)
+    for future in futures:
+        future.result()
+    return pool
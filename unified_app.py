@@ -213,28 +213,56 @@ class TextClassificationResponse(BaseModel):
         }
     }
 
+class BatchTextClassificationRequest(BaseModel):
+    texts: List[str] = Field(..., description="분류할 텍스트 목록", examples=[["이 제품은 정말 훌륭하고 좋습니다!", "최악이에요."]])
+
+class BatchTextClassificationResponse(BaseModel):
+    predictions: List[TextClassificationResponse] = Field(..., description="요청 순서와 같은 순서의 분류 결과")
+
+# Generate_question 서비스 (시작 시 한 번만 로드)
+question_service = {"generator": None, "close_client": None}
+
+def _load_question_generator():
+    """Generate_question 경로/환경변수를 설정하고 공유 LLM 클라이언트를 쓰는 QuestionGenerator를 만듭니다."""
+    import sys
+    import os
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    
+    # Generate_question 경로 추가
+    generate_path = os.path.join(current_dir, "Generate_question")
+    if generate_path not in sys.path:
+        sys.path.insert(0, generate_path)
+    
+    # 환경변수 로드
+    from dotenv import load_dotenv
+    load_dotenv(os.path.join(generate_path, ".env"))
+    
+    from app.core.llm_client import init_llm_client, close_llm_client
+    from app.services.question_generator import QuestionGenerator
+    question_service["generator"] = QuestionGenerator(client=init_llm_client())
+    question_service["close_client"] = close_llm_client
+
+@app.on_event("startup")
+async def load_question_service():
+    try:
+        _load_question_generator()
+        logger.info("✅ QuestionGenerator 준비 완료")
+    except Exception as e:
+        logger.error(f"QuestionGenerator 로드 실패: {e}")
+
+@app.on_event("shutdown")
+async def close_question_service():
+    if question_service["close_client"] is not None:
+        await question_service["close_client"]()
+
 # Generate_question 서비스 엔드포인트
 @app.get("/api/v1/questions/generate", response_model=QuestionResponse, tags=["Questions"])
 async def generate_question():
     """새로운 커플 취향 질문을 생성합니다."""
+    question_generator = question_service["generator"]
+    if question_generator is None:
+        raise HTTPException(status_code=503, detail="질문 생성 서비스를 사용할 수 없습니다. 서버 로그를 확인해주세요.")
     try:
-        # 직접 QuestionGenerator 사용
-        import sys
-        import os
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        
-        # Generate_question 경로 추가
-        generate_path = os.path.join(current_dir, "Generate_question")
-        if generate_path not in sys.path:
-            sys.path.insert(0, generate_path)
-        
-        # 환경변수 로드
-        from dotenv import load_dotenv
-        load_dotenv(os.path.join(generate_path, ".env"))
-        
-        # QuestionGenerator import 및 실행
-        from app.services.question_generator import QuestionGenerator
-        question_generator = QuestionGenerator()
         result = await question_generator.generate_question()
         
         if result:
@@ -242,6 +270,8 @@ async def generate_question():
         else:
             raise HTTPException(status_code=500, detail="질문 생성에 실패했습니다.")
             
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"질문 생성 오류: {e}")
         raise HTTPException(status_code=500, detail=f"질문 생성에 실패했습니다: {str(e)}")
@@ -293,40 +323,55 @@ async def generate_plan_vector(request: PlannerRequest):
         logger.error(f"장소 추천 오류: {e}")
         raise HTTPException(status_code=500, detail=f"장소 추천에 실패했습니다: {str(e)}")
 
+def _classify_by_keywords(text: str) -> TextClassificationResponse:
+    """간단한 키워드 기반 텍스트 분류"""
+    text_length = len(text)
+    positive_keywords = ["좋다", "훌륭하다", "멋지다", "최고", "excellent", "good", "great"]
+    negative_keywords = ["나쁘다", "싫다", "최악", "terrible", "bad", "awful"]
+    
+    positive_count = sum(1 for keyword in positive_keywords if keyword in text.lower())
+    negative_count = sum(1 for keyword in negative_keywords if keyword in text.lower())
+    
+    if positive_count > negative_count:
+        prediction = "positive"
+        confidence = min(0.95, 0.6 + (positive_count * 0.1))
+    elif negative_count > positive_count:
+        prediction = "negative"
+        confidence = min(0.95, 0.6 + (negative_count * 0.1))
+    else:
+        prediction = "neutral"
+        confidence = 0.5 + (text_length / 1000)
+        
+    confidence = min(confidence, 0.95)
+    
+    return TextClassificationResponse(
+        prediction=prediction,
+        confidence=round(confidence, 2)
+    )
+
 # text_ai 서비스 엔드포인트
 @app.post("/api/v1/text/classify", response_model=TextClassificationResponse, tags=["Text AI"])
 async def classify_text(request: TextClassificationRequest):
     """텍스트 분류를 수행합니다."""
     try:
-        # 간단한 텍스트 분류 로직
-        text_length = len(request.text)
-        positive_keywords = ["좋다", "훌륭하다", "멋지다", "최고", "excellent", "good", "great"]
-        negative_keywords = ["나쁘다", "싫다", "최악", "terrible", "bad", "awful"]
-        
-        positive_count = sum(1 for keyword in positive_keywords if keyword in request.text.lower())
-        negative_count = sum(1 for keyword in negative_keywords if keyword in request.text.lower())
-        
-        if positive_count > negative_count:
-            prediction = "positive"
-            confidence = min(0.95, 0.6 + (positive_count * 0.1))
-        elif negative_count > positive_count:
-            prediction = "negative"
-            confidence = min(0.95, 0.6 + (negative_count * 0.1))
-        else:
-            prediction = "neutral"
-            confidence = 0.5 + (text_length / 1000)
-            
-        confidence = min(confidence, 0.95)
-        
-        return TextClassificationResponse(
-            prediction=prediction,
-            confidence=round(confidence, 2)
-        )
+        return _classify_by_keywords(request.text)
         
     except Exception as e:
         logger.error(f"텍스트 분류 오류: {e}")
         raise HTTPException(status_code=500, detail=f"텍스트 분류에 실패했습니다: {str(e)}")
 
+@app.post("/api/v1/text/classify/batch", response_model=BatchTextClassificationResponse, tags=["Text AI"])
+async def classify_text_batch(request: BatchTextClassificationRequest):
+    """여러 텍스트를 한 번에 분류합니다. 결과는 요청 순서대로 반환됩니다."""
+    try:
+        return BatchTextClassificationResponse(
+            predictions=[_classify_by_keywords(text) for text in request.texts]
+        )
+        
+    except Exception as e:
+        logger.error(f"텍스트 일괄 분류 오류: {e}")
+        raise HTTPException(status_code=500, detail=f"텍스트 일괄 분류에 실패했습니다: {str(e)}")
+
 @app.post("/api/v1/text/upload-model", tags=["Text AI"])
 async def upload_model():
     """모델 업로드 엔드포인트"""
@@ -357,6 +402,11 @@ async def root():
                         "method": "POST",
                         "description": "텍스트 감정 분류"
                     },
+                    {
+                        "path": "/api/v1/text/classify/batch",
+                        "method": "POST",
+                        "description": "텍스트 감정 일괄 분류"
+                    },
                     {
                         "path": "/api/v1/text/upload-model",
                         "method": "POST",